@@ -0,0 +1,30 @@
+"""Create thumbnails of every PSD file of a folder.
+
+Each file is opened once and all its thumbnail sizes are produced by a
+single script.
+
+"""
+
+# Import built-in modules
+import glob
+import os
+
+# Import local modules
+from photoshop import thumbnails
+
+
+def create_thumbnails(folder, sizes=(64, 256, 1024)):
+    """Create JPEG thumbnails next to every PSD file of a folder.
+
+    Args:
+        folder (str): The folder of the PSD files.
+        sizes (tuple): The lengths of the longest edge of the thumbnails.
+
+    """
+    psd_files = glob.glob(os.path.join(folder, "*.psd"))
+    for thumbnail in thumbnails.generate(psd_files, sizes=sizes, format="jpg"):
+        print(f"{thumbnail.source} -> {thumbnail.path} ({thumbnail.width}x{thumbnail.height})")
+
+
+if __name__ == "__main__":
+    create_thumbnails(os.path.join(os.path.dirname(__file__), "files"))
@@ -1,5 +1,23 @@
-# Import local modules
-from photoshop.session import Session
+"""Python API for Photoshop.
 
+`Session` and `AsyncSession` are imported on first use, so the modules that work without
+Photoshop, such as `photoshop.psd`, can be imported on any platform.
 
-__all__ = ["Session"]
+"""
+
+
+__all__ = ["AsyncSession", "Session"]
+
+
+def __getattr__(name):
+    if name == "Session":
+        # Import local modules
+        from photoshop.session import Session
+
+        return Session
+    if name == "AsyncSession":
+        # Import local modules
+        from photoshop.async_session import AsyncSession
+
+        return AsyncSession
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
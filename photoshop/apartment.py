@@ -0,0 +1,295 @@
+"""Share one connection to Photoshop between threads.
+
+COM objects belong to the apartment, the thread, that created them. Using a
+`Document` or an `ArtLayer` from the workers of a thread pool either fails
+or needs manual marshaling. An `Apartment` owns a dedicated thread running
+one call at a time from a queue, and its proxies send every attribute access
+and method call to that thread, from any thread:
+
+```python
+
+from concurrent.futures import ThreadPoolExecutor
+
+from photoshop.api import Application
+from photoshop.apartment import Apartment
+
+with Apartment() as apartment:
+    app = apartment.create(Application)
+    document = app.open("d:/psd/cover.psd")
+
+    def _process(layer):
+        pixels = download(layer.name)  # Runs in parallel in the pool.
+        layer.visible = bool(pixels)  # Runs in the apartment.
+
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(_process, document.artLayers))
+
+```
+
+Only the calls to Photoshop are serialized, the rest of the work of the
+threads runs in parallel.
+
+"""
+
+# Import built-in modules
+from concurrent.futures import Future
+import queue
+import threading
+import types
+from typing import Any
+from typing import Callable
+from typing import Optional
+from typing import Tuple
+
+
+# The packages whose objects are bound to the thread that created them.
+BOUND_MODULES = ("comtypes", "photoshop.api")
+
+
+def co_initialize():
+    """Initialize the COM apartment of the current thread."""
+    # Import third-party modules
+    import comtypes
+
+    comtypes.CoInitialize()
+
+
+def co_uninitialize():
+    """Release the COM apartment of the current thread."""
+    # Import third-party modules
+    import comtypes
+
+    comtypes.CoUninitialize()
+
+
+class Apartment:
+    """A dedicated thread running calls one at a time, in order.
+
+    Args:
+        start: Called in the thread before the first call, defaults to
+            initializing a single-threaded COM apartment. If it raises, every
+            call fails with its error.
+        stop: Called in the thread once it is closed, if ``start`` succeeded.
+        name: The name of the thread.
+        bound_types: Optional, more types of objects proxied when returned
+            by a proxy, besides the wrappers and the COM objects.
+
+    """
+
+    def __init__(
+        self,
+        start: Optional[Callable[[], Any]] = co_initialize,
+        stop: Optional[Callable[[], Any]] = co_uninitialize,
+        name: str = "photoshop-apartment",
+        bound_types: Tuple[type, ...] = (),
+    ):
+        self.bound_types = bound_types
+        self._start = start
+        self._stop = stop
+        self._name = name
+        self._requests: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @property
+    def is_current(self) -> bool:
+        """bool: True when called from the thread of the apartment."""
+        return self._thread is not None and self._thread.ident == threading.get_ident()
+
+    def is_bound(self, value: Any) -> bool:
+        """Tell whether a value must only be used in the thread of the apartment.
+
+        Args:
+            value: Any value.
+
+        Returns:
+            bool: True for the Photoshop wrappers, the COM objects, instances
+                of `bound_types`, and the methods of all of them.
+
+        """
+        if isinstance(value, (types.MethodType, types.BuiltinMethodType)):
+            value = value.__self__
+        if isinstance(value, self.bound_types):
+            return True
+        for cls in type(value).__mro__:
+            module = cls.__module__ or ""
+            if any(module == name or module.startswith(f"{name}.") for name in BOUND_MODULES):
+                return True
+        return False
+
+    def _serve(self):
+        error: Optional[BaseException] = None
+        if self._start:
+            try:
+                self._start()
+            except BaseException as err:  # pylint: disable=broad-except
+                error = err
+        while True:
+            request = self._requests.get()
+            if request is None:
+                if error is None and self._stop:
+                    self._stop()
+                return
+            future, func, args, kwargs = request
+            if not future.set_running_or_notify_cancel():
+                continue
+            if error is not None:
+                future.set_exception(error)
+                continue
+            try:
+                future.set_result(func(*args, **kwargs))
+            except BaseException as err:  # pylint: disable=broad-except
+                future.set_exception(err)
+
+    def submit(self, func: Callable, *args, **kwargs) -> Future:
+        """Queue a call to run in the thread of the apartment.
+
+        The thread is started on the first call. Calls made from the thread
+        itself, e.g. by a proxied callback, run immediately.
+
+        Args:
+            func: The callable to run.
+            *args: The positional arguments of the call.
+            **kwargs: The keyword arguments of the call.
+
+        Returns:
+            Future: The result of the call. Cancelling it before the call
+                starts removes the call from the queue.
+
+        Raises:
+            RuntimeError: If the apartment is closed.
+
+        """
+        future: Future = Future()
+        if self.is_current:
+            future.set_running_or_notify_cancel()
+            try:
+                future.set_result(func(*args, **kwargs))
+            except BaseException as err:  # pylint: disable=broad-except
+                future.set_exception(err)
+            return future
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The apartment is closed.")
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._serve, name=self._name, daemon=True)
+                self._thread.start()
+            self._requests.put((future, func, args, kwargs))
+        return future
+
+    def call(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a call in the thread of the apartment and wait for its result."""
+        return self.submit(func, *args, **kwargs).result()
+
+    def proxy(self, target: Any) -> "ThreadSafeProxy":
+        """ThreadSafeProxy: A proxy of an object created in the apartment."""
+        return ThreadSafeProxy(target, self)
+
+    def create(self, factory: Callable, *args, **kwargs) -> "ThreadSafeProxy":
+        """Create an object in the apartment and proxy it.
+
+        Examples:
+            ```python
+
+            app = apartment.create(Application, version="2022")
+
+            ```
+
+        """
+        return self.proxy(self.call(factory, *args, **kwargs))
+
+    def close(self, wait: bool = True):
+        """Run the queued calls, then stop the thread.
+
+        Args:
+            wait: If true, waits for the thread to stop.
+
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._thread is None:
+                return
+            self._requests.put(None)
+        if wait and not self.is_current:
+            self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _unwrap(value: Any) -> Any:
+    if isinstance(value, ThreadSafeProxy):
+        return object.__getattribute__(value, "_target")
+    if type(value) in (list, tuple):
+        return type(value)(_unwrap(item) for item in value)
+    if type(value) is dict:
+        return {key: _unwrap(item) for key, item in value.items()}
+    return value
+
+
+class ThreadSafeProxy:
+    """Sends the attribute accesses and calls of an object to its apartment.
+
+    Attributes and call results bound to the apartment, see
+    `Apartment.is_bound`, are proxied in turn. Other values, such as strings,
+    paths or NumPy arrays, are returned as is. Lists, tuples and dicts are
+    returned with their bound items proxied. Proxies passed as arguments are
+    unwrapped in the apartment.
+
+    Args:
+        target: The object, created in the thread of the apartment.
+        apartment: The apartment owning the object.
+
+    """
+
+    __slots__ = ("_target", "_apartment")
+
+    def __init__(self, target: Any, apartment: Apartment):
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_apartment", apartment)
+
+    def _wrap(self, value: Any) -> Any:
+        if type(value) in (list, tuple):
+            return type(value)(self._wrap(item) for item in value)
+        if type(value) is dict:
+            return {key: self._wrap(item) for key, item in value.items()}
+        if not isinstance(value, ThreadSafeProxy) and self._apartment.is_bound(value):
+            return ThreadSafeProxy(value, self._apartment)
+        return value
+
+    def _call(self, func: Callable, *args, **kwargs) -> Any:
+        return self._wrap(self._apartment.call(func, *_unwrap(args), **_unwrap(kwargs)))
+
+    def __getattr__(self, name: str) -> Any:
+        return self._call(getattr, self._target, name)
+
+    def __setattr__(self, name: str, value: Any):
+        self._apartment.call(setattr, self._target, name, _unwrap(value))
+
+    def __delattr__(self, name: str):
+        self._apartment.call(delattr, self._target, name)
+
+    def __call__(self, *args, **kwargs) -> Any:
+        return self._call(self._target, *args, **kwargs)
+
+    def __iter__(self):
+        # The items are read at once, a COM enumerator cannot leave its thread.
+        return iter(self._call(list, self._target))
+
+    def __len__(self) -> int:
+        return self._apartment.call(len, self._target)
+
+    def __getitem__(self, key: Any) -> Any:
+        return self._call(lambda: self._target[_unwrap(key)])
+
+    def __bool__(self) -> bool:
+        return self._apartment.call(bool, self._target)
+
+    def __repr__(self) -> str:
+        return f"ThreadSafeProxy({self._apartment.call(repr, self._target)})"
@@ -17,15 +17,29 @@ from photoshop.api.errors import PhotoshopPythonAPIError
 from photoshop.api.event_id import EventID
 from photoshop.api.open_options import EPSOpenOptions
 from photoshop.api.save_options import BMPSaveOptions
+from photoshop.api.save_options import BMPSaveSpec
 from photoshop.api.save_options import EPSSaveOptions
+from photoshop.api.save_options import EPSSaveSpec
 from photoshop.api.save_options import ExportOptionsSaveForWeb
 from photoshop.api.save_options import GIFSaveOptions
+from photoshop.api.save_options import GIFSaveSpec
 from photoshop.api.save_options import JPEGSaveOptions
+from photoshop.api.save_options import JPEGSaveSpec
 from photoshop.api.save_options import PDFSaveOptions
+from photoshop.api.save_options import PDFSaveSpec
 from photoshop.api.save_options import PNGSaveOptions
+from photoshop.api.save_options import PNGSaveSpec
 from photoshop.api.save_options import PhotoshopSaveOptions
+from photoshop.api.save_options import PhotoshopSaveSpec
+from photoshop.api.save_options import PooledSaveOptions
+from photoshop.api.save_options import SaveForWebSpec
+from photoshop.api.save_options import SaveOptionsPool
+from photoshop.api.save_options import SaveOptionsSpec
 from photoshop.api.save_options import TargaSaveOptions
+from photoshop.api.save_options import TargaSaveSpec
 from photoshop.api.save_options import TiffSaveOptions
+from photoshop.api.save_options import TiffSaveSpec
+from photoshop.api.save_options import save_options_pool
 from photoshop.api.solid_color import SolidColor
 from photoshop.api.text_item import TextItem
 
@@ -56,6 +70,20 @@ __all__ = [  # noqa: F405
     "PhotoshopSaveOptions",
     "TiffSaveOptions",
     "TargaSaveOptions",
+    "PooledSaveOptions",
+    "SaveOptionsPool",
+    "save_options_pool",
+    "BMPSaveSpec",
+    "EPSSaveSpec",
+    "GIFSaveSpec",
+    "JPEGSaveSpec",
+    "PDFSaveSpec",
+    "PNGSaveSpec",
+    "PhotoshopSaveSpec",
+    "SaveForWebSpec",
+    "SaveOptionsSpec",
+    "TargaSaveSpec",
+    "TiffSaveSpec",
     "EPSOpenOptions",
     "EPSSaveOptions",
     "TextItem",
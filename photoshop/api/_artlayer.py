@@ -1,9 +1,14 @@
 # Import built-in modules
 from typing import Any
+from typing import Union
 
 # Import local modules
+from photoshop.api import _export
+from photoshop.api import _pixels
 from photoshop.api._core import Photoshop
 from photoshop.api.enumerations import RasterizeType
+from photoshop.api.errors import PhotoshopPythonAPIError
+from photoshop.api.save_options import SaveOptionsSpec
 from photoshop.api.text_item import TextItem
 
 
@@ -566,3 +571,49 @@ class ArtLayer(Photoshop):
         """
         self.eval_javascript(js)
         return self
+
+    @property
+    def document(self):
+        """Document: The document containing the layer, at any depth."""
+        # Import local modules
+        from photoshop.api._document import Document
+
+        parent = self.app.parent
+        while parent.typename != "Document":
+            parent = parent.parent
+        return Document(parent)
+
+    def to_bytes(self, options: Union[str, SaveOptionsSpec] = "png", trim: bool = True) -> bytes:
+        """Encodes the layer alone in memory.
+
+        The layer is copied into a scratch document by a single script, so
+        the visibility of the other layers never changes.
+
+        Args:
+            options: A file format such as ``png`` or ``jpg``, or a save
+                options spec such as ``PNGSaveSpec(compression=9)``.
+            trim: If true, trims the transparent pixels around the layer.
+
+        Returns:
+            bytes: The content of the saved file.
+
+        """
+        return _export.layer_bytes(self.document, self.id, options, trim)
+
+    def to_numpy(self):
+        """Reads the pixels of the layer cropped to its bounds. Requires NumPy.
+
+        Use `Document.layers_to_numpy` to read many layers in a single call.
+
+        Returns:
+            tuple: The ``(height, width, 4)`` RGBA pixels and the
+                ``(left, top)`` offset of the pixels in the document.
+
+        Raises:
+            PhotoshopPythonAPIError: If the layer is empty.
+
+        """
+        layers = _pixels.layers_to_numpy(self.document, [self.id])
+        if self.id not in layers:
+            raise PhotoshopPythonAPIError(f'Layer "{self.name}" is empty.')
+        return layers[self.id]
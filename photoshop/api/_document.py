@@ -15,9 +15,12 @@ The basic canvas for the file.
 
 # Import built-in modules
 from pathlib import Path
+from typing import AsyncIterator
+from typing import Iterator
 from typing import List
 from typing import NoReturn
 from typing import Optional
+from typing import Sequence
 from typing import TypeVar
 from typing import Union
 
@@ -25,6 +28,11 @@ from typing import Union
 from comtypes import COMError
 
 # Import local modules
+from photoshop import arrays
+from photoshop import xmp
+from photoshop.api import _export
+from photoshop.api import _pixels
+from photoshop.api import _snapshot
 from photoshop.api._artlayer import ArtLayer
 from photoshop.api._artlayers import ArtLayers
 from photoshop.api._channels import Channels
@@ -40,6 +48,10 @@ from photoshop.api.enumerations import ExtensionType
 from photoshop.api.enumerations import SaveOptions
 from photoshop.api.enumerations import TrimType
 from photoshop.api.save_options import ExportOptionsSaveForWeb
+from photoshop.api.save_options import SaveForWebSpec
+from photoshop.api.save_options import SaveOptionsSpec
+from photoshop.streaming import ExportResult
+from photoshop.streaming import iterate_in_thread
 
 
 # Custom types.
@@ -332,6 +344,19 @@ class Document(Photoshop):
         stored here."""
         return self.app.xmpMetadata
 
+    def xmp(self, namespaces: Optional[Sequence[str]] = None) -> dict:
+        """Parses the XMP metadata of the Document, see `photoshop.xmp.parse`.
+
+        Args:
+            namespaces: Optional, the URIs of the namespaces to extract, e.g.
+                a custom namespace of a studio. Defaults to every namespace.
+
+        Returns:
+            dict: The properties keyed by name, keyed by namespace URI.
+
+        """
+        return xmp.parse(self.xmpMetadata.rawData, namespaces)
+
     # Methods
     def autoCount(self, *args, **kwargs):
         """Counts the objects in the Document."""
@@ -373,9 +398,13 @@ class Document(Photoshop):
         """
         return self.app.crop(bounds, angle, width, height)
 
-    def exportDocument(self, file_path: str, exportAs: ExportType, options: Union[ExportOptionsSaveForWeb]):
+    def exportDocument(
+        self, file_path: str, exportAs: ExportType, options: Union[ExportOptionsSaveForWeb, SaveForWebSpec]
+    ):
         """Exports the Document.
 
+        Save options specs are converted into save options objects here.
+
         Note:
           This is a patched version, Due to the problem of dynamic binding,
           we cannot call it directly, so this command is executed by javascript.
@@ -384,9 +413,329 @@ class Document(Photoshop):
           - https://stackoverflow.com/questions/12286761/saving-a-png-with-photoshop-script-not-working
 
         """
+        if isinstance(options, SaveOptionsSpec):
+            options = options.to_com()
         file_path = file_path.replace("\\", "/")
         self.app.export(file_path, exportAs, options)
 
+    def export_layers(
+        self,
+        out_dir: str,
+        format: Union[str, SaveOptionsSpec] = "png",
+        trim: bool = True,
+        incremental: bool = False,
+        histograms: bool = False,
+    ) -> List[dict]:
+        """Exports every top level layer of the Document to its own file.
+
+        All layers are exported by a single script. Each layer is copied into
+        a scratch document, so the visibility of the layers in this Document
+        never changes. The manifest of the export is also written as
+        ``manifest.json`` in ``out_dir``.
+
+        Args:
+            out_dir: The directory receiving the exported files.
+            format: The extension of the output files, e.g. ``png`` or ``jpg``,
+                or a save options spec such as ``JPEGSaveSpec(quality=8)``.
+            trim: If true, trims the transparent pixels around each layer.
+            incremental: If true, only the layers whose fingerprint differs
+                from the one stored in the manifest of ``out_dir`` are
+                exported again.
+            histograms: If true, incremental exports also fingerprint the
+                histogram of each layer. Slower, but catches pixel edits.
+
+        Returns:
+            list: The manifest, one entry per layer with its ``id``, ``name``,
+                ``index``, ``bounds`` and exported ``path``.
+
+        """
+        if incremental:
+            return _export.export_layers_incremental(self, out_dir, format, trim, histograms)
+        return _export.export_layers(self, out_dir, format, trim)
+
+    def artboards(self) -> List[dict]:
+        """Lists the artboards of the Document with a single Action Manager query.
+
+        Returns:
+            list: One record per artboard, from the top of the layers panel,
+                with its ``id``, ``name``, ``index``, ``visible`` flag and
+                ``rect`` as ``[left, top, right, bottom]`` in pixels.
+
+        """
+        return _snapshot.artboards(self)
+
+    def export_artboards(self, out_dir: str, format: Union[str, SaveOptionsSpec] = "png") -> List[dict]:
+        """Exports every artboard of the Document to its own file.
+
+        All artboards are exported by a single script. Each artboard is shown
+        alone, with the other top level layers hidden, and the canvas is
+        cropped to it. The crop is rolled back and the visibility of the
+        layers restored, so the Document is left unchanged.
+
+        Args:
+            out_dir: The directory receiving the exported files.
+            format: The extension of the output files, e.g. ``png``, or a
+                save options spec such as ``PNGSaveSpec(compression=9)``.
+
+        Returns:
+            list: The manifest, one entry per artboard with its ``id``,
+                ``name``, ``bounds`` and exported ``path``. Artboards with
+                the same name get their index appended to the file name.
+
+        """
+        return _export.export_artboards(self, out_dir, format)
+
+    def iter_export_layers(
+        self, out_dir: str, format: Union[str, SaveOptionsSpec] = "png", trim: bool = True, batch_size: int = 1
+    ) -> Iterator[ExportResult]:
+        """Exports the top level layers, yielding each file as soon as it is saved.
+
+        Args:
+            out_dir: The directory receiving the exported files.
+            format: The extension of the output files, e.g. ``png`` or ``jpg``,
+                or a save options spec such as ``JPEGSaveSpec(quality=8)``.
+            trim: If true, trims the transparent pixels around each layer.
+            batch_size: The number of layers exported by each script.
+
+        Yields:
+            ExportResult: The ``path``, ``size``, ``duration`` and source
+                ``layer_id`` of each exported file.
+
+        """
+        return _export.iter_export_layers(self, out_dir, format, trim, batch_size)
+
+    def iter_export_artboards(
+        self, out_dir: str, format: Union[str, SaveOptionsSpec] = "png", batch_size: int = 1
+    ) -> Iterator[ExportResult]:
+        """Exports the artboards, yielding each file as soon as it is saved.
+
+        Args:
+            out_dir: The directory receiving the exported files.
+            format: The extension of the output files, e.g. ``png``, or a
+                save options spec such as ``PNGSaveSpec(compression=9)``.
+            batch_size: The number of artboards exported by each script.
+
+        Yields:
+            ExportResult: The ``path``, ``size``, ``duration`` and source
+                artboard ``layer_id`` of each exported file.
+
+        """
+        return _export.iter_export_artboards(self, out_dir, format, batch_size)
+
+    def aiter_export_layers(
+        self, out_dir: str, format: Union[str, SaveOptionsSpec] = "png", trim: bool = True, batch_size: int = 1
+    ) -> AsyncIterator[ExportResult]:
+        """Async iterator version of `iter_export_layers`.
+
+        The export runs in a dedicated thread with its own connection to
+        Photoshop, so the event loop is never blocked.
+
+        """
+        document_id = self.id
+        return iterate_in_thread(
+            lambda: _export.iter_export_layers(_export.thread_document(document_id), out_dir, format, trim, batch_size)
+        )
+
+    def aiter_export_artboards(
+        self, out_dir: str, format: Union[str, SaveOptionsSpec] = "png", batch_size: int = 1
+    ) -> AsyncIterator[ExportResult]:
+        """Async iterator version of `iter_export_artboards`.
+
+        The export runs in a dedicated thread with its own connection to
+        Photoshop, so the event loop is never blocked.
+
+        """
+        document_id = self.id
+        return iterate_in_thread(
+            lambda: _export.iter_export_artboards(_export.thread_document(document_id), out_dir, format, batch_size)
+        )
+
+    def to_bytes(self, options: Union[str, SaveOptionsSpec] = "png") -> bytes:
+        """Encodes a copy of the Document in memory.
+
+        The copy is saved to a recycled scratch file, on a tmpfs when the
+        system has one, and read back at once.
+
+        Args:
+            options: A file format such as ``png`` or ``jpg``, or a save
+                options spec such as ``JPEGSaveSpec(quality=8)``.
+
+        Returns:
+            bytes: The content of the saved file.
+
+        """
+        return _export.document_bytes(self, options)
+
+    def iter_bytes(self, options: Union[str, SaveOptionsSpec] = "psd", chunk_size: int = 1 << 20) -> Iterator[bytes]:
+        """Streaming version of `to_bytes` for large documents.
+
+        Args:
+            options: A file format such as ``psd``, or a save options spec.
+            chunk_size: The maximum size of each chunk in bytes.
+
+        Yields:
+            bytes: The content of the saved file, chunk by chunk.
+
+        """
+        return _export.iter_document_bytes(self, options, chunk_size)
+
+    def to_numpy(
+        self,
+        channels: Optional[Union[int, Sequence[int]]] = None,
+        bit_depth: Optional[int] = None,
+        alpha_channels: bool = False,
+    ):
+        """Reads the composite pixels of the Document into a NumPy array.
+
+        A Photoshop Raw copy is saved to the scratch directory and memory
+        mapped, so nothing is decoded or copied. The file is deleted once
+        the array is garbage collected. Requires NumPy.
+
+        Args:
+            channels: Optional, the number of leading channels or the indices
+                of the channels to keep, e.g. ``3`` or ``[0, 1, 2]``.
+            bit_depth: Optional, converts the pixels to 8, 16 or 32 bits per
+                channel, as ``uint8``, ``uint16`` or ``float32`` values.
+                Defaults to the depth of the Document. 16 bit values range
+                from 0 to 65535, the scale Photoshop Raw files are saved in.
+            alpha_channels: If true, the alpha channels follow the color
+                channels.
+
+        Returns:
+            numpy.memmap: The read-only ``(height, width, channels)`` pixels.
+
+        """
+        return _pixels.to_numpy(self, channels, bit_depth, alpha_channels)
+
+    def layers_to_numpy(self, ids: Optional[Sequence[int]] = None) -> dict:
+        """Reads the pixels of many layers, cropped to their bounds, in one script.
+
+        Each layer is read alone, with its transparency, without its effects
+        and as if its opacity was 100% in normal mode. Requires NumPy.
+
+        Args:
+            ids: Optional, the IDs of the layers at any depth. Defaults to
+                every layer except groups and adjustment layers.
+
+        Returns:
+            dict: ``(pixels, offset)`` tuples keyed by layer ID, where
+                ``pixels`` is a ``(height, width, 4)`` RGBA array and
+                ``offset`` the ``(left, top)`` position of the pixels in the
+                Document. Empty layers are left out.
+
+        """
+        return _pixels.layers_to_numpy(self, ids)
+
+    def iter_tiles(
+        self,
+        tile: int = 4096,
+        overlap: int = 0,
+        channels: Optional[Union[int, Sequence[int]]] = None,
+        bit_depth: Optional[int] = None,
+        batch: int = 4,
+    ) -> Iterator["arrays.Tile"]:
+        """Reads the composite pixels of the Document tile by tile.
+
+        For documents too large for `to_numpy`. A merged duplicate of the
+        Document is kept open while iterating, and each script crops and
+        saves a batch of tiles as Photoshop Raw files which are memory
+        mapped one at a time. A tile file is deleted once its pixels are
+        garbage collected, so the scratch usage stays bounded. Use
+        `photoshop.arrays.TileWriter` to stitch processed tiles back.
+        Requires NumPy.
+
+        Args:
+            tile: The length of the edge of the tiles, overlap excluded.
+            overlap: The number of pixels of context added on every side of
+                the tiles.
+            channels: Optional, the number of leading channels or the indices
+                of the channels to keep.
+            bit_depth: Optional, converts the pixels to 8, 16 or 32 bits per
+                channel.
+            batch: The number of tiles saved by each script.
+
+        Yields:
+            photoshop.arrays.Tile: Each tile, row by row, with its read-only
+                ``pixels``, its ``bounds`` and the ``core`` it owns.
+
+        """
+        return _pixels.iter_tiles(self, tile, overlap, channels, bit_depth, batch)
+
+    def add_layer_from_array(self, pixels, name: str = "Layer", position: Sequence[int] = (0, 0)) -> ArtLayer:
+        """Adds a NumPy array as a new layer at the top of the Document.
+
+        The array is written to a scratch PNG file, then opened and copied
+        into the Document, named and moved by a single script. The pixels
+        are copied as is, without resampling. Requires NumPy.
+
+        Args:
+            pixels: A ``(height, width)`` or ``(height, width, channels)``
+                array with 1 to 4 channels, the last one of 2 and 4 being the
+                alpha. ``uint8``, ``uint16``, ``bool`` and float arrays from
+                0 to 1 are supported.
+            name: The name of the new layer.
+            position: The ``(left, top)`` position of the pixels.
+
+        Returns:
+            ArtLayer: The new layer, which is also the active layer.
+
+        """
+        _pixels.add_layer_from_array(self, pixels, name, tuple(position))
+        return ArtLayer(self.app.activeLayer)
+
+    def histograms(self, alpha_channels: bool = False):
+        """Reads the histogram of every component channel in a single call.
+
+        Use `photoshop.arrays.histogram_stats` to compute the mean,
+        percentiles and clipping of the result. Requires NumPy.
+
+        Args:
+            alpha_channels: If true, also reads the alpha and spot channels,
+                after the component channels.
+
+        Returns:
+            numpy.ndarray: The ``(channels, 256)`` pixel counts, e.g. the red,
+                green and blue histograms of an RGB Document.
+
+        """
+        return _pixels.histograms(self, alpha_channels)
+
+    def sample_points(self, points, model: str = "rgb"):
+        """Reads the color of many pixels in a single call.
+
+        Each point is read by a temporary color sampler, so one sampler slot
+        must be free. The samplers use the sample size of the eyedropper
+        tool. Requires NumPy.
+
+        Args:
+            points: The ``(x, y)`` column and row of each pixel, as a
+                sequence of pairs or an ``(N, 2)`` array. Each pixel is
+                sampled at its center.
+            model: The color model of the result: ``rgb`` (0 to 255),
+                ``cmyk`` (0 to 100), ``lab``, ``hsb`` or ``gray`` (0 to 100).
+
+        Returns:
+            numpy.ndarray: The ``(N, components)`` colors, as floats.
+
+        """
+        return _pixels.sample_points(self, points, model)
+
+    def snapshot(self, histograms: bool = False) -> List[dict]:
+        """Reads the state of every layer in a single call.
+
+        Args:
+            histograms: If true, also reads a digest of the histogram of
+                every top level layer, which is much slower.
+
+        Returns:
+            list: One record per layer, from the top of the layers panel, with
+                its ``id``, ``name``, ``index``, ``parent`` ID, ``group``,
+                ``layerKind``, ``bounds``, ``visible``, ``opacity``,
+                ``blendMode``, ``text`` contents and ``artboard`` flag.
+
+        """
+        return _snapshot.snapshot(self, histograms)
+
     def duplicate(self, name=None, merge_layers_only=False):
         return Document(self.app.duplicate(name, merge_layers_only))
 
@@ -422,9 +771,12 @@ class Document(Photoshop):
 
         Args:
             file_path (str): Absolute path of psd file.
-            options (JPEGSaveOptions): Save options.
+            options (JPEGSaveOptions): Save options, or a save options spec
+                such as `JPEGSaveSpec`, converted into save options here.
             asCopy (bool):
         """
+        if isinstance(options, SaveOptionsSpec):
+            options = options.to_com()
         return self.app.saveAs(file_path, options, asCopy, extensionType)
 
     def splitChannels(self):
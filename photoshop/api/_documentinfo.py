@@ -7,9 +7,73 @@ application.
 
 # Import built-in modules
 from pprint import pformat
+from typing import Any
+from typing import Dict
 
 # Import local modules
+from photoshop.api import _jsx
 from photoshop.api._core import Photoshop
+from photoshop.api.enumerations import CopyrightedType
+from photoshop.api.enumerations import Urgency
+
+
+# The JavaScript name of the values of the enumerated fields.
+JSX_COPYRIGHTED = {
+    "COPYRIGHTEDWORK": CopyrightedType.CopyrightedWork,
+    "PUBLICDOMAIN": CopyrightedType.PublicDomain,
+    "UNMARKED": CopyrightedType.Unmarked,
+}
+JSX_URGENCY = {
+    "NONE": Urgency.UrgencyNone,
+    "LOW": Urgency.Low,
+    "TWO": Urgency.Two,
+    "THREE": Urgency.Three,
+    "FOUR": Urgency.Four,
+    "NORMAL": Urgency.Normal,
+    "SIX": Urgency.Six,
+    "SEVEN": Urgency.Seven,
+    "HIGH": Urgency.High,
+}
+
+FIELDS = (
+    "author",
+    "authorPosition",
+    "caption",
+    "captionWriter",
+    "category",
+    "city",
+    "country",
+    "copyrightNotice",
+    "copyrighted",
+    "creationDate",
+    "credit",
+    "exif",
+    "headline",
+    "instructions",
+    "jobName",
+    "keywords",
+    "provinceState",
+    "source",
+    "ownerUrl",
+    "supplementalCategories",
+    "title",
+    "transmissionReference",
+    "urgency",
+)
+
+# Enumerations are sent by name, e.g. ``Urgency.HIGH``.
+DOCUMENT_INFO = """
+var info = __psDocument(params.document).info;
+var values = {};
+for (var i = 0; i < params.fields.length; i++) {
+    var value = info[params.fields[i]];
+    if (value !== null && value !== undefined && typeof value == "object" && !(value instanceof Array)) {
+        value = String(value);
+    }
+    values[params.fields[i]] = value;
+}
+return values;
+"""
 
 
 # pylint: disable=too-many-public-methods
@@ -20,33 +84,22 @@ class DocumentInfo(Photoshop):
         super().__init__(parent=parent)
 
     def __str__(self):
-        return pformat(
-            {
-                "author": self.author,
-                "authorPosition": self.authorPosition,
-                "caption": self.caption,
-                "captionWriter": self.captionWriter,
-                "category": self.category,
-                "city": self.city,
-                "country": self.country,
-                "copyrightNotice": self.copyrightNotice,
-                "copyrighted": self.copyrighted,
-                "creationDate": self.creationDate,
-                "credit": self.credit,
-                "exif": self.exif,
-                "headline": self.headline,
-                "instructions": self.instructions,
-                "jobName": self.jobName,
-                "keywords": self.keywords,
-                "provinceState": self.provinceState,
-                "source": self.source,
-                "ownerUrl": self.ownerUrl,
-                "supplementalCategories": self.supplementalCategories,
-                "title": self.title,
-                "transmissionReference": self.transmissionReference,
-                "urgency": self.urgency,
-            }
-        )
+        return pformat(self.to_dict())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Reads every metadata field with a single script.
+
+        Returns:
+            dict: The values keyed by property name. ``copyrighted`` and
+                ``urgency`` are `CopyrightedType` and `Urgency` members,
+                ``exif`` a list of ``[tag, value]`` pairs.
+
+        """
+        values = _jsx.run(self, DOCUMENT_INFO, document=self.app.parent.id, fields=list(FIELDS))
+        for key, names in (("copyrighted", JSX_COPYRIGHTED), ("urgency", JSX_URGENCY)):
+            if isinstance(values.get(key), str):
+                values[key] = names.get(values[key].rsplit(".", 1)[-1], values[key])
+        return values
 
     @property
     def author(self):
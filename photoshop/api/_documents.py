@@ -1,4 +1,5 @@
 # Import local modules
+from photoshop.api import _pixels
 from photoshop.api._core import Photoshop
 from photoshop.api._document import Document
 from photoshop.api.enumerations import BitsPerChannelType
@@ -62,6 +63,24 @@ class Documents(Photoshop):
             )
         )
 
+    def from_array(self, pixels, name: str = "Untitled", resolution: float = None) -> Document:
+        """Opens a NumPy array as a new document with a single script.
+
+        Args:
+            pixels: A ``(height, width)`` or ``(height, width, channels)``
+                array with 1 to 4 channels, the last one of 2 and 4 being the
+                alpha. Requires NumPy.
+            name: The name of the document.
+            resolution: Optional, the resolution of the document in pixels
+                per inch.
+
+        Returns:
+            .Document: The new document, which is also the active document.
+
+        """
+        _pixels.open_array(self, pixels, name, resolution)
+        return Document(self.adobe.activeDocument)
+
     def __iter__(self) -> Document:
         for doc in self.app:
             self.adobe.activeDocument = doc
@@ -0,0 +1,452 @@
+"""Batched exporters used by `Document`.
+
+Each exporter sends a single script to Photoshop for the whole batch, instead
+of toggling visibility and saving the full document once per layer from Python.
+
+"""
+
+# Import built-in modules
+import os
+import time
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Union
+
+# Import local modules
+from photoshop import manifest
+from photoshop import scratch
+from photoshop.api import _jsx
+from photoshop.api import _snapshot
+from photoshop.api.errors import PhotoshopPythonAPIError
+from photoshop.api.save_options import SaveOptionsSpec
+from photoshop.streaming import ExportResult
+from photoshop.streaming import export_results
+
+
+# Copies a layer into a transparent scratch document and saves it, so the
+# source document keeps its visibility and history untouched.
+EXPORT_LAYER_FUNCTION = """
+function __psExportLayer(doc, layer, path, trim) {
+    var scratch = __psScratch(doc, "__psExport");
+    try {
+        app.activeDocument = doc;
+        layer.duplicate(scratch, ElementPlacement.PLACEATBEGINNING);
+        app.activeDocument = scratch;
+        scratch.layers[0].visible = true;
+        scratch.layers[scratch.layers.length - 1].remove();
+        if (trim) {
+            scratch.trim(TrimType.TRANSPARENT);
+        }
+        __psSave(scratch, path);
+    } finally {
+        scratch.close(SaveOptions.DONOTSAVECHANGES);
+        app.activeDocument = doc;
+    }
+}
+"""
+
+EXPORT_LAYERS = """
+var doc = __psDocument(params.document);
+var manifest = [];
+app.activeDocument = doc;
+for (var i = 0; i < doc.layers.length; i++) {
+    var layer = doc.layers[i];
+    if (params.ids !== null && !__psContains(params.ids, layer.id)) {
+        continue;
+    }
+    var entry = {"id": layer.id, "name": layer.name, "index": i, "bounds": __psBounds(layer.bounds), "path": null};
+    manifest.push(entry);
+    if (entry.bounds[2] <= entry.bounds[0] || entry.bounds[3] <= entry.bounds[1]) {
+        continue;
+    }
+    entry.path = params.outDir + "/layer_" + i + "_" + __psFileName(layer.name) + "." + params.extension;
+    __psExportLayer(doc, layer, entry.path, params.trim);
+}
+return manifest;
+"""
+
+# Exports a single layer at any depth.
+EXPORT_LAYER = """
+var doc = __psDocument(params.document);
+var layer = __psLayer(doc, params.layer);
+var bounds = __psBounds(layer.bounds);
+if (bounds[2] <= bounds[0] || bounds[3] <= bounds[1]) {
+    throw new Error("Layer " + params.layer + " is empty.");
+}
+__psExportLayer(doc, layer, params.path, params.trim);
+return bounds;
+"""
+
+# Saves a copy of a whole document.
+SAVE_COPY = """
+__psSave(__psDocument(params.document), params.path);
+"""
+
+# Each artboard is shown alone, every other top level layer hidden, and the
+# canvas is cropped to its rectangle. The crop is rolled back with the
+# history, the visibility of the layers is restored at the end. Artboards
+# sharing a file name get their index appended, counted over all artboards so
+# the paths do not depend on the batch.
+EXPORT_ARTBOARDS = """
+var doc = __psDocument(params.document);
+var s = stringIDToTypeID;
+var artboards = __psArtboards(doc);
+var manifest = [];
+var names = {};
+for (var i = 0; i < artboards.length; i++) {
+    var key = __psFileName(artboards[i].name).toLowerCase();
+    names[key] = (names[key] || 0) + 1;
+}
+
+function setVisible(id, visible) {
+    var desc = new ActionDescriptor();
+    var list = new ActionList();
+    var ref = new ActionReference();
+    ref.putIdentifier(s("layer"), id);
+    list.putReference(ref);
+    desc.putList(s("null"), list);
+    executeAction(s(visible ? "show" : "hide"), desc, DialogModes.NO);
+}
+
+// Visibility changes are usually not recorded in the history, so the top
+// level layers are tracked here and restored explicitly.
+var topLayers = [];
+for (var i = 0; i < doc.layers.length; i++) {
+    var visible = doc.layers[i].visible;
+    topLayers.push({"id": doc.layers[i].id, "visible": visible, "current": visible});
+}
+
+function showOnly(id) {
+    for (var j = 0; j < topLayers.length; j++) {
+        var wanted = id === null ? topLayers[j].visible : topLayers[j].id == id;
+        if (topLayers[j].current != wanted) {
+            setVisible(topLayers[j].id, wanted);
+            topLayers[j].current = wanted;
+        }
+    }
+}
+
+app.activeDocument = doc;
+try {
+    for (var i = 0; i < artboards.length; i++) {
+        var artboard = artboards[i];
+        if (params.ids !== null && !__psContains(params.ids, artboard.id)) {
+            continue;
+        }
+        showOnly(artboard.id);
+        var state = doc.activeHistoryState;
+        try {
+            doc.crop(artboard.rect);
+            var fileName = __psFileName(artboard.name);
+            if (names[fileName.toLowerCase()] > 1) {
+                fileName += "_" + i;
+            }
+            artboard.path = params.outDir + "/" + fileName + "." + params.extension;
+            __psSave(doc, artboard.path);
+        } finally {
+            doc.activeHistoryState = state;
+        }
+        manifest.push({"id": artboard.id, "name": artboard.name, "bounds": artboard.rect, "path": artboard.path});
+    }
+} finally {
+    showOnly(null);
+}
+return manifest;
+"""
+
+TOP_LEVEL_IDS = """
+var doc = __psDocument(params.document);
+var ids = [];
+for (var i = 0; i < doc.layers.length; i++) {
+    ids.push(doc.layers[i].id);
+}
+return ids;
+"""
+
+
+def export_layers(
+    document,
+    out_dir: str,
+    file_format: Union[str, SaveOptionsSpec] = "png",
+    trim: bool = True,
+    ids: Optional[List[int]] = None,
+) -> List[dict]:
+    """Export the top level layers of a document, one file per layer.
+
+    Args:
+        document: The document to export.
+        out_dir: The directory receiving the exported files.
+        file_format: The extension of the output files, e.g. ``png``, or a
+            save options spec such as ``JPEGSaveSpec(quality=8)``.
+        trim: If true, trims the transparent pixels around each layer.
+        ids: Optional, only export the layers with these IDs. The manifest
+            of ``out_dir`` is only written when all layers are exported.
+
+    Returns:
+        list: One entry per layer with its ``id``, ``name``, ``index``,
+            ``bounds`` in the source document and exported ``path``.
+            The path is ``None`` for empty layers.
+
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    extension, definitions = _jsx.save_options(file_format)
+    entries = _jsx.run(
+        document,
+        EXPORT_LAYERS,
+        definitions + EXPORT_LAYER_FUNCTION,
+        document=document.id,
+        outDir=_jsx.js_path(os.path.abspath(out_dir)),
+        extension=extension,
+        trim=trim,
+        ids=ids,
+    )
+    for entry in entries:
+        if entry["path"]:
+            entry["path"] = os.path.normpath(entry["path"])
+    if ids is None:
+        manifest.dump(out_dir, entries, format=extension, trim=trim, document=document.name)
+    return entries
+
+
+def _is_stale(entry: Optional[dict], digest: str) -> bool:
+    """bool: True if a manifest entry does not match the given fingerprint."""
+    if not entry or entry.get("fingerprint") != digest:
+        return True
+    return bool(entry.get("path")) and not os.path.isfile(entry["path"])
+
+
+def export_layers_incremental(
+    document,
+    out_dir: str,
+    file_format: Union[str, SaveOptionsSpec] = "png",
+    trim: bool = True,
+    histograms: bool = False,
+) -> List[dict]:
+    """Export only the top level layers changed since the previous export.
+
+    A fingerprint of every layer is computed from a single snapshot and
+    compared to the fingerprints stored in the manifest of ``out_dir``.
+    Layers whose fingerprint is unchanged and whose file still exists are
+    not rendered again.
+
+    Args:
+        document: The document to export.
+        out_dir: The directory receiving the exported files.
+        file_format: The extension of the output files, e.g. ``png``, or a
+            save options spec such as ``JPEGSaveSpec(quality=8)``.
+        trim: If true, trims the transparent pixels around each layer.
+        histograms: If true, the fingerprints also cover the histogram of
+            each layer, which catches pixel edits that keep the bounds.
+
+    Returns:
+        list: The manifest entries of all top level layers, each with its
+            ``fingerprint``.
+
+    """
+    extension, definitions = _jsx.save_options(file_format)
+    fingerprints = _snapshot.top_level_fingerprints(
+        _snapshot.snapshot(document, histograms=histograms),
+        format=extension,
+        options=definitions,
+        trim=trim,
+    )
+    previous = {entry["id"]: entry for entry in manifest.load(out_dir)["layers"]}
+    stale = [layer_id for layer_id, digest in fingerprints.items() if _is_stale(previous.get(layer_id), digest)]
+    exported = {}
+    if stale:
+        exported = {entry["id"]: entry for entry in export_layers(document, out_dir, file_format, trim, ids=stale)}
+    entries = []
+    for layer_id, digest in fingerprints.items():
+        entry = exported.get(layer_id) or previous[layer_id]
+        entry["fingerprint"] = digest
+        entries.append(entry)
+    manifest.dump(out_dir, entries, format=extension, trim=trim, document=document.name)
+    return entries
+
+
+def export_artboards(
+    document, out_dir: str, file_format: Union[str, SaveOptionsSpec] = "png", ids: Optional[List[int]] = None
+) -> List[dict]:
+    """Export the artboards of a document, one file per artboard.
+
+    Args:
+        document: The document to export.
+        out_dir: The directory receiving the exported files.
+        file_format: The extension of the output files, e.g. ``png``, or a
+            save options spec such as ``JPEGSaveSpec(quality=8)``.
+        ids: Optional, only export the artboards with these IDs.
+
+    Returns:
+        list: One entry per artboard with its ``id``, ``name``, ``bounds``
+            and exported ``path``. Artboards with the same name get their
+            index appended to the file name.
+
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    extension, definitions = _jsx.save_options(file_format)
+    entries = _jsx.run(
+        document,
+        EXPORT_ARTBOARDS,
+        _snapshot.ARTBOARDS + definitions,
+        document=document.id,
+        outDir=_jsx.js_path(os.path.abspath(out_dir)),
+        extension=extension,
+        ids=ids,
+    )
+    for entry in entries:
+        entry["path"] = os.path.normpath(entry["path"])
+    if ids is None:
+        manifest.dump(out_dir, entries, format=extension, document=document.name)
+    return entries
+
+
+def save_copy(document, path: str, options: Union[str, SaveOptionsSpec] = "png"):
+    """Save a copy of a document with a single script.
+
+    Args:
+        document: The document to save.
+        path: The path of the saved file.
+        options: A file format such as ``png``, or a save options spec.
+
+    """
+    _, definitions = _jsx.save_options(options)
+    _jsx.run(document, SAVE_COPY, definitions, document=document.id, path=_jsx.js_path(os.path.abspath(path)))
+
+
+def export_layer(document, layer_id: int, path: str, options: Union[str, SaveOptionsSpec] = "png", trim: bool = True):
+    """Export a single layer of a document, at any depth, to a file.
+
+    Args:
+        document: The document of the layer.
+        layer_id: The ID of the layer.
+        path: The path of the exported file.
+        options: A file format such as ``png``, or a save options spec.
+        trim: If true, trims the transparent pixels around the layer.
+
+    Raises:
+        PhotoshopPythonAPIError: If the layer is empty.
+
+    """
+    _, definitions = _jsx.save_options(options)
+    _jsx.run(
+        document,
+        EXPORT_LAYER,
+        definitions + EXPORT_LAYER_FUNCTION,
+        document=document.id,
+        layer=layer_id,
+        path=_jsx.js_path(os.path.abspath(path)),
+        trim=trim,
+    )
+
+
+def document_bytes(document, options: Union[str, SaveOptionsSpec] = "png") -> bytes:
+    """bytes: A copy of a document encoded with the given save options."""
+    extension, _ = _jsx.save_options(options)
+    with scratch.scratch_files.path(extension) as path:
+        save_copy(document, path, options)
+        return scratch.read_file(path)
+
+
+def iter_document_bytes(
+    document, options: Union[str, SaveOptionsSpec] = "png", chunk_size: int = scratch.CHUNK_SIZE
+) -> Iterator[bytes]:
+    """Streaming version of `document_bytes`, yielding the file in chunks."""
+    extension, _ = _jsx.save_options(options)
+    with scratch.scratch_files.path(extension) as path:
+        save_copy(document, path, options)
+        yield from scratch.iter_file(path, chunk_size)
+
+
+def layer_bytes(document, layer_id: int, options: Union[str, SaveOptionsSpec] = "png", trim: bool = True) -> bytes:
+    """bytes: A single layer of a document encoded with the given save options."""
+    extension, _ = _jsx.save_options(options)
+    with scratch.scratch_files.path(extension) as path:
+        export_layer(document, layer_id, path, options, trim)
+        return scratch.read_file(path)
+
+
+def _chunks(items: List[int], size: int) -> Iterator[List[int]]:
+    size = max(size, 1)
+    for start in range(0, len(items), size):
+        end = start + size
+        yield items[start:end]
+
+
+def iter_export_layers(
+    document,
+    out_dir: str,
+    file_format: Union[str, SaveOptionsSpec] = "png",
+    trim: bool = True,
+    batch_size: int = 1,
+) -> Iterator[ExportResult]:
+    """Export the top level layers of a document, yielding each finished file.
+
+    Args:
+        document: The document to export.
+        out_dir: The directory receiving the exported files.
+        file_format: The extension of the output files, e.g. ``png``, or a
+            save options spec such as ``JPEGSaveSpec(quality=8)``.
+        trim: If true, trims the transparent pixels around each layer.
+        batch_size: The number of layers exported by each script.
+
+    Yields:
+        ExportResult: One result per exported file. Empty layers are skipped.
+
+    """
+    ids = _jsx.run(document, TOP_LEVEL_IDS, document=document.id)
+    for chunk in _chunks(ids, batch_size):
+        started = time.perf_counter()
+        yield from export_results(export_layers(document, out_dir, file_format, trim, ids=chunk), started)
+
+
+def iter_export_artboards(
+    document,
+    out_dir: str,
+    file_format: Union[str, SaveOptionsSpec] = "png",
+    batch_size: int = 1,
+) -> Iterator[ExportResult]:
+    """Export the artboards of a document, yielding each finished file.
+
+    Args:
+        document: The document to export.
+        out_dir: The directory receiving the exported files.
+        file_format: The extension of the output files, e.g. ``png``, or a
+            save options spec such as ``JPEGSaveSpec(quality=8)``.
+        batch_size: The number of artboards exported by each script.
+
+    Yields:
+        ExportResult: One result per exported file.
+
+    """
+    ids = [artboard["id"] for artboard in _snapshot.artboards(document)]
+    for chunk in _chunks(ids, batch_size):
+        started = time.perf_counter()
+        yield from export_results(export_artboards(document, out_dir, file_format, ids=chunk), started)
+
+
+def thread_document(document_id: int):
+    """Find an open document from a thread other than the one owning it.
+
+    COM objects can only be used from the apartment that created them, so the
+    calling thread opens its own connection to Photoshop.
+
+    Args:
+        document_id: The ID of the document.
+
+    Returns:
+        Document: The document, bound to the calling thread.
+
+    """
+    # Import third-party modules
+    import comtypes
+
+    # Import local modules
+    from photoshop.api._document import Document
+    from photoshop.api.application import Application
+
+    comtypes.CoInitialize()
+    for document in Application().app.documents:
+        if document.id == document_id:
+            return Document(document)
+    raise PhotoshopPythonAPIError(f"Document {document_id} is not open.")
@@ -0,0 +1,259 @@
+"""Helpers for running batched ExtendScript calls.
+
+Reading or writing a property through COM costs one round trip to Photoshop.
+Work that touches many layers or documents is much cheaper when it is sent as
+one script and the result comes back as one JSON string. ExtendScript has no
+native ``JSON`` object, so every script built here ships a small serializer.
+
+"""
+
+# Import built-in modules
+import json
+from typing import Any
+from typing import Tuple
+from typing import Union
+
+# Import local modules
+from photoshop.api.enumerations import TiffEncodingType
+from photoshop.api.errors import PhotoshopPythonAPIError
+from photoshop.api.save_options import BMPSaveSpec
+from photoshop.api.save_options import GIFSaveSpec
+from photoshop.api.save_options import JPEGSaveSpec
+from photoshop.api.save_options import PNGSaveSpec
+from photoshop.api.save_options import PhotoshopSaveSpec
+from photoshop.api.save_options import SaveOptionsSpec
+from photoshop.api.save_options import TargaSaveSpec
+from photoshop.api.save_options import TiffSaveSpec
+
+
+# Functions available to every script body executed through `run`.
+PRELUDE = r"""
+function __psQuote(value) {
+    return '"' + String(value).replace(/[\\"\u0000-\u001f\u007f-\uffff]/g, function (c) {
+        if (c === '"' || c === "\\") {
+            return "\\" + c;
+        }
+        var hex = c.charCodeAt(0).toString(16);
+        return "\\u" + "0000".substr(hex.length) + hex;
+    }) + '"';
+}
+
+function __psStringify(value) {
+    if (value === null || value === undefined) {
+        return "null";
+    }
+    var kind = typeof value;
+    if (kind === "number") {
+        return isFinite(value) ? String(value) : "null";
+    }
+    if (kind === "boolean") {
+        return value ? "true" : "false";
+    }
+    if (kind === "string") {
+        return __psQuote(value);
+    }
+    var items = [];
+    if (value instanceof Array) {
+        for (var i = 0; i < value.length; i++) {
+            items.push(__psStringify(value[i]));
+        }
+        return "[" + items.join(",") + "]";
+    }
+    for (var key in value) {
+        if (value.hasOwnProperty(key)) {
+            items.push(__psQuote(key) + ":" + __psStringify(value[key]));
+        }
+    }
+    return "{" + items.join(",") + "}";
+}
+
+function __psPx(value) {
+    return Number(value.as ? value.as("px") : value);
+}
+
+function __psBounds(bounds) {
+    return [__psPx(bounds[0]), __psPx(bounds[1]), __psPx(bounds[2]), __psPx(bounds[3])];
+}
+
+function __psContains(items, value) {
+    for (var i = 0; i < items.length; i++) {
+        if (items[i] == value) {
+            return true;
+        }
+    }
+    return false;
+}
+
+function __psDocument(id) {
+    for (var i = 0; i < app.documents.length; i++) {
+        if (app.documents[i].id == id) {
+            return app.documents[i];
+        }
+    }
+    throw new Error("Document " + id + " is not open.");
+}
+
+function __psSelectLayer(id) {
+    var s = stringIDToTypeID;
+    var desc = new ActionDescriptor();
+    var ref = new ActionReference();
+    ref.putIdentifier(s("layer"), id);
+    desc.putReference(s("null"), ref);
+    desc.putBoolean(s("makeVisible"), false);
+    executeAction(s("select"), desc, DialogModes.NO);
+}
+
+function __psLayer(doc, id) {
+    var s = stringIDToTypeID;
+    app.activeDocument = doc;
+    // Setting doc.activeLayer would show a hidden layer, the previous
+    // selection is restored with Action Manager like the new one is made.
+    var current = new ActionReference();
+    current.putProperty(s("property"), s("layerID"));
+    current.putEnumerated(s("layer"), s("ordinal"), s("targetEnum"));
+    var previous = null;
+    try {
+        previous = executeActionGet(current).getInteger(s("layerID"));
+    } catch (e) {
+        // No layer is selected.
+    }
+    __psSelectLayer(id);
+    var layer = doc.activeLayer;
+    if (previous !== null && previous != id) {
+        __psSelectLayer(previous);
+    }
+    return layer;
+}
+
+// Creates a transparent document of the size, resolution, color mode and bit
+// depth of a document, to copy layers into without converting their pixels.
+// Modes without a new document equivalent fall back to RGB, and bitmap and
+// duotone documents to 8 bits grayscale.
+function __psScratch(doc, name) {
+    var mode = NewDocumentMode.RGB;
+    if (doc.mode == DocumentMode.CMYK) {
+        mode = NewDocumentMode.CMYK;
+    } else if (doc.mode == DocumentMode.LAB) {
+        mode = NewDocumentMode.LAB;
+    } else if (__psContains([DocumentMode.GRAYSCALE, DocumentMode.BITMAP, DocumentMode.DUOTONE], doc.mode)) {
+        mode = NewDocumentMode.GRAYSCALE;
+    }
+    var depth = doc.bitsPerChannel == BitsPerChannelType.ONE ? BitsPerChannelType.EIGHT : doc.bitsPerChannel;
+    return app.documents.add(doc.width, doc.height, doc.resolution, name, mode, DocumentFill.TRANSPARENT, 1.0, depth);
+}
+
+function __psFileName(value) {
+    return String(value).replace(/[\\\/:\*\?"<>\|]/g, "_");
+}
+"""
+
+_TEMPLATE = """(function () {{
+{prelude}
+{definitions}
+var __psUnits = app.preferences.rulerUnits;
+var __psDialogs = app.displayDialogs;
+var __psResult;
+app.preferences.rulerUnits = Units.PIXELS;
+app.displayDialogs = DialogModes.NO;
+try {{
+    __psResult = {{"result": (function (params) {{
+{body}
+    }})({params})}};
+}} catch (e) {{
+    __psResult = {{"error": String(e.message || e), "line": e.line}};
+}} finally {{
+    app.preferences.rulerUnits = __psUnits;
+    app.displayDialogs = __psDialogs;
+}}
+return __psStringify(__psResult);
+}})();"""
+
+# Save options used when the batched exporters are given a file format,
+# keyed by file extension.
+SAVE_OPTIONS = {
+    "bmp": BMPSaveSpec(),
+    "gif": GIFSaveSpec(),
+    "jpg": JPEGSaveSpec(quality=10),
+    "png": PNGSaveSpec(),
+    "psd": PhotoshopSaveSpec(layers=True),
+    "tga": TargaSaveSpec(),
+    "tif": TiffSaveSpec(imageCompression=TiffEncodingType.TiffLZW),
+}
+
+# Alternative spellings accepted for the keys of `SAVE_OPTIONS`.
+FORMAT_ALIASES = {"jpeg": "jpg", "tiff": "tif", "targa": "tga"}
+
+
+def to_js(value: Any) -> str:
+    """Convert a JSON serializable Python value into a JavaScript literal."""
+    return json.dumps(value, ensure_ascii=True)
+
+
+def js_path(path) -> str:
+    """Convert a local path into the form ExtendScript's `File` expects."""
+    return str(path).replace("\\", "/")
+
+
+def save_options(options: Union[str, SaveOptionsSpec]) -> Tuple[str, str]:
+    """Resolve save options into their extension and JavaScript definitions.
+
+    Args:
+        options: A save options spec, or the extension of the output files,
+            e.g. ``png``, to use the default options of `SAVE_OPTIONS`.
+
+    Returns:
+        tuple: The extension of the output files and the JavaScript
+            definitions of ``__psSaveOptions()`` and ``__psSave(doc, path)``.
+
+    Raises:
+        PhotoshopPythonAPIError: If the format is not supported.
+
+    """
+    if isinstance(options, str):
+        extension = options.lower().lstrip(".")
+        extension = FORMAT_ALIASES.get(extension, extension)
+        if extension not in SAVE_OPTIONS:
+            raise PhotoshopPythonAPIError(f'Unsupported export format "{options}".')
+        options = SAVE_OPTIONS[extension]
+    elif not isinstance(options, SaveOptionsSpec):
+        raise PhotoshopPythonAPIError(f"Expected a file format or a save options spec, got {options!r}.")
+    return options.extension, options.jsx_definitions()
+
+
+def build(body: str, definitions: str = "", **params) -> str:
+    """Build the source of a batched script.
+
+    Args:
+        body: The body of a function receiving ``params`` whose return value
+            is sent back to Python.
+        definitions: Extra JavaScript definitions available to the body.
+        **params: JSON serializable values passed to the body as ``params``.
+
+    Returns:
+        str: The ExtendScript source.
+
+    """
+    return _TEMPLATE.format(prelude=PRELUDE, definitions=definitions, body=body, params=to_js(params))
+
+
+def run(ps_object, body: str, definitions: str = "", **params) -> Any:
+    """Run a batched script and decode its result.
+
+    Args:
+        ps_object: Any Photoshop object able to evaluate javascript.
+        body: The body of a function receiving ``params`` whose return value
+            is sent back to Python.
+        definitions: Extra JavaScript definitions available to the body.
+        **params: JSON serializable values passed to the body as ``params``.
+
+    Returns:
+        The decoded return value of the body.
+
+    Raises:
+        PhotoshopPythonAPIError: If the script raised an error.
+
+    """
+    output = json.loads(ps_object.eval_javascript(build(body, definitions, **params)))
+    if "error" in output:
+        raise PhotoshopPythonAPIError(f"Script failed at line {output.get('line')}: {output['error']}")
+    return output.get("result")
@@ -0,0 +1,715 @@
+"""Pixel transfer between documents and NumPy arrays.
+
+The pixels are saved as Photoshop Raw files in the scratch directory and
+memory mapped by `photoshop.arrays`, so no image is encoded or decoded.
+
+"""
+
+# Import built-in modules
+import os
+import shutil
+import tempfile
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Union
+import weakref
+
+# Import local modules
+from photoshop import arrays
+from photoshop import scratch
+from photoshop.api import _jsx
+from photoshop.api import _snapshot
+from photoshop.api.enumerations import SelectionType
+from photoshop.api.errors import PhotoshopPythonAPIError
+
+
+# Bit depths are converted on the document itself, then its history is rolled
+# back, so the document is left unchanged.
+SAVE_RAW = """
+var doc = __psDocument(params.document);
+var depths = {"8": BitsPerChannelType.EIGHT, "16": BitsPerChannelType.SIXTEEN, "32": BitsPerChannelType.THIRTYTWO};
+app.activeDocument = doc;
+if (doc.bitsPerChannel == BitsPerChannelType.ONE) {
+    throw new Error("Bitmap documents have no raw pixels, convert them to grayscale first.");
+}
+var state = doc.activeHistoryState;
+try {
+    if (params.bitDepth !== null && doc.bitsPerChannel != depths[String(params.bitDepth)]) {
+        doc.bitsPerChannel = depths[String(params.bitDepth)];
+    }
+    var bitDepth = 8;
+    if (doc.bitsPerChannel == BitsPerChannelType.SIXTEEN) {
+        bitDepth = 16;
+    } else if (doc.bitsPerChannel == BitsPerChannelType.THIRTYTWO) {
+        bitDepth = 32;
+    }
+    var channels = doc.componentChannels.length;
+    if (params.alphaChannels) {
+        for (var i = 0; i < doc.channels.length; i++) {
+            var kind = doc.channels[i].kind;
+            if (kind == ChannelType.MASKEDAREA || kind == ChannelType.SELECTEDAREA) {
+                channels++;
+            }
+        }
+    }
+    var options = new RawSaveOptions();
+    options.alphaChannels = params.alphaChannels;
+    options.spotColors = false;
+    doc.saveAs(new File(params.path), options, true, Extension.LOWERCASE);
+    return {"width": __psPx(doc.width), "height": __psPx(doc.height), "channels": channels, "bitDepth": bitDepth};
+} finally {
+    doc.activeHistoryState = state;
+}
+"""
+
+
+# Each layer is copied into a scratch document and its transparency moved
+# into a layer mask, which leaves the layer opaque with its straight color.
+# The mask is stored in an alpha channel and deleted without being applied,
+# then the document is cropped to the layer bounds and saved as raw RGBA, so
+# the color is never blended with the background.
+LAYERS_RAW = """
+var doc = __psDocument(params.document);
+var s = stringIDToTypeID;
+var depth = doc.bitsPerChannel;
+var options = new RawSaveOptions();
+options.alphaChannels = true;
+options.spotColors = false;
+var records = [];
+app.activeDocument = doc;
+if (depth == BitsPerChannelType.ONE) {
+    throw new Error("Bitmap documents have no raw pixels, convert them to grayscale first.");
+}
+var width = __psPx(doc.width);
+var height = __psPx(doc.height);
+for (var i = 0; i < params.ids.length; i++) {
+    var record = {"id": params.ids[i], "path": null, "offset": null, "size": null, "error": null};
+    records.push(record);
+    try {
+        var layer = __psLayer(doc, record.id);
+        var b = __psBounds(layer.bounds);
+        b = [Math.max(b[0], 0), Math.max(b[1], 0), Math.min(b[2], width), Math.min(b[3], height)];
+        if (b[2] <= b[0] || b[3] <= b[1]) {
+            continue;
+        }
+        var scratch = app.documents.add(
+            doc.width, doc.height, doc.resolution, "__psPixels", NewDocumentMode.RGB, DocumentFill.WHITE, 1.0, depth
+        );
+        try {
+            app.activeDocument = doc;
+            layer.duplicate(scratch, ElementPlacement.PLACEATBEGINNING);
+            app.activeDocument = scratch;
+            var copy = scratch.layers[0];
+            scratch.activeLayer = copy;
+            copy.visible = true;
+            copy.opacity = 100;
+            copy.fillOpacity = 100;
+            copy.blendMode = BlendMode.NORMAL;
+            try {
+                var effects = new ActionReference();
+                effects.putClass(s("layerEffects"));
+                effects.putEnumerated(s("layer"), s("ordinal"), s("targetEnum"));
+                var hide = new ActionDescriptor();
+                hide.putReference(s("null"), effects);
+                executeAction(s("hide"), hide, DialogModes.NO);
+            } catch (e) {
+                // The layer has no effects.
+            }
+            var mask = new ActionReference();
+            mask.putEnumerated(s("channel"), s("channel"), s("mask"));
+            var make = new ActionDescriptor();
+            make.putClass(s("new"), s("channel"));
+            make.putReference(s("at"), mask);
+            make.putEnumerated(s("using"), s("userMaskEnabled"), s("transparency"));
+            executeAction(s("make"), make, DialogModes.NO);
+            var selection = new ActionReference();
+            selection.putProperty(s("channel"), s("selection"));
+            var load = new ActionDescriptor();
+            load.putReference(s("null"), selection);
+            load.putReference(s("to"), mask);
+            executeAction(s("set"), load, DialogModes.NO);
+            var alpha = scratch.channels.add();
+            alpha.kind = ChannelType.MASKEDAREA;
+            scratch.selection.store(alpha);
+            scratch.selection.deselect();
+            var remove = new ActionDescriptor();
+            remove.putReference(s("null"), mask);
+            remove.putBoolean(s("apply"), false);
+            executeAction(s("delete"), remove, DialogModes.NO);
+            scratch.crop(b);
+            record.path = params.outDir + "/layer_" + record.id + ".raw";
+            scratch.saveAs(new File(record.path), options, true, Extension.LOWERCASE);
+            record.offset = [b[0], b[1]];
+            record.size = [b[2] - b[0], b[3] - b[1]];
+        } finally {
+            scratch.close(SaveOptions.DONOTSAVECHANGES);
+            app.activeDocument = doc;
+        }
+    } catch (e) {
+        record.error = String(e.message || e);
+    }
+}
+var bitDepth = depth == BitsPerChannelType.SIXTEEN ? 16 : depth == BitsPerChannelType.THIRTYTWO ? 32 : 8;
+return {"bitDepth": bitDepth, "layers": records};
+"""
+
+# The array is opened from a PNG file and its layer duplicated into the
+# document, which keeps the pixels exact, unlike placing a smart object.
+IMPORT_LAYER = """
+var doc = __psDocument(params.document);
+var source = app.open(new File(params.path));
+var layer;
+var before;
+try {
+    before = __psBounds(source.activeLayer.bounds);
+    layer = source.activeLayer.duplicate(doc, ElementPlacement.PLACEATBEGINNING);
+} finally {
+    source.close(SaveOptions.DONOTSAVECHANGES);
+}
+app.activeDocument = doc;
+doc.activeLayer = layer;
+var after = __psBounds(layer.bounds);
+layer.translate(params.left + before[0] - after[0], params.top + before[1] - after[1]);
+layer.name = params.name;
+return layer.id;
+"""
+
+OPEN_ARRAY = """
+var source = app.open(new File(params.path));
+var doc = source.duplicate(params.name);
+source.close(SaveOptions.DONOTSAVECHANGES);
+app.activeDocument = doc;
+if (params.resolution !== null) {
+    doc.resizeImage(undefined, undefined, params.resolution, ResampleMethod.NONE);
+}
+return doc.id;
+"""
+
+# The tiles are cropped from a merged duplicate of the document, kept open
+# between the batches and rolled back after each crop.
+OPEN_TILES = """
+var doc = __psDocument(params.document);
+var depths = {"8": BitsPerChannelType.EIGHT, "16": BitsPerChannelType.SIXTEEN, "32": BitsPerChannelType.THIRTYTWO};
+app.activeDocument = doc;
+if (doc.bitsPerChannel == BitsPerChannelType.ONE) {
+    throw new Error("Bitmap documents have no raw pixels, convert them to grayscale first.");
+}
+var copy = doc.duplicate("__psTiles", true);
+app.activeDocument = copy;
+if (params.bitDepth !== null && copy.bitsPerChannel != depths[String(params.bitDepth)]) {
+    copy.bitsPerChannel = depths[String(params.bitDepth)];
+}
+var bitDepth = 8;
+if (copy.bitsPerChannel == BitsPerChannelType.SIXTEEN) {
+    bitDepth = 16;
+} else if (copy.bitsPerChannel == BitsPerChannelType.THIRTYTWO) {
+    bitDepth = 32;
+}
+return {
+    "document": copy.id,
+    "width": __psPx(copy.width),
+    "height": __psPx(copy.height),
+    "channels": copy.componentChannels.length,
+    "bitDepth": bitDepth
+};
+"""
+
+TILES_RAW = """
+var doc = __psDocument(params.document);
+var options = new RawSaveOptions();
+options.alphaChannels = false;
+options.spotColors = false;
+app.activeDocument = doc;
+for (var i = 0; i < params.tiles.length; i++) {
+    var state = doc.activeHistoryState;
+    try {
+        doc.crop(params.tiles[i].bounds);
+        doc.saveAs(new File(params.tiles[i].path), options, true, Extension.LOWERCASE);
+    } finally {
+        doc.activeHistoryState = state;
+    }
+}
+return params.tiles.length;
+"""
+
+CLOSE_DOCUMENT = """
+__psDocument(params.document).close(SaveOptions.DONOTSAVECHANGES);
+"""
+
+# The mask is opened as a grayscale document and its channel duplicated into
+# the document, then loaded as the selection.
+MASK_TO_SELECTION = """
+var doc = __psDocument(params.document);
+var source = app.open(new File(params.path));
+var active = doc.activeChannels;
+var alpha;
+try {
+    if (__psPx(source.width) != __psPx(doc.width) || __psPx(source.height) != __psPx(doc.height)) {
+        throw new Error(
+            "The mask is " + __psPx(source.width) + "x" + __psPx(source.height) + " pixels, the document "
+            + __psPx(doc.width) + "x" + __psPx(doc.height) + "."
+        );
+    }
+    if (doc.bitsPerChannel != BitsPerChannelType.ONE && source.bitsPerChannel != doc.bitsPerChannel) {
+        source.bitsPerChannel = doc.bitsPerChannel;
+    }
+    source.channels[0].duplicate(doc);
+} finally {
+    source.close(SaveOptions.DONOTSAVECHANGES);
+}
+app.activeDocument = doc;
+alpha = doc.channels[doc.channels.length - 1];
+doc.activeChannels = active;
+doc.selection.load(alpha, SelectionType[params.combination], false);
+if (params.feather > 0) {
+    doc.selection.feather(params.feather);
+}
+if (params.channelName !== null) {
+    alpha.name = params.channelName;
+} else {
+    alpha.remove();
+}
+"""
+
+# The selection is stored into a temporary alpha channel, duplicated into a
+# grayscale scratch document saved as raw gray and alpha.
+SELECTION_TO_MASK = """
+var doc = __psDocument(params.document);
+app.activeDocument = doc;
+var depth = doc.bitsPerChannel == BitsPerChannelType.ONE ? BitsPerChannelType.EIGHT : doc.bitsPerChannel;
+var info = {
+    "width": __psPx(doc.width),
+    "height": __psPx(doc.height),
+    "channels": 2,
+    "bitDepth": depth == BitsPerChannelType.SIXTEEN ? 16 : depth == BitsPerChannelType.THIRTYTWO ? 32 : 8,
+    "empty": false
+};
+try {
+    doc.selection.bounds;
+} catch (e) {
+    info.empty = true;
+    return info;
+}
+var active = doc.activeChannels;
+var alpha = doc.channels.add();
+var scratch = null;
+try {
+    alpha.kind = ChannelType.MASKEDAREA;
+    doc.selection.store(alpha);
+    scratch = app.documents.add(
+        doc.width, doc.height, doc.resolution, "__psMask", NewDocumentMode.GRAYSCALE, DocumentFill.WHITE, 1.0, depth
+    );
+    app.activeDocument = doc;
+    alpha.duplicate(scratch);
+    app.activeDocument = scratch;
+    var options = new RawSaveOptions();
+    options.alphaChannels = true;
+    options.spotColors = false;
+    scratch.saveAs(new File(params.path), options, true, Extension.LOWERCASE);
+} finally {
+    if (scratch !== null) {
+        scratch.close(SaveOptions.DONOTSAVECHANGES);
+    }
+    app.activeDocument = doc;
+    alpha.remove();
+    doc.activeChannels = active;
+}
+return info;
+"""
+
+# Each point is read by a temporary color sampler, so a single free sampler
+# slot is enough. Samplers are placed at the center of the pixel, a corner
+# would be shared with the pixels above and to the left.
+SAMPLE_POINTS = """
+var doc = __psDocument(params.document);
+var components = {
+    "rgb": ["red", "green", "blue"],
+    "cmyk": ["cyan", "magenta", "yellow", "black"],
+    "lab": ["l", "a", "b"],
+    "hsb": ["hue", "saturation", "brightness"],
+    "gray": ["gray"]
+};
+var names = components[params.model];
+var values = [];
+app.activeDocument = doc;
+for (var i = 0; i < params.points.length; i++) {
+    var sampler = doc.colorSamplers.add([
+        new UnitValue(params.points[i][0] + 0.5, "px"), new UnitValue(params.points[i][1] + 0.5, "px")
+    ]);
+    try {
+        var color = sampler.color[params.model];
+        for (var j = 0; j < names.length; j++) {
+            values.push(color[names[j]]);
+        }
+    } finally {
+        sampler.remove();
+    }
+}
+return values;
+"""
+
+CHANNEL_HISTOGRAMS = """
+var doc = __psDocument(params.document);
+var histograms = [];
+app.activeDocument = doc;
+for (var i = 0; i < doc.channels.length; i++) {
+    var channel = doc.channels[i];
+    if (channel.kind == ChannelType.COMPONENT || params.alphaChannels) {
+        histograms.push(channel.histogram);
+    }
+}
+return histograms;
+"""
+
+# The JavaScript name of each selection type.
+SELECTION_TYPES = {
+    SelectionType.ReplaceSelection: "REPLACE",
+    SelectionType.ExtendSelection: "EXTEND",
+    SelectionType.DiminishSelection: "DIMINISH",
+    SelectionType.IntersectSelection: "INTERSECT",
+}
+
+# The components of each color model read by `sample_points`.
+COLOR_MODELS = {"rgb": 3, "cmyk": 4, "lab": 3, "hsb": 3, "gray": 1}
+
+# The kinds of layers without pixels of their own: adjustment layers and groups.
+NO_PIXELS_KINDS = (2, 7)
+
+
+class LayerPixels(NamedTuple):
+    """The pixels of a layer cropped to its bounds.
+
+    Attributes:
+        pixels: The ``(height, width, 4)`` RGBA pixels, not premultiplied.
+        offset: The ``(left, top)`` position of the pixels in the document.
+
+    """
+
+    pixels: Any
+    offset: Tuple[int, int]
+
+
+def scratch_raw_path() -> str:
+    """str: A new raw file in the scratch directory, owned by the caller."""
+    handle, path = tempfile.mkstemp(suffix=".raw", dir=scratch.scratch_files.root)
+    os.close(handle)
+    return path
+
+
+def map_raw(path: str, info: dict) -> Any:
+    """Memory map a raw file deleted once the array is garbage collected.
+
+    Args:
+        path: The raw file, removed if it cannot be mapped.
+        info: The ``width``, ``height``, ``channels`` and ``bitDepth`` of
+            the file.
+
+    Returns:
+        numpy.memmap: The ``(height, width, channels)`` pixels.
+
+    """
+    try:
+        pixels = arrays.open_raw(path, info["width"], info["height"], info["channels"], info["bitDepth"])
+    except BaseException:
+        scratch.remove_quietly(path)
+        raise
+    weakref.finalize(pixels, scratch.remove_quietly, path)
+    return pixels
+
+
+def to_numpy(
+    document,
+    channels: Optional[Union[int, Sequence[int]]] = None,
+    bit_depth: Optional[int] = None,
+    alpha_channels: bool = False,
+) -> Any:
+    """Read the composite pixels of a document into a memory mapped array.
+
+    Args:
+        document: The document to read.
+        channels: Optional, the number of leading channels or the indices of
+            the channels to keep.
+        bit_depth: Optional, converts the pixels to 8, 16 or 32 bits per
+            channel. Defaults to the depth of the document.
+        alpha_channels: If true, the alpha channels follow the color
+            channels.
+
+    Returns:
+        numpy.memmap: The ``(height, width, channels)`` pixels.
+
+    """
+    if bit_depth is not None:
+        arrays.raw_dtype(bit_depth)
+    path = scratch_raw_path()
+    try:
+        info = _jsx.run(
+            document,
+            SAVE_RAW,
+            document=document.id,
+            path=_jsx.js_path(path),
+            bitDepth=bit_depth,
+            alphaChannels=alpha_channels,
+        )
+    except BaseException:
+        scratch.remove_quietly(path)
+        raise
+    return arrays.select_channels(map_raw(path, info), channels)
+
+
+def layers_to_numpy(document, ids: Optional[Sequence[int]] = None) -> Dict[int, LayerPixels]:
+    """Read the pixels of many layers with a single script.
+
+    Args:
+        document: The document of the layers.
+        ids: Optional, the IDs of the layers at any depth. Defaults to every
+            layer with pixels of its own, i.e. not groups nor adjustments.
+
+    Returns:
+        dict: The `LayerPixels` keyed by layer ID. Empty layers, and layers
+            entirely outside of the canvas, are left out.
+
+    Raises:
+        PhotoshopPythonAPIError: If some layers could not be read.
+
+    """
+    if ids is None:
+        ids = [record["id"] for record in _snapshot.snapshot(document) if record["layerKind"] not in NO_PIXELS_KINDS]
+    out_dir = tempfile.mkdtemp(dir=scratch.scratch_files.root)
+    try:
+        result = _jsx.run(
+            document,
+            LAYERS_RAW,
+            document=document.id,
+            ids=list(ids),
+            outDir=_jsx.js_path(out_dir),
+        )
+        errors = [f"{record['id']}: {record['error']}" for record in result["layers"] if record["error"]]
+        if errors:
+            raise PhotoshopPythonAPIError(f"Could not read the pixels of layers {', '.join(errors)}.")
+        layers = {}
+        for record in result["layers"]:
+            if record["path"]:
+                width, height = record["size"]
+                pixels = arrays.read_raw(record["path"], width, height, 4, result["bitDepth"])
+                layers[record["id"]] = LayerPixels(arrays.clear_transparent(pixels), tuple(record["offset"]))
+        return layers
+    finally:
+        shutil.rmtree(out_dir, ignore_errors=True)
+
+
+def add_layer_from_array(document, pixels: Any, name: str, position: Tuple[int, int] = (0, 0)) -> int:
+    """Add an array as a new layer at the top of a document, with one script.
+
+    Args:
+        document: The document receiving the layer.
+        pixels: The pixels, see `arrays.to_png` for the supported arrays.
+        name: The name of the new layer.
+        position: The ``(left, top)`` position of the pixels in the document.
+
+    Returns:
+        int: The ID of the new layer.
+
+    """
+    with scratch.scratch_files.path("png") as path:
+        arrays.write_png(path, pixels)
+        return _jsx.run(
+            document,
+            IMPORT_LAYER,
+            document=document.id,
+            path=_jsx.js_path(path),
+            name=name,
+            left=position[0],
+            top=position[1],
+        )
+
+
+def open_array(ps_object, pixels: Any, name: str, resolution: Optional[float] = None) -> int:
+    """Open an array as a new document, with one script.
+
+    Args:
+        ps_object: Any Photoshop object able to evaluate javascript.
+        pixels: The pixels, see `arrays.to_png` for the supported arrays.
+        name: The name of the new document.
+        resolution: Optional, the resolution of the document in pixels per
+            inch.
+
+    Returns:
+        int: The ID of the new document, which is also the active document.
+
+    """
+    with scratch.scratch_files.path("png") as path:
+        arrays.write_png(path, pixels)
+        return _jsx.run(ps_object, OPEN_ARRAY, path=_jsx.js_path(path), name=name, resolution=resolution)
+
+
+def select_mask(
+    ps_object,
+    document_id: int,
+    mask: Any,
+    feather: float = 0,
+    combination: SelectionType = SelectionType.ReplaceSelection,
+    channel_name: Optional[str] = None,
+):
+    """Load a mask as the selection of a document, with one script.
+
+    Args:
+        ps_object: Any Photoshop object able to evaluate javascript.
+        document_id: The ID of the document.
+        mask: The ``(height, width)`` mask, of the size of the document.
+        feather: The radius in pixels of the feather applied to the
+            selection.
+        combination: How the mask is combined with the current selection.
+        channel_name: Optional, keeps the mask as an alpha channel with this
+            name.
+
+    Raises:
+        PhotoshopPythonAPIError: If the mask is not a single channel.
+
+    """
+    mask = arrays.numpy().asarray(mask)
+    if mask.ndim == 3 and mask.shape[2] == 1:
+        mask = mask[..., 0]
+    if mask.ndim != 2:
+        raise PhotoshopPythonAPIError(f"Expected a (height, width) mask, got {mask.shape}.")
+    with scratch.scratch_files.path("png") as path:
+        arrays.write_png(path, mask)
+        _jsx.run(
+            ps_object,
+            MASK_TO_SELECTION,
+            document=document_id,
+            path=_jsx.js_path(path),
+            feather=feather,
+            combination=SELECTION_TYPES[SelectionType(combination)],
+            channelName=channel_name,
+        )
+
+
+def selection_mask(ps_object, document_id: int) -> Any:
+    """Read the selection of a document as a mask, with one script.
+
+    Args:
+        ps_object: Any Photoshop object able to evaluate javascript.
+        document_id: The ID of the document.
+
+    Returns:
+        numpy.ndarray: The ``(height, width)`` mask, where 0 is unselected
+            and the maximum value of the bit depth of the document fully
+            selected. Memory mapped unless nothing is selected.
+
+    """
+    path = scratch_raw_path()
+    try:
+        info = _jsx.run(ps_object, SELECTION_TO_MASK, document=document_id, path=_jsx.js_path(path))
+    except BaseException:
+        scratch.remove_quietly(path)
+        raise
+    if info["empty"]:
+        scratch.remove_quietly(path)
+        return arrays.numpy().zeros((info["height"], info["width"]), dtype=arrays.raw_dtype(info["bitDepth"], "="))
+    return map_raw(path, info)[..., 1]
+
+
+def sample_points(document, points: Any, model: str = "rgb") -> Any:
+    """Read the color of many pixels with one script.
+
+    Args:
+        document: The document to sample.
+        points: The ``(x, y)`` column and row of each pixel, as a sequence
+            or an ``(N, 2)`` array. Each pixel is sampled at its center.
+        model: The color model of the result, one of `COLOR_MODELS`.
+
+    Returns:
+        numpy.ndarray: The ``(N, components)`` colors, as floats.
+
+    Raises:
+        PhotoshopPythonAPIError: If the color model or the points are invalid.
+
+    """
+    np = arrays.numpy()
+    if model not in COLOR_MODELS:
+        raise PhotoshopPythonAPIError(f"Unsupported color model {model!r}, expected one of {sorted(COLOR_MODELS)}.")
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2) if len(points) else np.zeros((0, 2))
+    values = _jsx.run(document, SAMPLE_POINTS, document=document.id, points=points.tolist(), model=model)
+    return np.array(values, dtype=np.float64).reshape(len(points), COLOR_MODELS[model])
+
+
+def histograms(document, alpha_channels: bool = False) -> Any:
+    """Read the histograms of the channels of a document with one script.
+
+    Args:
+        document: The document to read.
+        alpha_channels: If true, also reads the alpha and spot channels,
+            after the component channels.
+
+    Returns:
+        numpy.ndarray: The ``(channels, 256)`` pixel counts.
+
+    """
+    counts = _jsx.run(document, CHANNEL_HISTOGRAMS, document=document.id, alphaChannels=alpha_channels)
+    return arrays.numpy().array(counts, dtype="int64").reshape(len(counts), 256)
+
+
+def iter_tiles(
+    document,
+    tile: int = 4096,
+    overlap: int = 0,
+    channels: Optional[Union[int, Sequence[int]]] = None,
+    bit_depth: Optional[int] = None,
+    batch: int = 4,
+) -> Iterator["arrays.Tile"]:
+    """Read the composite pixels of a document tile by tile.
+
+    Args:
+        document: The document to read.
+        tile: The length of the edge of the tile cores.
+        overlap: The number of pixels added on every side of the cores.
+        channels: Optional, the number of leading channels or the indices of
+            the channels to keep.
+        bit_depth: Optional, converts the pixels to 8, 16 or 32 bits per
+            channel.
+        batch: The number of tiles saved by each script. At most this many
+            tiles are waiting in the scratch directory, plus the tiles still
+            referenced by the caller.
+
+    Yields:
+        arrays.Tile: Each tile, row by row, with memory mapped pixels.
+
+    """
+    if bit_depth is not None:
+        arrays.raw_dtype(bit_depth)
+    if batch < 1:
+        raise PhotoshopPythonAPIError(f"Invalid batch size {batch}.")
+    info = _jsx.run(document, OPEN_TILES, document=document.id, bitDepth=bit_depth)
+    try:
+        grid = arrays.tile_grid(info["width"], info["height"], tile, overlap)
+        for start in range(0, len(grid), batch):
+            stop = start + batch
+            boxes = grid[start:stop]
+            pending = []
+            try:
+                for _ in boxes:
+                    pending.append(scratch_raw_path())
+                _jsx.run(
+                    document,
+                    TILES_RAW,
+                    document=info["document"],
+                    tiles=[
+                        {"bounds": list(bounds), "path": _jsx.js_path(path)}
+                        for (bounds, _), path in zip(boxes, pending)
+                    ],
+                )
+                for bounds, core in boxes:
+                    size = {"width": bounds[2] - bounds[0], "height": bounds[3] - bounds[1]}
+                    pixels = map_raw(pending.pop(0), dict(info, **size))
+                    yield arrays.Tile(arrays.select_channels(pixels, channels), bounds, core)
+            finally:
+                # The tiles that were never yielded, e.g. when the loop breaks.
+                for path in pending:
+                    scratch.remove_quietly(path)
+    finally:
+        _jsx.run(document, CLOSE_DOCUMENT, document=info["document"])
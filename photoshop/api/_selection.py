@@ -1,6 +1,10 @@
 """The selected area of the document or layer."""
 
+# Import built-in modules
+from typing import Optional
+
 # Import local modules
+from photoshop.api import _pixels
 from photoshop.api._core import Photoshop
 from photoshop.api.enumerations import ColorBlendMode
 from photoshop.api.enumerations import SelectionType
@@ -192,3 +196,44 @@ class Selection(Photoshop):
     def translateBoundary(self, deltaX, deltaY):
         """Moves the boundary of selection relative to its current position."""
         return self.app.translateBoundary(deltaX, deltaY)
+
+    def from_mask(
+        self,
+        mask,
+        feather: float = 0,
+        combination: SelectionType = SelectionType.ReplaceSelection,
+        channel_name: Optional[str] = None,
+    ):
+        """Selects the pixels of a NumPy mask, in a single script.
+
+        The mask is written to a scratch grayscale PNG file, loaded into the
+        Document as an alpha channel and converted to the selection, which
+        is much faster than a polygon for large or detailed masks. Requires
+        NumPy.
+
+        Args:
+            mask: A ``(height, width)`` array of the size of the Document.
+                ``bool`` masks select fully, ``uint8``, ``uint16`` and float
+                masks from 0 to 1 select partially.
+            feather: The radius in pixels of a feather applied to the
+                selection.
+            combination: How the mask is combined with the current
+                selection.
+            channel_name: Optional, keeps the mask as an alpha channel with
+                this name.
+
+        """
+        _pixels.select_mask(self, self.app.parent.id, mask, feather, combination, channel_name)
+
+    def to_mask(self):
+        """Reads the selection into a NumPy mask, in a single script.
+
+        Requires NumPy.
+
+        Returns:
+            numpy.ndarray: The ``(height, width)`` mask, from 0 for unselected
+                pixels to the maximum value of the bit depth of the Document,
+                e.g. 255 at 8 bits. All zeros if nothing is selected.
+
+        """
+        return _pixels.selection_mask(self, self.app.parent.id)
@@ -0,0 +1,198 @@
+"""Read the state of every layer of a document in a single call.
+
+The snapshot walks the layers with the Action Manager, which is much faster
+than the DOM and returns one plain record per layer, from the top of the
+layers panel to the bottom.
+
+"""
+
+# Import built-in modules
+from typing import Dict
+from typing import List
+from typing import Optional
+
+# Import local modules
+from photoshop import manifest
+from photoshop.api import _jsx
+
+
+SNAPSHOT = """
+var doc = __psDocument(params.document);
+var s = stringIDToTypeID;
+app.activeDocument = doc;
+var ref = new ActionReference();
+ref.putEnumerated(s("document"), s("ordinal"), s("targetEnum"));
+var docDesc = executeActionGet(ref);
+var count = docDesc.getInteger(s("numberOfLayers"));
+var first = docDesc.getBoolean(s("hasBackgroundLayer")) ? 0 : 1;
+var parents = [];
+var records = [];
+for (var index = count; index >= first; index--) {
+    ref = new ActionReference();
+    ref.putIndex(s("layer"), index);
+    var desc = executeActionGet(ref);
+    var section = typeIDToStringID(desc.getEnumerationValue(s("layerSection")));
+    if (section == "layerSectionEnd") {
+        parents.pop();
+        continue;
+    }
+    var rect = desc.getObjectValue(s("bounds"));
+    var record = {
+        "id": desc.getInteger(s("layerID")),
+        "name": desc.getString(s("name")),
+        "index": index,
+        "parent": parents.length ? parents[parents.length - 1] : null,
+        "group": section == "layerSectionStart",
+        "layerKind": desc.hasKey(s("layerKind")) ? desc.getInteger(s("layerKind")) : null,
+        "bounds": [
+            rect.getUnitDoubleValue(s("left")),
+            rect.getUnitDoubleValue(s("top")),
+            rect.getUnitDoubleValue(s("right")),
+            rect.getUnitDoubleValue(s("bottom"))
+        ],
+        "visible": desc.getBoolean(s("visible")),
+        "opacity": Math.round(desc.getInteger(s("opacity")) / 2.55),
+        "blendMode": typeIDToStringID(desc.getEnumerationValue(s("mode"))),
+        "text": null,
+        "artboard": desc.hasKey(s("artboardEnabled")) && desc.getBoolean(s("artboardEnabled"))
+    };
+    if (desc.hasKey(s("textKey"))) {
+        record.text = desc.getObjectValue(s("textKey")).getString(s("textKey"));
+    }
+    if (record.group) {
+        parents.push(record.id);
+    }
+    records.push(record);
+}
+return records;
+"""
+
+# Artboards are found by reading only the `artboardEnabled` property of each
+# layer, the full descriptor is only read for the artboards themselves.
+ARTBOARDS = """
+function __psArtboards(doc) {
+    var s = stringIDToTypeID;
+    var ref = new ActionReference();
+    app.activeDocument = doc;
+    ref.putEnumerated(s("document"), s("ordinal"), s("targetEnum"));
+    var docDesc = executeActionGet(ref);
+    var first = docDesc.getBoolean(s("hasBackgroundLayer")) ? 0 : 1;
+    var artboards = [];
+    for (var index = docDesc.getInteger(s("numberOfLayers")); index >= first; index--) {
+        ref = new ActionReference();
+        ref.putProperty(s("property"), s("artboardEnabled"));
+        ref.putIndex(s("layer"), index);
+        var flag = executeActionGet(ref);
+        if (!flag.hasKey(s("artboardEnabled")) || !flag.getBoolean(s("artboardEnabled"))) {
+            continue;
+        }
+        ref = new ActionReference();
+        ref.putIndex(s("layer"), index);
+        var desc = executeActionGet(ref);
+        var rect = desc.getObjectValue(s("artboard")).getObjectValue(s("artboardRect"));
+        artboards.push({
+            "id": desc.getInteger(s("layerID")),
+            "name": desc.getString(s("name")),
+            "index": index,
+            "visible": desc.getBoolean(s("visible")),
+            "rect": [
+                rect.getDouble(s("left")),
+                rect.getDouble(s("top")),
+                rect.getDouble(s("right")),
+                rect.getDouble(s("bottom"))
+            ]
+        });
+    }
+    return artboards;
+}
+"""
+
+# Copies each top level layer into a scratch document, in the color mode and
+# depth of the document, to read the histogram of the layer alone.
+HISTOGRAMS = """
+var doc = __psDocument(params.document);
+var histograms = {};
+app.activeDocument = doc;
+for (var i = 0; i < doc.layers.length; i++) {
+    var layer = doc.layers[i];
+    if (params.ids !== null && !__psContains(params.ids, layer.id)) {
+        continue;
+    }
+    var scratch = __psScratch(doc, "__psHistogram");
+    try {
+        app.activeDocument = doc;
+        layer.duplicate(scratch, ElementPlacement.PLACEATBEGINNING);
+        app.activeDocument = scratch;
+        scratch.layers[0].visible = true;
+        histograms[layer.id] = scratch.histogram;
+    } finally {
+        scratch.close(SaveOptions.DONOTSAVECHANGES);
+        app.activeDocument = doc;
+    }
+}
+return histograms;
+"""
+
+
+def snapshot(document, histograms: bool = False) -> List[dict]:
+    """Read the state of every layer of a document.
+
+    Args:
+        document: The document to read.
+        histograms: If true, also stores a digest of the histogram of every
+            top level layer as ``histogram``. This copies each layer into a
+            scratch document, so it is much slower.
+
+    Returns:
+        list: One record per layer, ordered from the top of the layers panel.
+
+    """
+    records = _jsx.run(document, SNAPSHOT, document=document.id)
+    if histograms:
+        found = _jsx.run(document, HISTOGRAMS, document=document.id, ids=None)
+        for record in records:
+            record["histogram"] = manifest.histogram_digest(found.get(str(record["id"])))
+    return records
+
+
+def artboards(document) -> List[dict]:
+    """Read the artboards of a document.
+
+    Args:
+        document: The document to read.
+
+    Returns:
+        list: One record per artboard, from the top of the layers panel, with
+            its ``id``, ``name``, ``index``, ``visible`` flag and ``rect``.
+
+    """
+    return _jsx.run(document, "return __psArtboards(__psDocument(params.document));", ARTBOARDS, document=document.id)
+
+
+def top_level_fingerprints(records: List[dict], **settings) -> Dict[int, str]:
+    """Compute the fingerprint of each top level layer of a snapshot.
+
+    The fingerprint of a group covers all of its descendants, and the
+    position of the layer since it is part of the exported file name.
+
+    Args:
+        records: The records returned by `snapshot`.
+        **settings: The export settings also affecting the output.
+
+    Returns:
+        dict: The fingerprints keyed by layer ID.
+
+    """
+    children: Dict[Optional[int], List[dict]] = {}
+    for record in records:
+        children.setdefault(record["parent"], []).append(record)
+
+    def _subtree(record):
+        yield record
+        for child in children.get(record["id"], []):
+            yield from _subtree(child)
+
+    return {
+        record["id"]: manifest.fingerprint(_subtree(record), position=position, **settings)
+        for position, record in enumerate(children.get(None, []))
+    }
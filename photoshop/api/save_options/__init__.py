@@ -1,14 +1,28 @@
 # Import local modules
 from photoshop.api.save_options.bmp import BMPSaveOptions
+from photoshop.api.save_options.bmp import BMPSaveSpec
 from photoshop.api.save_options.eps import EPSSaveOptions
+from photoshop.api.save_options.eps import EPSSaveSpec
 from photoshop.api.save_options.gif import GIFSaveOptions
+from photoshop.api.save_options.gif import GIFSaveSpec
 from photoshop.api.save_options.jpg import JPEGSaveOptions
+from photoshop.api.save_options.jpg import JPEGSaveSpec
 from photoshop.api.save_options.pdf import PDFSaveOptions
+from photoshop.api.save_options.pdf import PDFSaveSpec
 from photoshop.api.save_options.png import ExportOptionsSaveForWeb
 from photoshop.api.save_options.png import PNGSaveOptions
+from photoshop.api.save_options.png import PNGSaveSpec
+from photoshop.api.save_options.png import SaveForWebSpec
+from photoshop.api.save_options.pool import PooledSaveOptions
+from photoshop.api.save_options.pool import SaveOptionsPool
+from photoshop.api.save_options.pool import save_options_pool
 from photoshop.api.save_options.psd import PhotoshopSaveOptions
+from photoshop.api.save_options.psd import PhotoshopSaveSpec
+from photoshop.api.save_options.spec import SaveOptionsSpec
 from photoshop.api.save_options.tag import TargaSaveOptions
+from photoshop.api.save_options.tag import TargaSaveSpec
 from photoshop.api.save_options.tif import TiffSaveOptions
+from photoshop.api.save_options.tif import TiffSaveSpec
 
 
 __all__ = [
@@ -22,4 +36,18 @@ __all__ = [
     PhotoshopSaveOptions.__name__,
     TargaSaveOptions.__name__,
     TiffSaveOptions.__name__,
+    PooledSaveOptions.__name__,
+    SaveOptionsPool.__name__,
+    "save_options_pool",
+    SaveOptionsSpec.__name__,
+    BMPSaveSpec.__name__,
+    EPSSaveSpec.__name__,
+    GIFSaveSpec.__name__,
+    JPEGSaveSpec.__name__,
+    PDFSaveSpec.__name__,
+    PNGSaveSpec.__name__,
+    SaveForWebSpec.__name__,
+    PhotoshopSaveSpec.__name__,
+    TargaSaveSpec.__name__,
+    TiffSaveSpec.__name__,
 ]
@@ -1,7 +1,12 @@
 """Options for saving a document in BMO format."""
 
+# Import built-in modules
+from dataclasses import dataclass
+from typing import Optional
+
 # Import local modules
 from photoshop.api._core import Photoshop
+from photoshop.api.save_options.spec import SaveOptionsSpec
 
 
 class BMPSaveOptions(Photoshop):
@@ -25,3 +30,14 @@ class BMPSaveOptions(Photoshop):
 
         """
         self.app.alphaChannels = value
+
+
+@dataclass(frozen=True)
+class BMPSaveSpec(SaveOptionsSpec):
+    """Value object of `BMPSaveOptions`."""
+
+    com_class = BMPSaveOptions
+    jsx_class = "BMPSaveOptions"
+    extension = "bmp"
+
+    alphaChannels: Optional[bool] = None
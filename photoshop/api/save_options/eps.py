@@ -1,5 +1,12 @@
+# Import built-in modules
+from dataclasses import dataclass
+from typing import Optional
+
 # Import local modules
 from photoshop.api._core import Photoshop
+from photoshop.api.enumerations import PreviewType
+from photoshop.api.enumerations import SaveEncoding
+from photoshop.api.save_options.spec import SaveOptionsSpec
 
 
 class EPSSaveOptions(Photoshop):
@@ -95,3 +102,22 @@ class EPSSaveOptions(Photoshop):
 
         """
         self.app.vectorData = value
+
+
+@dataclass(frozen=True)
+class EPSSaveSpec(SaveOptionsSpec):
+    """Value object of `EPSSaveOptions`."""
+
+    com_class = EPSSaveOptions
+    jsx_class = "EPSSaveOptions"
+    extension = "eps"
+
+    embedColorProfile: Optional[bool] = None
+    encoding: Optional[SaveEncoding] = None
+    halftoneScreen: Optional[bool] = None
+    interpolation: Optional[bool] = None
+    preview: Optional[PreviewType] = None
+    psColorManagement: Optional[bool] = None
+    transferFunction: Optional[bool] = None
+    transparentWhites: Optional[bool] = None
+    vectorData: Optional[bool] = None
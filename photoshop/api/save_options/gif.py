@@ -1,5 +1,14 @@
+# Import built-in modules
+from dataclasses import dataclass
+from typing import Optional
+
 # Import local modules
 from photoshop.api._core import Photoshop
+from photoshop.api.enumerations import DitherType
+from photoshop.api.enumerations import ForcedColors
+from photoshop.api.enumerations import MatteType
+from photoshop.api.enumerations import PaletteType
+from photoshop.api.save_options.spec import SaveOptionsSpec
 
 
 class GIFSaveOptions(Photoshop):
@@ -81,3 +90,23 @@ class GIFSaveOptions(Photoshop):
     @transparency.setter
     def transparency(self, value):
         self.app.transparency = value
+
+
+@dataclass(frozen=True)
+class GIFSaveSpec(SaveOptionsSpec):
+    """Value object of `GIFSaveOptions`."""
+
+    com_class = GIFSaveOptions
+    jsx_class = "GIFSaveOptions"
+    extension = "gif"
+    ranges = {"colors": (2, 256), "ditherAmount": (1, 100)}
+
+    colors: Optional[int] = None
+    dither: Optional[DitherType] = None
+    ditherAmount: Optional[int] = None
+    forced: Optional[ForcedColors] = None
+    interlaced: Optional[bool] = None
+    matte: Optional[MatteType] = None
+    palette: Optional[PaletteType] = None
+    preserveExactColors: Optional[bool] = None
+    transparency: Optional[bool] = None
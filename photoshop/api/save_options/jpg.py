@@ -1,6 +1,12 @@
+# Import built-in modules
+from dataclasses import dataclass
+from typing import Optional
+
 # Import local modules
 from photoshop.api._core import Photoshop
+from photoshop.api.enumerations import FormatOptionsType
 from photoshop.api.enumerations import MatteType
+from photoshop.api.save_options.spec import SaveOptionsSpec
 
 
 class JPEGSaveOptions(Photoshop):
@@ -56,3 +62,19 @@ class JPEGSaveOptions(Photoshop):
     @scans.setter
     def scans(self, value):
         self.app.scans = value
+
+
+@dataclass(frozen=True)
+class JPEGSaveSpec(SaveOptionsSpec):
+    """Value object of `JPEGSaveOptions`."""
+
+    com_class = JPEGSaveOptions
+    jsx_class = "JPEGSaveOptions"
+    extension = "jpg"
+    ranges = {"quality": (0, 12), "scans": (3, 5)}
+
+    quality: int = 5
+    embedColorProfile: bool = True
+    matte: MatteType = MatteType.NoMatte
+    formatOptions: Optional[FormatOptionsType] = None
+    scans: Optional[int] = None
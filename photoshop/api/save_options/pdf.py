@@ -4,11 +4,16 @@ using the Document.saveAs() method.
 
 """
 
+# Import built-in modules
+from dataclasses import dataclass
+from typing import Optional
+
 # Import local modules
 from photoshop.api._core import Photoshop
 from photoshop.api.enumerations import PDFEncodingType
 from photoshop.api.enumerations import PDFResampleType
 from photoshop.api.errors import COMError
+from photoshop.api.save_options.spec import SaveOptionsSpec
 
 
 # pylint: disable=too-many-instance-attributes,too-many-public-methods
@@ -354,3 +359,38 @@ class PDFSaveOptions(Photoshop):
     def view(self, value):
         """If true, opens the saved PDF in Acrobat."""
         self.app.view = value
+
+
+@dataclass(frozen=True)
+class PDFSaveSpec(SaveOptionsSpec):
+    """Value object of `PDFSaveOptions`, with the same defaults."""
+
+    com_class = PDFSaveOptions
+    jsx_class = "PDFSaveOptions"
+    extension = "pdf"
+    ranges = {"jpegQuality": (0, 12)}
+
+    layers: bool = False
+    jpegQuality: int = 12
+    alphaChannels: bool = False
+    embedThumbnail: bool = True
+    view: bool = False
+    annotations: bool = True
+    colorConversion: bool = False
+    convertToEightBit: bool = True
+    description: str = "No description."
+    downSample: PDFResampleType = PDFResampleType.NoResample
+    embedColorProfile: bool = True
+    destinationProfile: Optional[str] = None
+    downSampleSize: Optional[float] = None
+    downSampleSizeLimit: Optional[float] = None
+    encoding: Optional[PDFEncodingType] = None
+    optimizeForWeb: Optional[bool] = None
+    outputCondition: Optional[str] = None
+    outputConditionID: Optional[str] = None
+    preserveEditing: Optional[bool] = None
+    presetFile: Optional[str] = None
+    profileInclusionPolicy: Optional[bool] = None
+    registryName: Optional[str] = None
+    spotColors: Optional[bool] = None
+    tileSize: Optional[int] = None
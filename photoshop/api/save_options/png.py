@@ -1,8 +1,14 @@
+# Import built-in modules
+from dataclasses import dataclass
+from typing import Optional
+
 # Import local modules
 from photoshop.api._core import Photoshop
 from photoshop.api.enumerations import ColorReductionType
 from photoshop.api.enumerations import DitherType
 from photoshop.api.enumerations import SaveDocumentType
+from photoshop.api.errors import PhotoshopPythonAPIError
+from photoshop.api.save_options.spec import SaveOptionsSpec
 
 
 class ExportOptionsSaveForWeb(Photoshop):
@@ -114,3 +120,51 @@ class PNGSaveOptions(Photoshop):
     @compression.setter
     def compression(self, value: int):
         self.app.compression = value
+
+
+@dataclass(frozen=True)
+class SaveForWebSpec(SaveOptionsSpec):
+    """Value object of `ExportOptionsSaveForWeb`, used with `Document.exportDocument`."""
+
+    com_class = ExportOptionsSaveForWeb
+    jsx_class = "ExportOptionsSaveForWeb"
+    ranges = {"blur": (0, 2), "colors": (2, 256), "quality": (0, 100)}
+    export = True
+    extensions = {
+        SaveDocumentType.BMave: "bmp",
+        SaveDocumentType.CompuServeGIFSave: "gif",
+        SaveDocumentType.JPEGSave: "jpg",
+        SaveDocumentType.PNGSave: "png",
+    }
+
+    format: SaveDocumentType = SaveDocumentType.PNGSave
+    PNG8: bool = False
+    blur: Optional[float] = None
+    colorReduction: Optional[ColorReductionType] = None
+    colors: Optional[int] = None
+    dither: Optional[DitherType] = None
+    optimized: Optional[bool] = None
+    quality: Optional[int] = None
+
+    def __post_init__(self):
+        super().__post_init__()
+        if self.format not in self.extensions:
+            raise PhotoshopPythonAPIError(f"Save For Web cannot export {self.format.name}.")
+
+    @property
+    def extension(self) -> str:
+        """str: The extension of the exported files."""
+        return self.extensions[self.format]
+
+
+@dataclass(frozen=True)
+class PNGSaveSpec(SaveOptionsSpec):
+    """Value object of `PNGSaveOptions`."""
+
+    com_class = PNGSaveOptions
+    jsx_class = "PNGSaveOptions"
+    extension = "png"
+    ranges = {"compression": (0, 9)}
+
+    interlaced: bool = False
+    compression: int = 6
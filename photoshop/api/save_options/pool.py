@@ -0,0 +1,155 @@
+"""A pool of configured save options objects, keyed by their parameters.
+
+Creating a save options object activates a new COM object, and each of its
+properties is then set with a separate call. Loops saving many files with the
+same options can take them from the pool instead, and only pay this cost once.
+
+```python
+
+from photoshop.api import JPEGSaveOptions
+from photoshop.api import save_options_pool
+
+for layer_path in layer_paths:
+    options = save_options_pool.get(JPEGSaveOptions, quality=10)
+    doc.saveAs(layer_path, options, asCopy=True)
+
+```
+
+"""
+
+# Import built-in modules
+import inspect
+import threading
+from typing import Any
+from typing import Dict
+from typing import Tuple
+from typing import Type
+import weakref
+
+# Import local modules
+from photoshop.api.errors import PhotoshopPythonAPIError
+
+
+def _freeze(value: Any) -> Any:
+    """Convert a parameter value into a hashable key."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    return value
+
+
+class PooledSaveOptions:
+    """A read-only view of a save options object owned by a `SaveOptionsPool`.
+
+    The same object is shared by every caller asking for the same parameters,
+    so changing it would silently change the output of the other callers.
+    Setting an attribute raises an error instead. Use `replace` to get the
+    pooled object for different parameters.
+
+    """
+
+    def __init__(self, pool: "SaveOptionsPool", options: Any, params: Dict[str, Any]):
+        object.__setattr__(self, "_pool", pool)
+        object.__setattr__(self, "_options", options)
+        object.__setattr__(self, "_params", dict(params))
+
+    def __getattr__(self, item):
+        return getattr(self._options, item)
+
+    def __setattr__(self, key, value):
+        raise PhotoshopPythonAPIError(
+            f"Pooled {type(self._options).__name__} are shared and read-only, "
+            f'use replace({key}=...) to get options with a different "{key}".'
+        )
+
+    def __delattr__(self, item):
+        self.__setattr__(item, None)
+
+    def __repr__(self):
+        return f"Pooled{type(self._options).__name__}({self._params})"
+
+    @property
+    def options(self) -> Any:
+        """The pooled save options object."""
+        return self._options
+
+    @property
+    def params(self) -> Dict[str, Any]:
+        """dict: The parameters of the pooled object."""
+        return dict(self._params)
+
+    def replace(self, **changes) -> "PooledSaveOptions":
+        """Get the pooled save options with some parameters changed."""
+        return self._pool.get(type(self._options), **{**self._params, **changes})
+
+
+class SaveOptionsPool:
+    """Cache of configured save options objects keyed by their parameters.
+
+    COM objects can only be used from the thread that created them, so each
+    thread gets its own objects. The objects of a thread are released once
+    the thread has exited.
+
+    """
+
+    def __init__(self):
+        self._caches: "weakref.WeakKeyDictionary[threading.Thread, Dict[Tuple, PooledSaveOptions]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(cache) for cache in self._caches.values())
+
+    def get(self, options_class: Type, **params) -> PooledSaveOptions:
+        """Get configured save options, creating them on the first request.
+
+        Args:
+            options_class: The save options class, e.g. `JPEGSaveOptions`.
+            **params: The properties of the save options.
+
+        Returns:
+            PooledSaveOptions: The read-only shared save options, accepted
+                anywhere the save options object itself is.
+
+        Raises:
+            TypeError: If the save options have no such property.
+
+        """
+        key = (options_class, _freeze(params))
+        # Keyed by the thread object rather than its ident, which the system
+        # reuses for new threads once a thread has exited.
+        thread = threading.current_thread()
+        with self._lock:
+            pooled = self._caches.setdefault(thread, {}).get(key)
+        if pooled is None:
+            pooled = PooledSaveOptions(self, self._create(options_class, params), params)
+            with self._lock:
+                pooled = self._caches.setdefault(thread, {}).setdefault(key, pooled)
+        return pooled
+
+    def clear(self):
+        """Release every pooled object."""
+        with self._lock:
+            self._caches.clear()
+
+    @staticmethod
+    def _create(options_class: Type, params: Dict[str, Any]) -> Any:
+        signature = inspect.signature(options_class.__init__).parameters
+        if any(param.kind == param.VAR_KEYWORD for param in signature.values()):
+            return options_class(**params)
+        arguments = {key: value for key, value in params.items() if key in signature}
+        options = options_class(**arguments)
+        for key, value in params.items():
+            if key in arguments:
+                continue
+            if not hasattr(options_class, key) and not hasattr(options, key):
+                raise TypeError(f"{options_class.__name__} has no property {key!r}.")
+            setattr(options, key, value)
+        return options
+
+
+# The pool shared by this package.
+save_options_pool = SaveOptionsPool()
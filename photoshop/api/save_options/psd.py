@@ -1,5 +1,10 @@
+# Import built-in modules
+from dataclasses import dataclass
+from typing import Optional
+
 # Import local modules
 from photoshop.api._core import Photoshop
+from photoshop.api.save_options.spec import SaveOptionsSpec
 
 
 class PhotoshopSaveOptions(Photoshop):
@@ -54,3 +59,18 @@ class PhotoshopSaveOptions(Photoshop):
     @spotColors.setter
     def spotColors(self, value):
         self.app.spotColors = value
+
+
+@dataclass(frozen=True)
+class PhotoshopSaveSpec(SaveOptionsSpec):
+    """Value object of `PhotoshopSaveOptions`."""
+
+    com_class = PhotoshopSaveOptions
+    jsx_class = "PhotoshopSaveOptions"
+    extension = "psd"
+
+    alphaChannels: Optional[bool] = None
+    annotations: Optional[bool] = None
+    embedColorProfile: Optional[bool] = None
+    layers: Optional[bool] = None
+    spotColors: Optional[bool] = None
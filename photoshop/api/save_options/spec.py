@@ -0,0 +1,278 @@
+"""Plain value objects describing save options.
+
+The save options classes of this package are COM objects: every instance
+activates an object in Photoshop and every property is a round trip. A save
+options spec holds the same settings as a frozen dataclass instead. It is
+hashable, can be pickled and shipped to worker processes, and is validated
+locally against the enumerations. It only becomes a COM object when it is
+passed to `Document.saveAs` or `Document.exportDocument`, or a JavaScript
+object when it is embedded in a batched script.
+
+```python
+
+from photoshop.api import JPEGSaveSpec
+
+spec = JPEGSaveSpec(quality=10)
+doc.saveAs("d:/out/cover.jpg", spec)
+doc.export_layers("d:/out/layers", spec)
+
+```
+
+"""
+
+# Import built-in modules
+from dataclasses import dataclass
+from dataclasses import fields
+from enum import IntEnum
+import json
+from typing import Any
+from typing import ClassVar
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+from typing import Type
+from typing import Union
+from typing import get_type_hints
+
+# Import local modules
+from photoshop.api import enumerations as enums
+from photoshop.api.errors import PhotoshopPythonAPIError
+from photoshop.api.save_options.pool import save_options_pool
+
+
+# The JavaScript name of the enumerations used by the save options, and of
+# each of their values.
+JSX_ENUMS: Dict[Type[IntEnum], Tuple[str, Dict[str, str]]] = {
+    enums.BMPDepthType: (
+        "BMPDepthType",
+        {
+            "BMP1Bit": "ONE",
+            "BMP4Bits": "FOUR",
+            "BMP8Bits": "EIGHT",
+            "BMP16Bits": "SIXTEEN",
+            "BMP24Bits": "TWENTYFOUR",
+            "BMP32Bits": "THIRTYTWO",
+            "BMP_A1R5G5B5": "BMP_A1R5G5B5",
+            "BMP_A4R4G4B4": "BMP_A4R4G4B4",
+            "BMP_A8R8G8B8": "BMP_A8R8G8B8",
+            "BMP_R5G6B5": "BMP_R5G6B5",
+            "BMP_R8G8B8": "BMP_R8G8B8",
+            "BMP_X1R5G5B5": "BMP_X1R5G5B5",
+            "BMP_X4R4G4B4": "BMP_X4R4G4B4",
+            "BMP_X8R8G8B8": "BMP_X8R8G8B8",
+        },
+    ),
+    enums.ByteOrderType: ("ByteOrder", {"IBMByteOrder": "IBM", "MacOSByteOrder": "MACOS"}),
+    enums.ColorReductionType: (
+        "ColorReductionType",
+        {
+            "Adaptive": "ADAPTIVE",
+            "BlackWhiteReduction": "BLACKWHITE",
+            "CustomReduction": "CUSTOM",
+            "MacintoshColors": "MACINTOSH",
+            "PerceptualReduction": "PERCEPTUAL",
+            "Restrictive": "RESTRICTIVE",
+            "SFWGrayscale": "SFWGRAYSCALE",
+            "Selective": "SELECTIVE",
+            "WindowsColors": "WINDOWS",
+        },
+    ),
+    enums.DitherType: (
+        "Dither",
+        {"Diffusion": "DIFFUSION", "NoDither": "NONE", "Noise": "NOISE", "Pattern": "PATTERN"},
+    ),
+    enums.ForcedColors: (
+        "ForcedColors",
+        {"BlackWhite": "BLACKWHITE", "NoForced": "NONE", "Primaries": "PRIMARIES", "Web": "WEB"},
+    ),
+    enums.FormatOptionsType: (
+        "FormatOptions",
+        {
+            "OptimizedBaseline": "OPTIMIZEDBASELINE",
+            "Progressive": "PROGRESSIVE",
+            "StandardBaseline": "STANDARDBASELINE",
+        },
+    ),
+    enums.LayerCompressionType: ("LayerCompression", {"RLELayerCompression": "RLE", "ZIPLayerCompression": "ZIP"}),
+    enums.MatteType: (
+        "MatteType",
+        {
+            "BackgroundColorMatte": "BACKGROUND",
+            "BlackMatte": "BLACK",
+            "ForegroundColorMatte": "FOREGROUND",
+            "NetscapeGrayMatte": "NETSCAPE",
+            "NoMatte": "NONE",
+            "SemiGray": "SEMIGRAY",
+            "WhiteMatte": "WHITE",
+        },
+    ),
+    enums.PaletteType: (
+        "Palette",
+        {
+            "Exact": "EXACT",
+            "LocalAdaptive": "LOCALADAPTIVE",
+            "LocalPerceptual": "LOCALPERCEPTUAL",
+            "LocalSelective": "LOCALSELECTIVE",
+            "MacOSPalette": "MACOSPALETTE",
+            "MasterAdaptive": "MASTERADAPTIVE",
+            "MasterPerceptual": "MASTERPERCEPTUAL",
+            "MasterSelective": "MASTERSELECTIVE",
+            "PreviousPalette": "PREVIOUSPALETTE",
+            "Uniform": "UNIFORM",
+            "WebPalette": "WEBPALETTE",
+            "WindowsPalette": "WINDOWSPALETTE",
+        },
+    ),
+    enums.PDFEncodingType: (
+        "PDFEncoding",
+        {
+            "PDFJPEG": "JPEG",
+            "PDFJPEG2000HIGH": "JPEG2000HIGH",
+            "PDFJPEG2000LOSSLESS": "JPEG2000LOSSLESS",
+            "PDFJPEG2000LOW": "JPEG2000LOW",
+            "PDFJPEG2000MED": "JPEG2000MED",
+            "PDFJPEG2000MEDHIGH": "JPEG2000MEDHIGH",
+            "PDFJPEG2000MEDLOW": "JPEG2000MEDLOW",
+            "PDFJPEGHIGH": "JPEGHIGH",
+            "PDFJPEGLOW": "JPEGLOW",
+            "PDFJPEGMED": "JPEGMED",
+            "PDFJPEGMEDHIGH": "JPEGMEDHIGH",
+            "PDFJPEGMEDLOW": "JPEGMEDLOW",
+            "PDFNone": "NONE",
+            "PDFZip": "PDFZIP",
+            "PDFZip4Bit": "PDFZIP4BIT",
+        },
+    ),
+    enums.PDFResampleType: (
+        "PDFResample",
+        {
+            "NoResample": "NONE",
+            "PDFAverage": "PDFAVERAGE",
+            "PDFBicubic": "PDFBICUBIC",
+            "PDFSubSample": "PDFSUBSAMPLE",
+        },
+    ),
+    enums.PreviewType: (
+        "Preview",
+        {"EightBitTIFF": "EIGHTBITTIFF", "MonochromeTIFF": "MONOCHROMETIFF", "NoPreview": "NONE"},
+    ),
+    enums.SaveDocumentType: (
+        "SaveDocumentType",
+        {"BMave": "BMP", "CompuServeGIFSave": "COMPUSERVEGIF", "JPEGSave": "JPEG", "PNGSave": "PNG"},
+    ),
+    enums.SaveEncoding: (
+        "SaveEncoding",
+        {
+            "Ascii": "ASCII",
+            "Binary": "BINARY",
+            "JPEGHigh": "JPEGHIGH",
+            "JPEGLow": "JPEGLOW",
+            "JPEGMaximum": "JPEGMAXIMUM",
+            "JPEGMedium": "JPEGMEDIUM",
+        },
+    ),
+    enums.TargaBitsPerPixels: (
+        "TargaBitsPerPixels",
+        {"Targa16Bits": "SIXTEEN", "Targa24Bits": "TWENTYFOUR", "Targa32Bits": "THIRTYTWO"},
+    ),
+    enums.TiffEncodingType: (
+        "TIFFEncoding",
+        {"NoTIFFCompression": "NONE", "TiffJPEG": "JPEG", "TiffLZW": "TIFFLZW", "TiffZIP": "TIFFZIP"},
+    ),
+}
+
+
+_NONE_TYPE = type(None)
+
+
+def _field_kind(hint: Any) -> Any:
+    """Unwrap ``Optional[X]`` into ``X``."""
+    args = [arg for arg in getattr(hint, "__args__", ()) if arg is not _NONE_TYPE]
+    if getattr(hint, "__origin__", None) is Union and len(args) == 1:
+        return args[0]
+    return hint
+
+
+@dataclass(frozen=True)
+class SaveOptionsSpec:
+    """Base class of the save options specs.
+
+    Fields left to ``None`` keep the default value of Photoshop.
+
+    """
+
+    # The save options class created by `to_com`.
+    com_class: ClassVar[Optional[Type]] = None
+    # The name of the JavaScript class created by `to_jsx`.
+    jsx_class: ClassVar[str] = ""
+    # The extension of the saved files.
+    extension: ClassVar[str] = ""
+    # The inclusive range of the numeric fields.
+    ranges: ClassVar[Dict[str, Tuple[float, float]]] = {}
+    # True if the options are used with `exportDocument` instead of `saveAs`.
+    export: ClassVar[bool] = False
+
+    def __post_init__(self):
+        hints = get_type_hints(type(self))
+        for spec_field in fields(self):
+            name = spec_field.name
+            value = getattr(self, name)
+            if value is None:
+                continue
+            kind = _field_kind(hints[name])
+            if isinstance(kind, type) and issubclass(kind, IntEnum):
+                try:
+                    value = kind(value)
+                except ValueError:
+                    raise PhotoshopPythonAPIError(f"{type(self).__name__}.{name}: {value!r} is not a {kind.__name__}.")
+            elif kind is bool and not isinstance(value, bool):
+                raise PhotoshopPythonAPIError(f"{type(self).__name__}.{name} must be a bool, got {value!r}.")
+            elif kind in (int, float) and (isinstance(value, bool) or not isinstance(value, (int, float))):
+                raise PhotoshopPythonAPIError(f"{type(self).__name__}.{name} must be a number, got {value!r}.")
+            if name in self.ranges:
+                low, high = self.ranges[name]
+                if not low <= value <= high:
+                    raise PhotoshopPythonAPIError(
+                        f"{type(self).__name__}.{name} must be between {low} and {high}, got {value!r}."
+                    )
+            object.__setattr__(self, name, value)
+
+    @property
+    def params(self) -> Dict[str, Any]:
+        """dict: The fields that are set, keyed by property name."""
+        values = {spec_field.name: getattr(self, spec_field.name) for spec_field in fields(self)}
+        return {name: value for name, value in values.items() if value is not None}
+
+    def to_com(self):
+        """Get the COM save options described by this spec.
+
+        The objects are taken from `save_options_pool`, so equal specs share
+        the same read-only COM object.
+
+        """
+        return save_options_pool.get(self.com_class, **self.params)
+
+    def to_jsx(self) -> str:
+        """str: The body of a JavaScript function returning these save options."""
+        lines = [f"var o = new {self.jsx_class}();"]
+        for name, value in self.params.items():
+            lines.append(f"o.{name} = {self._jsx_value(value)};")
+        lines.append("return o;")
+        return " ".join(lines)
+
+    def jsx_definitions(self) -> str:
+        """str: The JavaScript definition of ``__psSave(doc, path)`` saving a copy with these options."""
+        if self.export:
+            save = "doc.exportDocument(new File(path), ExportType.SAVEFORWEB, __psSaveOptions());"
+        else:
+            save = "doc.saveAs(new File(path), __psSaveOptions(), true, Extension.LOWERCASE);"
+        return f"function __psSaveOptions() {{ {self.to_jsx()} }}\nfunction __psSave(doc, path) {{ {save} }}"
+
+    @staticmethod
+    def _jsx_value(value: Any) -> str:
+        if isinstance(value, IntEnum):
+            class_name, names = JSX_ENUMS[type(value)]
+            return f"{class_name}.{names[value.name]}"
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        return json.dumps(value, ensure_ascii=True)
@@ -1,6 +1,11 @@
+# Import built-in modules
+from dataclasses import dataclass
+from typing import Optional
+
 # Import local modules
 from photoshop.api._core import Photoshop
 from photoshop.api.enumerations import TargaBitsPerPixels
+from photoshop.api.save_options.spec import SaveOptionsSpec
 
 
 class TargaSaveOptions(Photoshop):
@@ -35,3 +40,16 @@ class TargaSaveOptions(Photoshop):
     @rleCompression.setter
     def rleCompression(self, value):
         self.app.rleCompression = value
+
+
+@dataclass(frozen=True)
+class TargaSaveSpec(SaveOptionsSpec):
+    """Value object of `TargaSaveOptions`."""
+
+    com_class = TargaSaveOptions
+    jsx_class = "TargaSaveOptions"
+    extension = "tga"
+
+    alphaChannels: Optional[bool] = None
+    resolution: Optional[TargaBitsPerPixels] = None
+    rleCompression: Optional[bool] = None
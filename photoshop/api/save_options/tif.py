@@ -1,5 +1,13 @@
+# Import built-in modules
+from dataclasses import dataclass
+from typing import Optional
+
 # Import local modules
 from photoshop.api._core import Photoshop
+from photoshop.api.enumerations import ByteOrderType
+from photoshop.api.enumerations import LayerCompressionType
+from photoshop.api.enumerations import TiffEncodingType
+from photoshop.api.save_options.spec import SaveOptionsSpec
 
 
 class TiffSaveOptions(Photoshop):
@@ -127,3 +135,26 @@ class TiffSaveOptions(Photoshop):
         """If true, saves the transparency as an additional alpha channel when
         the file is opened in another application."""
         self.app.transparency = value
+
+
+@dataclass(frozen=True)
+class TiffSaveSpec(SaveOptionsSpec):
+    """Value object of `TiffSaveOptions`."""
+
+    com_class = TiffSaveOptions
+    jsx_class = "TiffSaveOptions"
+    extension = "tif"
+    ranges = {"jpegQuality": (0, 12)}
+
+    alphaChannels: Optional[bool] = None
+    annotations: Optional[bool] = None
+    byteOrder: Optional[ByteOrderType] = None
+    embedColorProfile: Optional[bool] = None
+    imageCompression: Optional[TiffEncodingType] = None
+    interleaveChannels: Optional[bool] = None
+    jpegQuality: Optional[int] = None
+    layerCompression: Optional[LayerCompressionType] = None
+    layers: Optional[bool] = None
+    saveImagePyramid: Optional[bool] = None
+    spotColors: Optional[bool] = None
+    transparency: Optional[bool] = None
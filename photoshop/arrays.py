@@ -0,0 +1,396 @@
+"""Pixel transfer between Photoshop and NumPy.
+
+Photoshop Raw files have no header: the pixels are stored row by row with
+the channels interleaved, in big-endian byte order. They can be mapped into
+memory as a ``(height, width, channels)`` array without decoding or copying.
+
+Arrays sent to Photoshop are written as PNG files, which keep their
+transparency, with a minimal encoder using the fastest zlib level.
+
+NumPy is an optional dependency, imported on first use:
+
+```
+
+pip install numpy
+
+```
+
+"""
+
+# Import built-in modules
+import os
+import struct
+from typing import Any
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Union
+import zlib
+
+# Import local modules
+from photoshop.api.errors import PhotoshopPythonAPIError
+
+
+# The Photoshop Raw byte order.
+RAW_BYTE_ORDER = ">"
+
+# The NumPy type of each bit depth supported by Photoshop Raw files.
+RAW_TYPES = {8: "u1", 16: "u2", 32: "f4"}
+
+# The PNG color type of each number of channels.
+PNG_COLOR_TYPES = {1: 0, 2: 4, 3: 2, 4: 6}
+
+# The zlib level used for PNG files that are only read back once.
+PNG_COMPRESSION = 1
+
+# The ``(left, top, right, bottom)`` pixel bounds of a region.
+Box = Tuple[int, int, int, int]
+
+
+def numpy():
+    """module: NumPy, imported on first use."""
+    try:
+        # Import third-party modules
+        import numpy
+    except ImportError:
+        raise PhotoshopPythonAPIError("NumPy is required for pixel transfer, install it with `pip install numpy`.")
+    return numpy
+
+
+def raw_dtype(bit_depth: int, byte_order: str = RAW_BYTE_ORDER) -> Any:
+    """Get the NumPy dtype of a bit depth.
+
+    Args:
+        bit_depth: 8, 16 or 32 bits per channel.
+        byte_order: ``>`` for big-endian, ``<`` for little-endian.
+
+    Returns:
+        numpy.dtype: The type of one channel value.
+
+    Raises:
+        PhotoshopPythonAPIError: If the bit depth is not supported.
+
+    """
+    if bit_depth not in RAW_TYPES:
+        raise PhotoshopPythonAPIError(f"Unsupported bit depth {bit_depth}, expected one of {sorted(RAW_TYPES)}.")
+    return numpy().dtype(byte_order + RAW_TYPES[bit_depth])
+
+
+def raw_size(width: int, height: int, channels: int, bit_depth: int) -> int:
+    """int: The size in bytes of a Photoshop Raw file."""
+    return width * height * channels * bit_depth // 8
+
+
+def open_raw(
+    path: str,
+    width: int,
+    height: int,
+    channels: int,
+    bit_depth: int,
+    byte_order: str = RAW_BYTE_ORDER,
+    mode: str = "r",
+) -> Any:
+    """Map a Photoshop Raw file into memory.
+
+    Args:
+        path: The path of the raw file.
+        width: The width of the image in pixels.
+        height: The height of the image in pixels.
+        channels: The number of interleaved channels.
+        bit_depth: 8, 16 or 32 bits per channel.
+        byte_order: The byte order of 16 and 32 bit files.
+        mode: The `numpy.memmap` mode, ``r`` for read-only.
+
+    Returns:
+        numpy.memmap: The ``(height, width, channels)`` pixels.
+
+    Raises:
+        PhotoshopPythonAPIError: If the size of the file does not match.
+
+    """
+    expected = raw_size(width, height, channels, bit_depth)
+    size = os.path.getsize(path)
+    if size != expected:
+        raise PhotoshopPythonAPIError(
+            f"{path} has {size} bytes, expected {expected} for {width}x{height}x{channels} at {bit_depth} bits."
+        )
+    return numpy().memmap(path, dtype=raw_dtype(bit_depth, byte_order), mode=mode, shape=(height, width, channels))
+
+
+def read_raw(
+    path: str, width: int, height: int, channels: int, bit_depth: int, byte_order: str = RAW_BYTE_ORDER
+) -> Any:
+    """Read a Photoshop Raw file into memory, see `open_raw`.
+
+    Returns:
+        numpy.ndarray: The ``(height, width, channels)`` pixels, in native
+            byte order and independent of the file.
+
+    """
+    pixels = open_raw(path, width, height, channels, bit_depth, byte_order)
+    return pixels.astype(pixels.dtype.newbyteorder("="))
+
+
+def clear_transparent(pixels: Any) -> Any:
+    """Zero the color of fully transparent pixels.
+
+    The last channel is the alpha. The color of the other pixels is kept as
+    is, it is stored straight (not premultiplied).
+
+    Args:
+        pixels: The ``(height, width, channels)`` pixels, modified in place.
+
+    Returns:
+        numpy.ndarray: The pixels.
+
+    """
+    pixels[..., :-1][pixels[..., -1] == 0] = 0
+    return pixels
+
+
+def select_channels(pixels: Any, channels: Optional[Union[int, Sequence[int]]]) -> Any:
+    """Keep some channels of an ``(height, width, channels)`` array.
+
+    Consecutive channels are selected with a slice, so the result is still a
+    view of the memory mapped file and nothing is copied.
+
+    Args:
+        pixels: The pixels.
+        channels: The number of leading channels to keep, the indices of the
+            channels, or ``None`` to keep them all.
+
+    Returns:
+        numpy.ndarray: The selected channels, always with 3 dimensions.
+
+    """
+    if channels is None:
+        return pixels
+    if isinstance(channels, int):
+        return pixels[..., :channels]
+    indices = list(channels)
+    start = indices[0] if indices else 0
+    stop = start + len(indices)
+    if indices == list(range(start, stop)):
+        return pixels[..., start:stop]
+    return pixels[..., indices]
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+
+def to_png(pixels: Any, compression: int = PNG_COMPRESSION) -> bytes:
+    """Encode an array as a PNG file.
+
+    Args:
+        pixels: A ``(height, width)`` or ``(height, width, channels)`` array
+            with 1 (gray), 2 (gray and alpha), 3 (RGB) or 4 (RGBA) channels.
+            ``uint8`` and ``bool`` arrays are saved with 8 bits per channel,
+            ``uint16`` arrays with 16 bits, and float arrays from 0 to 1 are
+            converted to 16 bits.
+        compression: The zlib level, from 0 to 9.
+
+    Returns:
+        bytes: The content of the PNG file.
+
+    Raises:
+        PhotoshopPythonAPIError: If the shape or the type is not supported.
+
+    """
+    np = numpy()
+    pixels = np.asarray(pixels)
+    if pixels.ndim == 2:
+        pixels = pixels[..., np.newaxis]
+    if pixels.ndim != 3 or pixels.shape[2] not in PNG_COLOR_TYPES or not pixels.size:
+        raise PhotoshopPythonAPIError(f"Expected (height, width, 1 to 4 channels) pixels, got {pixels.shape}.")
+    if pixels.dtype == np.bool_:
+        pixels = pixels.astype(np.uint8) * 255
+    elif pixels.dtype.kind == "f":
+        pixels = np.rint(np.clip(pixels, 0, 1) * 65535).astype(np.uint16)
+    if pixels.dtype not in (np.uint8, np.uint16):
+        raise PhotoshopPythonAPIError(f"Unsupported pixel type {pixels.dtype}.")
+    height, width, channels = pixels.shape
+    bit_depth = pixels.dtype.itemsize * 8
+    rows = np.ascontiguousarray(pixels, dtype=pixels.dtype.newbyteorder(">")).view(np.uint8).reshape(height, -1)
+    # Each row starts with its filter type, 0 for none.
+    scanlines = np.concatenate([np.zeros((height, 1), dtype=np.uint8), rows], axis=1)
+    header = struct.pack(">IIBBBBB", width, height, bit_depth, PNG_COLOR_TYPES[channels], 0, 0, 0)
+    return b"".join(
+        [
+            b"\x89PNG\r\n\x1a\n",
+            _png_chunk(b"IHDR", header),
+            _png_chunk(b"IDAT", zlib.compress(scanlines.tobytes(), compression)),
+            _png_chunk(b"IEND", b""),
+        ]
+    )
+
+
+def write_png(path: str, pixels: Any, compression: int = PNG_COMPRESSION):
+    """Write an array to a PNG file, see `to_png`."""
+    with open(path, "wb") as file_obj:
+        file_obj.write(to_png(pixels, compression))
+
+
+def histogram_stats(histograms: Any, percentiles: Sequence[float] = (1, 50, 99)) -> dict:
+    """Compute statistics of many histograms at once.
+
+    Args:
+        histograms: An array of pixel counts whose last axis holds the 256
+            levels, e.g. ``(channels, 256)`` for one document or
+            ``(images, channels, 256)`` for many.
+        percentiles: The percentiles to compute, from 0 to 100.
+
+    Returns:
+        dict: Arrays with the shape of ``histograms`` without its last axis:
+            ``count`` of pixels, ``mean`` and ``std`` level, the fractions of
+            pixels clipped to black (``clipped_low``) and to white
+            (``clipped_high``). ``percentiles`` has one more trailing axis
+            holding the level of each requested percentile.
+
+    """
+    np = numpy()
+    histograms = np.asarray(histograms, dtype=np.float64)
+    levels = np.arange(histograms.shape[-1], dtype=np.float64)
+    count = histograms.sum(axis=-1)
+    total = np.where(count > 0, count, 1)
+    mean = (histograms * levels).sum(axis=-1) / total
+    variance = (histograms * (levels - mean[..., np.newaxis]) ** 2).sum(axis=-1) / total
+    cdf = np.cumsum(histograms, axis=-1) / total[..., np.newaxis]
+    targets = np.asarray(percentiles, dtype=np.float64) / 100
+    # The first level whose cumulated share reaches each percentile.
+    levels_reached = (cdf[..., np.newaxis, :] >= targets[:, np.newaxis] - 1e-12).argmax(axis=-1)
+    return {
+        "count": count.astype(np.int64),
+        "mean": mean,
+        "std": np.sqrt(variance),
+        "percentiles": levels_reached,
+        "clipped_low": histograms[..., 0] / total,
+        "clipped_high": histograms[..., -1] / total,
+    }
+
+
+class Tile(NamedTuple):
+    """A tile of a large image.
+
+    Tiles overlap so filters have the context of the neighbouring pixels.
+    Each pixel belongs to the core of exactly one tile, which is the part
+    written back by `TileWriter`.
+
+    Attributes:
+        pixels: The ``(height, width, channels)`` pixels of ``bounds``.
+        bounds: The bounds of the pixels in the image, overlap included.
+        core: The bounds of the pixels this tile owns in the image.
+
+    """
+
+    pixels: Any
+    bounds: Box
+    core: Box
+
+    @property
+    def core_slices(self) -> Tuple[slice, slice]:
+        """tuple: The rows and columns of the core in ``pixels``."""
+        left, top = self.bounds[:2]
+        return slice(self.core[1] - top, self.core[3] - top), slice(self.core[0] - left, self.core[2] - left)
+
+
+def tile_grid(width: int, height: int, tile: int, overlap: int = 0) -> List[Tuple[Box, Box]]:
+    """Split an image into tiles, row by row.
+
+    Args:
+        width: The width of the image in pixels.
+        height: The height of the image in pixels.
+        tile: The length of the edge of the tile cores.
+        overlap: The number of pixels added on every side of the cores,
+            within the image.
+
+    Returns:
+        list: The ``(bounds, core)`` of each tile.
+
+    Raises:
+        PhotoshopPythonAPIError: If the tile size or the overlap is invalid.
+
+    """
+    if tile < 1 or overlap < 0:
+        raise PhotoshopPythonAPIError(f"Invalid tile size {tile} or overlap {overlap}.")
+    grid = []
+    for top in range(0, height, tile):
+        for left in range(0, width, tile):
+            core = (left, top, min(left + tile, width), min(top + tile, height))
+            bounds = (
+                max(core[0] - overlap, 0),
+                max(core[1] - overlap, 0),
+                min(core[2] + overlap, width),
+                min(core[3] + overlap, height),
+            )
+            grid.append((bounds, core))
+    return grid
+
+
+class TileWriter:
+    """Stitch processed tiles into a Photoshop Raw file.
+
+    The file is memory mapped, so only the tiles being written are in
+    memory. It can be opened in Photoshop with the same size, channels and
+    bit depth, or mapped again with `open_raw`.
+
+    ```python
+
+    with arrays.TileWriter(path, doc.width, doc.height, 3, 8) as writer:
+        for tile in doc.iter_tiles(overlap=16):
+            writer.write(tile, blur(tile.pixels))
+
+    ```
+
+    Args:
+        path: The path of the raw file, overwritten.
+        width: The width of the image in pixels.
+        height: The height of the image in pixels.
+        channels: The number of channels.
+        bit_depth: 8, 16 or 32 bits per channel.
+        byte_order: The byte order of 16 and 32 bit files.
+
+    """
+
+    def __init__(
+        self, path: str, width: int, height: int, channels: int, bit_depth: int, byte_order: str = RAW_BYTE_ORDER
+    ):
+        self.path = path
+        self.bit_depth = bit_depth
+        self.pixels = numpy().memmap(
+            path, dtype=raw_dtype(bit_depth, byte_order), mode="w+", shape=(height, width, channels)
+        )
+
+    def write(self, tile: Tile, pixels: Optional[Any] = None):
+        """Write the core of a tile.
+
+        Args:
+            tile: The tile, as yielded by `Document.iter_tiles`.
+            pixels: Optional, the processed pixels of the whole tile, with
+                the shape of ``tile.pixels``. Defaults to ``tile.pixels``.
+
+        Raises:
+            PhotoshopPythonAPIError: If the pixels do not match the tile.
+
+        """
+        pixels = tile.pixels if pixels is None else pixels
+        height, width = tile.bounds[3] - tile.bounds[1], tile.bounds[2] - tile.bounds[0]
+        if tuple(pixels.shape[:2]) != (height, width):
+            raise PhotoshopPythonAPIError(f"Expected {height}x{width} pixels for {tile.bounds}, got {pixels.shape}.")
+        left, top, right, bottom = tile.core
+        rows, columns = tile.core_slices
+        self.pixels[top:bottom, left:right] = pixels[rows, columns].reshape(bottom - top, right - left, -1)
+
+    def close(self):
+        """Flush the pixels to the file."""
+        if self.pixels is not None:
+            self.pixels.flush()
+            self.pixels = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
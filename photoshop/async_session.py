@@ -0,0 +1,198 @@
+"""Drive Photoshop from asyncio without blocking the event loop.
+
+COM objects belong to the thread that created them, and every call to
+Photoshop blocks until it returns. `AsyncSession` owns a dedicated thread,
+initialized as a single-threaded COM apartment, which runs the requests of
+the session one at a time in the order they were made. Awaiting a request
+suspends only the calling task, so network and disk I/O keep running while
+Photoshop works:
+
+```python
+
+import asyncio
+
+from photoshop.async_session import AsyncSession
+
+
+async def main():
+    async with AsyncSession() as session:
+        document = await session.open("d:/psd/cover.psd")
+        records = await session.snapshot(document)
+        await session.saveAs(document, "d:/out/cover.jpg", "jpg")
+        await session.run(document.close)
+
+
+asyncio.run(main())
+
+```
+
+The documents returned by the session live in its thread: pass them back to
+the session, wrap the calls to their properties in `AsyncSession.run`, or
+use them from worker threads through `AsyncSession.apartment.proxy`.
+
+"""
+
+# Import built-in modules
+import asyncio
+from typing import Any
+from typing import Callable
+from typing import List
+from typing import Optional
+
+# Import local modules
+from photoshop.apartment import Apartment
+
+
+class ComBackend:
+    """Runs the requests of an `AsyncSession` with a connection to Photoshop.
+
+    Every method is called in the thread of the session.
+
+    """
+
+    def __init__(self, ps_version: Optional[str] = None):
+        self._ps_version = ps_version
+        self.app = None
+
+    def start(self):
+        """Initialize the COM apartment of the thread and connect to Photoshop."""
+        # Import third-party modules
+        import comtypes
+
+        # Import local modules
+        from photoshop.api import Application
+
+        comtypes.CoInitialize()
+        self.app = Application(version=self._ps_version)
+
+    def stop(self):
+        """Release the connection and the COM apartment of the thread."""
+        # Import third-party modules
+        import comtypes
+
+        self.app = None
+        comtypes.CoUninitialize()
+
+    def open(self, path: str):
+        return self.app.open(path)
+
+    def save_as(self, document, path: str, options: Any, as_copy: bool):
+        # Import local modules
+        from photoshop.api import _export
+
+        if isinstance(options, str):
+            _export.save_copy(document, path, options)
+            return
+        document.saveAs(path, options, as_copy)
+
+    def eval_javascript(self, javascript: str) -> str:
+        return self.app.eval_javascript(javascript)
+
+    def snapshot(self, document, histograms: bool) -> List[dict]:
+        return document.snapshot(histograms)
+
+    def export_layers(self, document, out_dir: str, file_format: Any, **kwargs) -> List[dict]:
+        return document.export_layers(out_dir, file_format, **kwargs)
+
+
+class AsyncSession:
+    """A connection to Photoshop owned by a dedicated thread.
+
+    Requests are queued and run one at a time, in the order they were made,
+    even when they are awaited concurrently. A request cancelled before it
+    starts is never run. A request cannot be interrupted once started.
+
+    Args:
+        ps_version: Optional, the version of Photoshop, e.g. ``2022``.
+        backend: Optional, the object running the requests in the thread of
+            the session. Defaults to a `ComBackend`.
+
+    """
+
+    def __init__(self, ps_version: Optional[str] = None, backend: Any = None):
+        self.backend = backend or ComBackend(ps_version)
+        self.apartment = Apartment(self.backend.start, self.backend.stop)
+
+    def submit(self, func: Callable, *args, **kwargs) -> "asyncio.Future":
+        """Queue a call to run in the thread of the session.
+
+        Must be called from a running event loop. The thread is started and
+        connected to Photoshop on the first request.
+
+        Args:
+            func: The callable to run.
+            *args: The positional arguments of the call.
+            **kwargs: The keyword arguments of the call.
+
+        Returns:
+            asyncio.Future: The result of the call. Cancelling it before the
+                call starts removes the call from the queue.
+
+        Raises:
+            RuntimeError: If the session is closed.
+
+        """
+        return asyncio.wrap_future(self.apartment.submit(func, *args, **kwargs))
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a call in the thread of the session, see `submit`."""
+        return await self.submit(func, *args, **kwargs)
+
+    async def start(self):
+        """Start the thread and connect to Photoshop.
+
+        Raises:
+            Exception: The error raised while connecting, if any.
+
+        """
+        await self.run(lambda: None)
+
+    async def open(self, path: str):
+        """Open a document.
+
+        Returns:
+            Document: The document, owned by the thread of the session.
+
+        """
+        return await self.run(self.backend.open, path)
+
+    async def saveAs(self, document, path: str, options: Any, asCopy: bool = True):
+        """Save a document.
+
+        Args:
+            document: A document opened by the session.
+            path: The path of the saved file.
+            options: Save options, a save options spec, or a file format such
+                as ``png`` saved as a copy with a single script.
+            asCopy: If true, the document keeps its current file.
+
+        """
+        return await self.run(self.backend.save_as, document, path, options, asCopy)
+
+    async def eval_javascript(self, javascript: str) -> str:
+        """Run JavaScript in Photoshop.
+
+        Returns:
+            str: The result of the script.
+
+        """
+        return await self.run(self.backend.eval_javascript, javascript)
+
+    async def snapshot(self, document, histograms: bool = False) -> List[dict]:
+        """Read the state of every layer of a document, see `Document.snapshot`."""
+        return await self.run(self.backend.snapshot, document, histograms)
+
+    async def export_layers(self, document, out_dir: str, format: Any = "png", **kwargs) -> List[dict]:
+        """Export the top level layers of a document, see `Document.export_layers`."""
+        return await self.run(self.backend.export_layers, document, out_dir, format, **kwargs)
+
+    async def close(self):
+        """Run the queued requests, then disconnect and stop the thread."""
+        await asyncio.get_running_loop().run_in_executor(None, self.apartment.close)
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
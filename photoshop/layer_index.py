@@ -0,0 +1,433 @@
+"""A persistent index of the layers of PSD files.
+
+Opening a large document only to list its layers is slow. The layer index
+stores the layers of each file in a local SQLite database, so they can be
+looked up without Photoshop. A file is indexed either offline with
+`photoshop.psd`, or from a `Document.snapshot` taken while the document is
+open anyway:
+
+```python
+
+from photoshop.layer_index import LayerIndex
+
+index = LayerIndex()
+for record in index.layers("d:/psd/cover.psd"):
+    print(record["id"], record["name"], record["bounds"])
+for path, record in index.find(text="%SALE%", font="Helvetica%"):
+    print(path, record["name"], record["textRuns"])
+
+```
+
+An entry is only used while the path, size, modification time and a hash of
+the start of the file match the file on disk, otherwise the file is indexed
+again.
+
+"""
+
+# Import built-in modules
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+
+# Import local modules
+from photoshop.psd import PSDFile
+from photoshop.psd import TextRun
+
+
+# The environment variable overriding the path of the database.
+LAYER_INDEX_ENV = "PS_LAYER_INDEX"
+
+# Bumped when the indexed data changes, to index every file again.
+SCHEMA_VERSION = 2
+
+# The number of bytes at the start of a file hashed to detect changes.
+HEADER_HASH_SIZE = 1 << 16
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    header_hash TEXT NOT NULL,
+    indexed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS layers (
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    layer_id INTEGER,
+    name TEXT NOT NULL,
+    layer_index INTEGER,
+    parent INTEGER,
+    is_group INTEGER NOT NULL,
+    layer_kind INTEGER,
+    left INTEGER,
+    top INTEGER,
+    right INTEGER,
+    bottom INTEGER,
+    visible INTEGER,
+    opacity INTEGER,
+    blend_mode TEXT,
+    text TEXT,
+    artboard INTEGER,
+    smart_object TEXT,
+    PRIMARY KEY (file_id, position)
+);
+CREATE INDEX IF NOT EXISTS layers_name ON layers (name);
+CREATE TABLE IF NOT EXISTS text_runs (
+    file_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    run INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    font TEXT,
+    size REAL,
+    color TEXT,
+    PRIMARY KEY (file_id, position, run),
+    FOREIGN KEY (file_id, position) REFERENCES layers(file_id, position) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS text_runs_font ON text_runs (font);
+"""
+
+# The columns of the layers table, in order, after ``file_id`` and ``position``.
+LAYER_COLUMNS = (
+    "layer_id",
+    "name",
+    "layer_index",
+    "parent",
+    "is_group",
+    "layer_kind",
+    "left",
+    "top",
+    "right",
+    "bottom",
+    "visible",
+    "opacity",
+    "blend_mode",
+    "text",
+    "artboard",
+    "smart_object",
+)
+
+
+class FileKey(NamedTuple):
+    """The state of a file on disk when it was indexed.
+
+    Attributes:
+        path: The absolute, normalized path.
+        size: The size in bytes.
+        mtime_ns: The modification time in nanoseconds.
+        header_hash: The SHA-1 of the first `HEADER_HASH_SIZE` bytes.
+
+    """
+
+    path: str
+    size: int
+    mtime_ns: int
+    header_hash: str
+
+
+def default_path() -> str:
+    """str: The database used when none is given, overridden by ``PS_LAYER_INDEX``."""
+    path = os.environ.get(LAYER_INDEX_ENV)
+    if path:
+        return os.path.abspath(path)
+    return os.path.join(os.path.expanduser("~"), ".cache", "photoshop-python-api", "layers.sqlite")
+
+
+def normalize_path(path: str) -> str:
+    """str: The absolute path used as key, case insensitive on Windows."""
+    return os.path.normcase(os.path.abspath(path))
+
+
+def file_key(path: str) -> FileKey:
+    """Get the current state of a file.
+
+    Raises:
+        OSError: If the file cannot be read.
+
+    """
+    path = normalize_path(path)
+    with open(path, "rb") as file_obj:
+        stat = os.fstat(file_obj.fileno())
+        header_hash = hashlib.sha1(file_obj.read(HEADER_HASH_SIZE)).hexdigest()
+    return FileKey(path, stat.st_size, stat.st_mtime_ns, header_hash)
+
+
+def _row(record: Dict[str, Any]) -> Tuple:
+    left, top, right, bottom = record.get("bounds") or (None, None, None, None)
+    return (
+        record.get("id"),
+        record.get("name") or "",
+        record.get("index"),
+        record.get("parent"),
+        bool(record.get("group")),
+        record.get("layerKind"),
+        left,
+        top,
+        right,
+        bottom,
+        record.get("visible"),
+        record.get("opacity"),
+        record.get("blendMode"),
+        record.get("text"),
+        bool(record.get("artboard")),
+        record.get("smartObject"),
+    )
+
+
+def _run_rows(position: int, record: Dict[str, Any]) -> List[Tuple]:
+    return [
+        (position, index, run.get("text") or "", run.get("font"), run.get("size"), run.get("color"))
+        for index, run in enumerate(record.get("textRuns") or [])
+    ]
+
+
+def _record(row: sqlite3.Row) -> Dict[str, Any]:
+    bounds = [row["left"], row["top"], row["right"], row["bottom"]]
+    return {
+        "id": row["layer_id"],
+        "name": row["name"],
+        "index": row["layer_index"],
+        "parent": row["parent"],
+        "group": bool(row["is_group"]),
+        "layerKind": row["layer_kind"],
+        "bounds": None if bounds[0] is None else bounds,
+        "visible": None if row["visible"] is None else bool(row["visible"]),
+        "opacity": row["opacity"],
+        "blendMode": row["blend_mode"],
+        "text": row["text"],
+        "artboard": bool(row["artboard"]),
+        "smartObject": row["smart_object"],
+        "textRuns": [],
+    }
+
+
+def read_offline(path: str) -> List[Dict[str, Any]]:
+    """Read the layer records of a PSD or PSB file without Photoshop.
+
+    Returns:
+        list: `Document.snapshot` records, with the ``smartObject`` unique ID
+            of the placed content of smart objects, and the ``textRuns`` of
+            text layers: dicts of ``text``, ``font``, ``size`` and
+            ``#rrggbb`` ``color``.
+
+    """
+    with PSDFile(path) as psd:
+        return [
+            dict(layer.to_record(), smartObject=layer.smart_object, textRuns=[_run(run) for run in layer.text_runs])
+            for layer in psd.layers
+        ]
+
+
+def _run(run: TextRun) -> Dict[str, Any]:
+    color = "#{:02x}{:02x}{:02x}".format(*run.color) if run.color else None
+    return {"text": run.text, "font": run.font, "size": run.size, "color": color}
+
+
+class LayerIndex:
+    """A SQLite database of the layers of many files.
+
+    The database can be shared by several processes, each one using its own
+    `LayerIndex`. An instance can be used from several threads.
+
+    Args:
+        path: Optional, the path of the database. Defaults to
+            `default_path`. ``:memory:`` keeps the index in memory.
+
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or default_path()
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        with self._connection:
+            self._connection.execute("PRAGMA foreign_keys = ON")
+            self._connection.executescript(SCHEMA)
+            if self._connection.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                self._connection.execute("DELETE FROM files")
+                self._connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _file_id(self, key: FileKey) -> Optional[int]:
+        row = self._connection.execute(
+            "SELECT id FROM files WHERE path = ? AND size = ? AND mtime_ns = ? AND header_hash = ?", key
+        ).fetchone()
+        return row["id"] if row else None
+
+    def _with_runs(self, file_id: int, records: List[Dict[str, Any]], positions: List[int]):
+        runs = self._connection.execute(
+            "SELECT * FROM text_runs WHERE file_id = ? ORDER BY position, run", (file_id,)
+        ).fetchall()
+        by_position = dict(zip(positions, records))
+        for run in runs:
+            if run["position"] in by_position:
+                by_position[run["position"]]["textRuns"].append(
+                    {"text": run["text"], "font": run["font"], "size": run["size"], "color": run["color"]}
+                )
+
+    def get(self, path: str) -> Optional[List[Dict[str, Any]]]:
+        """Get the indexed layers of a file, if the index is up to date.
+
+        Args:
+            path: The path of the file.
+
+        Returns:
+            list: The layer records, from the top of the layers panel, or
+                ``None`` if the file is not indexed or changed since.
+
+        """
+        key = file_key(path)
+        with self._lock:
+            file_id = self._file_id(key)
+            if file_id is None:
+                return None
+            rows = self._connection.execute(
+                "SELECT * FROM layers WHERE file_id = ? ORDER BY position", (file_id,)
+            ).fetchall()
+            records = [_record(row) for row in rows]
+            self._with_runs(file_id, records, [row["position"] for row in rows])
+        return records
+
+    def store(self, path: str, records: Iterable[Dict[str, Any]]):
+        """Store the layers of a file, replacing its previous entry.
+
+        Args:
+            path: The path of the file, as currently on disk.
+            records: The layer records, e.g. returned by `Document.snapshot`
+                or `read_offline`. Only the records of `read_offline` hold
+                the ``textRuns`` searched by font.
+
+        """
+        key = file_key(path)
+        records = list(records)
+        rows = [_row(record) for record in records]
+        runs = [run for position, record in enumerate(records) for run in _run_rows(position, record)]
+        placeholders = ", ".join("?" * (len(LAYER_COLUMNS) + 2))
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM files WHERE path = ?", (key.path,))
+            cursor = self._connection.execute(
+                "INSERT INTO files (path, size, mtime_ns, header_hash, indexed_at) VALUES (?, ?, ?, ?, ?)",
+                (*key, time.time()),
+            )
+            self._connection.executemany(
+                f"INSERT INTO layers (file_id, position, {', '.join(LAYER_COLUMNS)}) VALUES ({placeholders})",
+                [(cursor.lastrowid, position, *row) for position, row in enumerate(rows)],
+            )
+            self._connection.executemany(
+                "INSERT INTO text_runs (file_id, position, run, text, font, size, color) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(cursor.lastrowid, *run) for run in runs],
+            )
+
+    def store_snapshot(self, document) -> List[Dict[str, Any]]:
+        """Index an open document with a single `Document.snapshot` call.
+
+        The document must be saved, the index describes its file on disk.
+
+        Returns:
+            list: The snapshot records.
+
+        Raises:
+            ValueError: If the document has unsaved changes.
+
+        """
+        if not document.saved:
+            raise ValueError(f"{document.name} has unsaved changes, save it before indexing it.")
+        records = document.snapshot()
+        self.store(str(document.fullName), records)
+        return records
+
+    def layers(self, path: str) -> List[Dict[str, Any]]:
+        """Get the layers of a file, indexing it offline when needed.
+
+        Args:
+            path: The path of a PSD or PSB file.
+
+        Returns:
+            list: The layer records, from the top of the layers panel.
+
+        Raises:
+            PSDError: If the file needs to be indexed and is not a PSD file.
+
+        """
+        records = self.get(path)
+        if records is None:
+            records = read_offline(path)
+            self.store(path, records)
+        return records
+
+    def find(
+        self,
+        name: Optional[str] = None,
+        text: Optional[str] = None,
+        kind: Optional[int] = None,
+        font: Optional[str] = None,
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """Find layers in every indexed file.
+
+        Files changed since they were indexed are not checked, use `layers`
+        to refresh them first.
+
+        Args:
+            name: Optional, a SQL ``LIKE`` pattern matching the layer name.
+            text: Optional, a SQL ``LIKE`` pattern matching the text contents.
+            kind: Optional, the ``layerKind`` of the layers.
+            font: Optional, a SQL ``LIKE`` pattern matching the PostScript
+                name of a font used by the text.
+
+        Returns:
+            list: The ``(path, record)`` of each layer found.
+
+        """
+        conditions, values = [], []
+        for column, value in (("name", name), ("text", text), ("layer_kind", kind)):
+            if value is not None:
+                conditions.append(f"layers.{column} {'LIKE' if isinstance(value, str) else '='} ?")
+                values.append(value)
+        if font is not None:
+            conditions.append(
+                "EXISTS (SELECT 1 FROM text_runs WHERE text_runs.file_id = layers.file_id "
+                "AND text_runs.position = layers.position AND text_runs.font LIKE ?)"
+            )
+            values.append(font)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        found = []
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT files.path AS file_path, layers.* FROM layers JOIN files ON files.id = layers.file_id "
+                f"{where} ORDER BY files.path, layers.position",
+                values,
+            ).fetchall()
+            by_file: Dict[int, List[sqlite3.Row]] = {}
+            for row in rows:
+                by_file.setdefault(row["file_id"], []).append(row)
+            for file_id, file_rows in by_file.items():
+                records = [_record(row) for row in file_rows]
+                self._with_runs(file_id, records, [row["position"] for row in file_rows])
+                found.extend((row["file_path"], record) for row, record in zip(file_rows, records))
+        return found
+
+    def forget(self, path: str):
+        """Remove a file from the index."""
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM files WHERE path = ?", (normalize_path(path),))
+
+    def close(self):
+        """Close the database."""
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
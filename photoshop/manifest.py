@@ -0,0 +1,105 @@
+"""Read and write the manifests stored next to exported files.
+
+A manifest is a JSON file describing every output of an export: the source
+layer, its bounds in the source document, the exported path and, for
+incremental exports, a fingerprint of the layer content. The paths are stored
+relative to the manifest so an export directory can be moved or copied.
+
+"""
+
+# Import built-in modules
+import hashlib
+import json
+import os
+from typing import Iterable
+from typing import List
+from typing import Optional
+
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+# The snapshot fields contributing to the fingerprint of a layer.
+FINGERPRINT_FIELDS = ("id", "name", "bounds", "visible", "opacity", "blendMode", "text", "histogram")
+
+
+def manifest_path(out_dir: str) -> str:
+    """str: The absolute path of the manifest stored in the given directory."""
+    return os.path.join(os.path.abspath(out_dir), MANIFEST_NAME)
+
+
+def load(out_dir: str) -> dict:
+    """Load the manifest stored in the given directory.
+
+    Args:
+        out_dir: The export directory.
+
+    Returns:
+        dict: The manifest, with absolute ``path`` entries. An empty manifest
+            is returned if the directory has none yet.
+
+    """
+    path = manifest_path(out_dir)
+    if not os.path.isfile(path):
+        return {"version": MANIFEST_VERSION, "layers": []}
+    with open(path, encoding="utf-8") as file_obj:
+        manifest = json.load(file_obj)
+    root = os.path.dirname(path)
+    for entry in manifest.get("layers", []):
+        if entry.get("path"):
+            entry["path"] = os.path.normpath(os.path.join(root, entry["path"]))
+    return manifest
+
+
+def dump(out_dir: str, layers: List[dict], **settings) -> str:
+    """Write the manifest of an export directory.
+
+    Args:
+        out_dir: The export directory.
+        layers: The manifest entries, with absolute ``path`` entries.
+        **settings: The export settings stored alongside the entries,
+            e.g. ``format`` or ``trim``.
+
+    Returns:
+        str: The path of the written manifest.
+
+    """
+    path = manifest_path(out_dir)
+    root = os.path.dirname(path)
+    entries = []
+    for entry in layers:
+        entry = dict(entry)
+        if entry.get("path"):
+            entry["path"] = os.path.relpath(entry["path"], root).replace("\\", "/")
+        entries.append(entry)
+    manifest = {"version": MANIFEST_VERSION, **settings, "layers": entries}
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file_obj:
+        json.dump(manifest, file_obj, indent=2, sort_keys=True)
+    os.replace(temp_path, path)
+    return path
+
+
+def fingerprint(records: Iterable[dict], **settings) -> str:
+    """Compute the fingerprint of a layer from its snapshot records.
+
+    Args:
+        records: The snapshot record of the layer followed by the records of
+            its descendants, if it is a group.
+        **settings: The export settings also affecting the output, e.g.
+            ``format`` or ``trim``.
+
+    Returns:
+        str: A hex digest, equal for two exports producing the same file.
+
+    """
+    content = [{key: record.get(key) for key in FINGERPRINT_FIELDS} for record in records]
+    payload = json.dumps({"layers": content, "settings": settings}, sort_keys=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def histogram_digest(histogram: Optional[Iterable[int]]) -> Optional[str]:
+    """Reduce a 256 entries histogram to a short digest stored in snapshots."""
+    if histogram is None:
+        return None
+    return hashlib.sha1(",".join(str(int(value)) for value in histogram).encode("ascii")).hexdigest()
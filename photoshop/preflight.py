@@ -0,0 +1,254 @@
+"""Check PSD files before sending them to Photoshop.
+
+A file that fails in Photoshop, or takes minutes to open, holds a Photoshop
+worker for nothing. The pre-flight scan reads the headers and layer records
+of every PSD and PSB file of a directory offline, with a process pool, and
+flags the files that should not be dispatched:
+
+```python
+
+from photoshop import preflight
+
+results = preflight.scan("d:/psd", fonts=installed_fonts, report="d:/psd/preflight.jsonl")
+jobs = [result.path for result in results if result.ok]
+
+```
+
+The report holds one JSON line per file, written as files are checked, so
+a long scan can be followed or consumed while it runs.
+
+"""
+
+# Import built-in modules
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+import json
+import os
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+# Import local modules
+from photoshop.psd import PSDError
+from photoshop.psd import PSDFile
+from photoshop.psd.links import ALIAS
+from photoshop.psd.links import EXTERNAL
+
+
+# The extensions of the files checked.
+PSD_EXTENSIONS = (".psd", ".psb")
+
+# Documents with more pixels are flagged as oversized.
+MAX_PIXELS = 100_000_000
+
+# The number of files queued per process. The files are submitted as the
+# results are consumed, so a huge tree is never queued at once.
+CHUNK_SIZE = 8
+
+
+class Preflight(NamedTuple):
+    """The result of checking a file.
+
+    Attributes:
+        path: The absolute path of the file.
+        color_mode: The color mode name, e.g. ``rgb``.
+        depth: The number of bits per channel.
+        width: The width in pixels.
+        height: The height in pixels.
+        layers: The number of layers, groups included.
+        fonts: The PostScript names of the fonts used by the text layers.
+        missing_links: The names of the linked smart object files not found
+            on disk.
+        alias_links: The names of the files linked by macOS aliases, which
+            cannot be checked offline.
+        problems: A description of each problem found.
+        error: The error raised if the file cannot be read.
+
+    """
+
+    path: str
+    color_mode: Optional[str] = None
+    depth: Optional[int] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    layers: int = 0
+    fonts: Tuple[str, ...] = ()
+    missing_links: Tuple[str, ...] = ()
+    alias_links: Tuple[str, ...] = ()
+    problems: Tuple[str, ...] = ()
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """bool: True if the file can be sent to Photoshop."""
+        return not self.problems
+
+    def to_dict(self) -> Dict[str, Any]:
+        """dict: The result as JSON serializable values."""
+        return dict(self._asdict(), ok=self.ok)
+
+
+def iter_files(root: str) -> Iterator[str]:
+    """Find the PSD and PSB files of a directory tree.
+
+    The directories are listed one at a time, so the first files are found
+    immediately even in very large trees.
+
+    Args:
+        root: The directory to walk.
+
+    Yields:
+        str: The absolute path of each file, sorted by directory.
+
+    """
+    directories = [os.path.abspath(root)]
+    while directories:
+        directory = directories.pop()
+        try:
+            with os.scandir(directory) as entries:
+                entries = sorted(entries, key=lambda entry: entry.name)
+        except OSError:
+            continue
+        subdirectories = []
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subdirectories.append(entry.path)
+            elif entry.name.lower().endswith(PSD_EXTENSIONS) and entry.is_file():
+                yield entry.path
+        directories.extend(reversed(subdirectories))
+
+
+def check(
+    path: str,
+    color_modes: Optional[Sequence[str]] = ("rgb",),
+    max_pixels: Optional[int] = MAX_PIXELS,
+    max_layers: Optional[int] = None,
+    fonts: Optional[Iterable[str]] = None,
+) -> Preflight:
+    """Check a single file.
+
+    Args:
+        path: The path of a PSD or PSB file.
+        color_modes: Optional, the expected color modes, see
+            `photoshop.psd.file.COLOR_MODES`. ``None`` accepts any mode.
+        max_pixels: Optional, the largest number of pixels accepted.
+        max_layers: Optional, the largest number of layers accepted.
+        fonts: Optional, the PostScript names of the installed fonts, e.g.
+            the ``postScriptName`` of the `Application.fonts`. ``None``
+            skips the font check.
+
+    Returns:
+        Preflight: The properties of the file and the problems found.
+
+    """
+    path = os.path.abspath(path)
+    try:
+        with PSDFile(path) as psd:
+            header = psd.header
+            layers = psd.layers
+            linked_files = psd.linked_files
+    except (OSError, PSDError) as error:
+        return Preflight(path, problems=("The file cannot be read.",), error=str(error))
+    used_fonts: List[str] = []
+    for layer in layers:
+        used_fonts.extend(font for font in layer.fonts if font not in used_fonts)
+    missing_links = tuple(
+        linked_file.name
+        for linked_file in linked_files
+        if linked_file.kind == EXTERNAL and linked_file.locate(path) is None
+    )
+    alias_links = tuple(linked_file.name for linked_file in linked_files if linked_file.kind == ALIAS)
+    problems = []
+    if color_modes is not None and header.color_mode_name not in color_modes:
+        problems.append(f"The color mode is {header.color_mode_name}, expected {' or '.join(color_modes)}.")
+    if max_pixels is not None and header.width * header.height > max_pixels:
+        problems.append(f"The document is oversized: {header.width}x{header.height} pixels.")
+    if max_layers is not None and len(layers) > max_layers:
+        problems.append(f"The document has {len(layers)} layers.")
+    if fonts is not None:
+        installed = set(fonts)
+        missing_fonts = [font for font in used_fonts if font not in installed]
+        if missing_fonts:
+            problems.append(f"Missing fonts: {', '.join(missing_fonts)}.")
+    if missing_links:
+        problems.append(f"Missing linked files: {', '.join(missing_links)}.")
+    return Preflight(
+        path,
+        header.color_mode_name,
+        header.depth,
+        header.width,
+        header.height,
+        len(layers),
+        tuple(used_fonts),
+        missing_links,
+        alias_links,
+        tuple(problems),
+    )
+
+
+def iter_scan(root: str, workers: Optional[int] = None, **rules) -> Iterator[Preflight]:
+    """Check every PSD and PSB file of a directory tree.
+
+    Args:
+        root: The directory to walk.
+        workers: Optional, the number of processes. ``1`` checks the files in
+            the calling process. Defaults to the number of processors.
+        **rules: The checks to run, see `check`.
+
+    Yields:
+        Preflight: The result of each file, in the order of `iter_files`.
+
+    """
+    if rules.get("fonts") is not None:
+        # Sent once to each process, and looked up for every file.
+        rules["fonts"] = frozenset(rules["fonts"])
+    check_file = partial(check, **rules)
+    if workers == 1:
+        yield from map(check_file, iter_files(root))
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        files = iter_files(root)
+        window = (workers or os.cpu_count() or 1) * CHUNK_SIZE
+        pending = deque(executor.submit(check_file, path) for path in islice(files, window))
+        while pending:
+            result = pending.popleft().result()
+            for path in islice(files, 1):
+                pending.append(executor.submit(check_file, path))
+            yield result
+
+
+def scan(root: str, report: Optional[str] = None, workers: Optional[int] = None, **rules) -> List[Preflight]:
+    """Check every PSD and PSB file of a directory tree.
+
+    Args:
+        root: The directory to walk.
+        report: Optional, the path of a JSON lines report, written as the
+            files are checked.
+        workers: Optional, the number of processes. ``1`` checks the files in
+            the calling process. Defaults to the number of processors.
+        **rules: The checks to run, see `check`.
+
+    Returns:
+        list: The result of each file.
+
+    """
+    results = []
+    file_obj = open(report, "w", encoding="utf-8") if report else None
+    try:
+        for result in iter_scan(root, workers, **rules):
+            results.append(result)
+            if file_obj:
+                file_obj.write(json.dumps(result.to_dict(), sort_keys=True) + "\n")
+                file_obj.flush()
+    finally:
+        if file_obj:
+            file_obj.close()
+    return results
@@ -0,0 +1,20 @@
+"""Read the structure of PSD and PSB files without Photoshop.
+
+Files are memory mapped and parsed on demand, so listing the layers of a
+large document only reads its layer records, never its pixels. This package
+only uses the standard library and can be used on any platform, e.g. to plan
+work or validate templates before opening them in Photoshop.
+
+"""
+
+# Import local modules
+from photoshop.psd.engine_data import TextRun
+from photoshop.psd.errors import PSDError
+from photoshop.psd.file import Header
+from photoshop.psd.file import PSDFile
+from photoshop.psd.layers import Channel
+from photoshop.psd.layers import Layer
+from photoshop.psd.links import LinkedFile
+
+
+__all__ = ["Channel", "Header", "Layer", "LinkedFile", "PSDError", "PSDFile", "TextRun"]
@@ -0,0 +1,95 @@
+"""Read the big-endian values of PSD and PSB files."""
+
+# Import built-in modules
+import struct
+from typing import Any
+from typing import Tuple
+
+# Import local modules
+from photoshop.psd.errors import PSDError
+
+
+class Reader:
+    """A cursor over a buffer such as a memory mapped file.
+
+    Values are unpacked in place, only the strings and the blocks explicitly
+    read are copied.
+
+    Args:
+        data: The buffer.
+        offset: The position of the cursor.
+        version: 1 for PSD files, 2 for PSB files with 8 bytes lengths.
+
+    """
+
+    def __init__(self, data: Any, offset: int = 0, version: int = 1):
+        self.data = data
+        self.offset = offset
+        self.version = version
+
+    def unpack(self, fmt: str) -> Tuple:
+        """Read values with a `struct` format, big-endian."""
+        fmt = ">" + fmt
+        try:
+            values = struct.unpack_from(fmt, self.data, self.offset)
+        except struct.error:
+            raise PSDError(f"Unexpected end of file at offset {self.offset}.")
+        self.offset += struct.calcsize(fmt)
+        return values
+
+    def u8(self) -> int:
+        return self.unpack("B")[0]
+
+    def u16(self) -> int:
+        return self.unpack("H")[0]
+
+    def i16(self) -> int:
+        return self.unpack("h")[0]
+
+    def u32(self) -> int:
+        return self.unpack("I")[0]
+
+    def i32(self) -> int:
+        return self.unpack("i")[0]
+
+    def i64(self) -> int:
+        return self.unpack("q")[0]
+
+    def f64(self) -> float:
+        return self.unpack("d")[0]
+
+    def length(self, large: bool = True) -> int:
+        """Read a length stored on 8 bytes in PSB files if ``large``."""
+        return self.unpack("Q")[0] if large and self.version == 2 else self.u32()
+
+    def read(self, size: int) -> bytes:
+        """Read and copy a number of bytes."""
+        start, end = self.offset, self.offset + size
+        if end > len(self.data):
+            raise PSDError(f"Unexpected end of file at offset {start}.")
+        data = bytes(self.data[start:end])
+        self.offset = end
+        return data
+
+    def skip(self, size: int):
+        self.offset += size
+
+    def key(self) -> str:
+        """Read a 4 characters key such as ``8BIM``."""
+        return self.read(4).decode("latin-1")
+
+    def pascal_string(self, padding: int = 2) -> str:
+        """Read a string prefixed by its length, padded with its length byte."""
+        start = self.offset
+        value = self.read(self.u8()).decode("latin-1")
+        self.offset += -(self.offset - start) % padding
+        return value
+
+    def unicode_string(self) -> str:
+        """Read an UTF-16 string prefixed by its number of characters."""
+        return self.read(self.u32() * 2).decode("utf-16-be", "replace").rstrip("\x00")
+
+    def class_id(self) -> str:
+        """Read a descriptor key, either a 4 characters key or a string ID."""
+        size = self.u32()
+        return self.read(size or 4).decode("latin-1")
@@ -0,0 +1,160 @@
+"""Decode the action descriptors stored in PSD files.
+
+Layer properties such as text, artboards and smart objects are stored as
+serialized action descriptors, the same structures the Action Manager
+exposes as `ActionDescriptor`. They are decoded into plain Python values:
+
+* descriptors become dicts keyed by string or 4 characters ID, with the class
+  ID under ``_classID``,
+* lists become lists, and raw data becomes bytes,
+* unit doubles become ``{"unit": ..., "value": ...}`` dicts,
+* enumerations become their value ID, and references a list of dicts.
+
+"""
+
+# Import built-in modules
+from typing import Any
+from typing import Callable
+from typing import Dict
+
+# Import local modules
+from photoshop.psd._binary import Reader
+from photoshop.psd.errors import PSDError
+
+
+# The version preceding every serialized descriptor.
+DESCRIPTOR_VERSION = 16
+
+
+def read_descriptor(reader: Reader) -> Dict[str, Any]:
+    """Read a descriptor, without its version.
+
+    Args:
+        reader: A reader at the start of the descriptor.
+
+    Returns:
+        dict: The items of the descriptor, keyed by ID.
+
+    """
+    reader.unicode_string()
+    descriptor: Dict[str, Any] = {"_classID": reader.class_id()}
+    for _ in range(reader.u32()):
+        key = reader.class_id()
+        descriptor[key] = read_value(reader, reader.key())
+    return descriptor
+
+
+def read_versioned_descriptor(reader: Reader) -> Dict[str, Any]:
+    """Read a descriptor preceded by its version.
+
+    Raises:
+        PSDError: If the version is not supported.
+
+    """
+    version = reader.u32()
+    if version != DESCRIPTOR_VERSION:
+        raise PSDError(f"Unsupported descriptor version {version}.")
+    return read_descriptor(reader)
+
+
+def _unit_float(reader: Reader) -> Dict[str, Any]:
+    unit = reader.key()
+    return {"unit": unit, "value": reader.f64()}
+
+
+def _unit_floats(reader: Reader) -> Dict[str, Any]:
+    unit = reader.key()
+    return {"unit": unit, "values": [reader.f64() for _ in range(reader.u32())]}
+
+
+def _enumerated(reader: Reader) -> str:
+    reader.class_id()
+    return reader.class_id()
+
+
+def _class(reader: Reader) -> str:
+    reader.unicode_string()
+    return reader.class_id()
+
+
+def _list(reader: Reader) -> list:
+    return [read_value(reader, reader.key()) for _ in range(reader.u32())]
+
+
+def _raw(reader: Reader) -> bytes:
+    return reader.read(reader.u32())
+
+
+def _object_array(reader: Reader) -> Dict[str, Any]:
+    # An array of objects stored as one descriptor of unit float arrays.
+    count = reader.u32()
+    reader.unicode_string()
+    array: Dict[str, Any] = {"_classID": reader.class_id(), "_count": count}
+    for _ in range(reader.u32()):
+        key = reader.class_id()
+        kind = reader.key()
+        if kind == "UnFl":
+            array[key] = _unit_floats(reader)
+        else:
+            array[key] = read_value(reader, kind)
+    return array
+
+
+def _reference_item(reader: Reader) -> Dict[str, Any]:
+    form = reader.key()
+    if form == "Idnt" or form == "indx":
+        return {"form": form, "value": reader.i32()}
+    name = reader.unicode_string()
+    item: Dict[str, Any] = {"form": form, "name": name, "class": reader.class_id()}
+    if form == "prop":
+        item["value"] = reader.class_id()
+    elif form == "Enmr":
+        item["type"] = reader.class_id()
+        item["value"] = reader.class_id()
+    elif form == "rele":
+        item["value"] = reader.i32()
+    elif form == "name":
+        item["value"] = reader.unicode_string()
+    elif form != "Clss":
+        raise PSDError(f"Unsupported reference form {form!r}.")
+    return item
+
+
+def _reference(reader: Reader) -> list:
+    return [_reference_item(reader) for _ in range(reader.u32())]
+
+
+_READERS: Dict[str, Callable[[Reader], Any]] = {
+    "Objc": read_descriptor,
+    "GlbO": read_descriptor,
+    "VlLs": _list,
+    "doub": Reader.f64,
+    "UntF": _unit_float,
+    "UnFl": _unit_floats,
+    "TEXT": Reader.unicode_string,
+    "enum": _enumerated,
+    "long": Reader.i32,
+    "comp": Reader.i64,
+    "bool": lambda reader: bool(reader.u8()),
+    "type": _class,
+    "GlbC": _class,
+    "alis": _raw,
+    "Pth ": _raw,
+    "tdta": _raw,
+    "ObAr": _object_array,
+    "obj ": _reference,
+}
+
+
+def read_value(reader: Reader, kind: str) -> Any:
+    """Read a descriptor value of the given OS type.
+
+    Raises:
+        PSDError: If the type is unknown, the rest of the descriptor cannot
+            be located then.
+
+    """
+    read = _READERS.get(kind)
+    if read is None:
+        raise PSDError(f"Unsupported descriptor value type {kind!r} at offset {reader.offset}.")
+    return read(reader)
@@ -0,0 +1,168 @@
+"""Parse the engine data of text layers.
+
+The styles of a text layer are stored in its ``EngineData``, a serialized
+dictionary in a syntax close to PDF objects::
+
+    << /EngineDict << /Editor << /Text (...) >> >> /ResourceDict << ... >> >>
+
+Dictionaries become dicts keyed by name, arrays lists, strings str (UTF-16
+when prefixed by a byte order mark), and numbers and booleans their Python
+value.
+
+"""
+
+# Import built-in modules
+import re
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+
+# Import local modules
+from photoshop.psd.errors import PSDError
+
+
+TOKEN = re.compile(rb"<<|>>|\[|\]|\((?:\\.|[^\\)])*\)|/[^\s<>\[\]()/]*|[^\s<>\[\]()/]+", re.DOTALL)
+ESCAPE = re.compile(rb"\\(.)", re.DOTALL)
+
+# The font Photoshop adds to every font set, used for invisible characters.
+INVISIBLE_FONT = "AdobeInvisFont"
+
+
+class TextRun(NamedTuple):
+    """A run of characters of a text layer sharing the same style.
+
+    Attributes:
+        text: The characters, with paragraphs separated by ``\\r``.
+        font: The PostScript name of the font.
+        size: The font size in points, scaled by the transform of the layer
+            like `TextItem.size`.
+        color: The ``(red, green, blue)`` fill color, from 0 to 255.
+
+    """
+
+    text: str
+    font: Optional[str] = None
+    size: Optional[float] = None
+    color: Optional[Tuple[int, int, int]] = None
+
+
+def _string(token: bytes) -> str:
+    value = ESCAPE.sub(rb"\1", token[1:-1])
+    if value.startswith(b"\xfe\xff"):
+        return value[2:].decode("utf-16-be", "replace")
+    return value.decode("latin-1")
+
+
+def _scalar(token: bytes) -> Any:
+    if token.startswith(b"("):
+        return _string(token)
+    if token.startswith(b"/"):
+        return token[1:].decode("latin-1")
+    if token in (b"true", b"false"):
+        return token == b"true"
+    try:
+        return float(token) if b"." in token else int(token)
+    except ValueError:
+        return token.decode("latin-1")
+
+
+def parse(data: bytes) -> Dict[str, Any]:
+    """Parse engine data.
+
+    Args:
+        data: The ``EngineData`` of the text descriptor of a layer.
+
+    Returns:
+        dict: The engine data, keyed by name, e.g. ``EngineDict`` and
+            ``ResourceDict``.
+
+    Raises:
+        PSDError: If the dictionaries or arrays are not balanced.
+
+    """
+    # Each level holds its container and the key waiting for a value.
+    stack: List[list] = [[[], None]]
+    for match in TOKEN.finditer(data):
+        token = match.group()
+        level = stack[-1]
+        if token in (b"<<", b"["):
+            stack.append([{} if token == b"<<" else [], None])
+            continue
+        if token in (b">>", b"]"):
+            if len(stack) == 1 or isinstance(level[0], dict) != (token == b">>"):
+                raise PSDError(f"Unbalanced engine data at offset {match.start()}.")
+            stack.pop()
+            value = level[0]
+            level = stack[-1]
+        elif isinstance(level[0], dict) and level[1] is None:
+            if not token.startswith(b"/"):
+                raise PSDError(f"Expected a key in the engine data at offset {match.start()}.")
+            level[1] = token[1:].decode("latin-1")
+            continue
+        else:
+            value = _scalar(token)
+        if isinstance(level[0], dict):
+            level[0][level[1]] = value
+            level[1] = None
+        else:
+            level[0].append(value)
+    if len(stack) != 1 or not stack[0][0] or not isinstance(stack[0][0][0], dict):
+        raise PSDError("Unbalanced engine data.")
+    return stack[0][0][0]
+
+
+def _color(value: Any) -> Optional[Tuple[int, int, int]]:
+    values = value.get("Values") if isinstance(value, dict) else None
+    if not isinstance(values, list) or len(values) != 4:
+        return None
+    # The alpha and the components, from 0 to 1.
+    red, green, blue = (int(round(component * 255)) for component in values[1:])
+    return red, green, blue
+
+
+def text_runs(engine_data: Dict[str, Any], scale: float = 1.0) -> List[TextRun]:
+    """Split the text of a layer in runs of characters sharing a style.
+
+    Args:
+        engine_data: The parsed engine data.
+        scale: The vertical scale of the transform of the layer, applied to
+            the font sizes.
+
+    Returns:
+        list: The runs, in order. Properties missing from a run come from
+            the normal style sheet of the layer.
+
+    """
+    resources = engine_data.get("ResourceDict") or {}
+    font_set = [font.get("Name") for font in resources.get("FontSet") or []]
+    style_sheets = resources.get("StyleSheetSet") or []
+    normal = resources.get("TheNormalStyleSheet", 0)
+    default = {}
+    if isinstance(normal, int) and normal < len(style_sheets):
+        default = style_sheets[normal].get("StyleSheetData") or {}
+    engine = engine_data.get("EngineDict") or {}
+    text = (engine.get("Editor") or {}).get("Text") or ""
+    # Photoshop terminates the text with a carriage return.
+    if text.endswith("\r"):
+        text = text[:-1]
+    style_run = engine.get("StyleRun") or {}
+    runs = []
+    start = 0
+    for run, length in zip(style_run.get("RunArray") or [], style_run.get("RunLengthArray") or []):
+        style = dict(default, **(run.get("StyleSheet", {}).get("StyleSheetData") or {}))
+        font = style.get("Font")
+        size = style.get("FontSize")
+        stop = start + length
+        runs.append(
+            TextRun(
+                text[start:stop],
+                font_set[font] if isinstance(font, int) and font < len(font_set) else None,
+                size * scale if isinstance(size, (int, float)) else None,
+                _color(style.get("FillColor")),
+            )
+        )
+        start = stop
+    return runs
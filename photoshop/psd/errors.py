@@ -0,0 +1,5 @@
+class PSDError(Exception):
+    """The file is not a valid PSD or PSB file."""
+
+
+__all__ = ["PSDError"]
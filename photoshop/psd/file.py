@@ -0,0 +1,304 @@
+"""Memory mapped PSD and PSB files."""
+
+# Import built-in modules
+import mmap
+import os
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+
+# Import local modules
+from photoshop import xmp
+from photoshop.psd import image
+from photoshop.psd._binary import Reader
+from photoshop.psd.errors import PSDError
+from photoshop.psd.layers import Channel
+from photoshop.psd.layers import Layer
+from photoshop.psd.layers import read_layer_info
+from photoshop.psd.layers import read_tagged_blocks
+from photoshop.psd.links import LinkedFile
+from photoshop.psd.links import read_linked_files
+
+
+SIGNATURE = b"8BPS"
+
+# The name of each color mode.
+COLOR_MODES = {
+    0: "bitmap",
+    1: "grayscale",
+    2: "indexed",
+    3: "rgb",
+    4: "cmyk",
+    7: "multichannel",
+    8: "duotone",
+    9: "lab",
+}
+
+# The image resource holding the resolution.
+RESOLUTION_INFO = 1005
+
+# The image resource holding the XMP metadata.
+XMP_METADATA = 1060
+
+# The global tagged blocks holding the layers of 16 and 32 bits documents.
+HIGH_DEPTH_LAYER_KEYS = ("Lr16", "Lr32")
+
+
+class Header(NamedTuple):
+    """The header of a PSD file.
+
+    Attributes:
+        version: 1 for PSD files, 2 for PSB files.
+        channels: The number of channels of the composite image, alpha
+            channels included.
+        height: The height of the document in pixels.
+        width: The width of the document in pixels.
+        depth: The number of bits per channel.
+        color_mode: The color mode, see `COLOR_MODES`.
+
+    """
+
+    version: int
+    channels: int
+    height: int
+    width: int
+    depth: int
+    color_mode: int
+
+    @property
+    def color_mode_name(self) -> str:
+        """str: The name of the color mode, e.g. ``rgb``."""
+        return COLOR_MODES.get(self.color_mode, str(self.color_mode))
+
+
+class PSDFile:
+    """A PSD or PSB file, memory mapped and parsed on demand.
+
+    Opening a file only reads its header and the lengths of its sections.
+    The image resources and the layers are parsed on first access, and the
+    pixels are never read unless explicitly requested.
+
+    ```python
+
+    from photoshop.psd import PSDFile
+
+    with PSDFile("d:/psd/cover.psd") as psd:
+        print(psd.header.width, psd.header.height)
+        for layer in psd.layers:
+            print(layer.id, layer.name, layer.bounds)
+
+    ```
+
+    Args:
+        path: The path of the file.
+
+    Raises:
+        PSDError: If the file is not a PSD or PSB file.
+
+    """
+
+    def __init__(self, path: str):
+        self.path = os.path.abspath(path)
+        self._file = open(self.path, "rb")
+        try:
+            self._data: Any = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise PSDError(f"{self.path} is empty.")
+        self._resources: Optional[Dict[int, Tuple[int, int]]] = None
+        self._layers: Optional[List[Layer]] = None
+        self._blocks: Optional[Dict[str, Tuple[int, int]]] = None
+        try:
+            self._read_header()
+        except BaseException:
+            self.close()
+            raise
+
+    def _read_header(self):
+        if self._data[:4] != SIGNATURE:
+            raise PSDError(f"{self.path} is not a PSD file.")
+        reader = Reader(self._data, 4)
+        version = reader.u16()
+        if version not in (1, 2):
+            raise PSDError(f"{self.path} has an unsupported version {version}.")
+        reader.skip(6)
+        self.header = Header(version, *reader.unpack("HIIHH"))
+        reader.version = version
+        reader.skip(reader.u32())  # The color mode data.
+        self._resources_offset = reader.offset + 4
+        reader.skip(reader.u32())
+        self._layers_offset = reader.offset
+        reader.skip(reader.length())
+        self.image_data_offset = reader.offset
+
+    def reader(self, offset: int = 0) -> Reader:
+        """Reader: A cursor over the file at the given offset."""
+        return Reader(self._data, offset, self.header.version)
+
+    @property
+    def is_psb(self) -> bool:
+        """bool: True for large document format files."""
+        return self.header.version == 2
+
+    @property
+    def image_resources(self) -> Dict[int, Tuple[int, int]]:
+        """dict: The ``(offset, size)`` of the data of each image resource, by ID."""
+        if self._resources is None:
+            reader = self.reader(self._resources_offset - 4)
+            end = reader.u32() + reader.offset
+            resources = {}
+            while reader.offset + 12 <= end and reader.key() == "8BIM":
+                resource_id = reader.u16()
+                reader.pascal_string(2)
+                size = reader.u32()
+                resources[resource_id] = (reader.offset, size)
+                reader.skip(size + size % 2)
+            self._resources = resources
+        return self._resources
+
+    def resource(self, resource_id: int) -> Optional[bytes]:
+        """Read the data of an image resource.
+
+        Args:
+            resource_id: The ID of the resource, e.g. 1060 for the XMP
+                metadata.
+
+        Returns:
+            bytes: The data, or ``None`` if the file has no such resource.
+
+        """
+        if resource_id not in self.image_resources:
+            return None
+        offset, size = self.image_resources[resource_id]
+        return self.reader(offset).read(size)
+
+    @property
+    def resolution(self) -> Optional[float]:
+        """float: The horizontal resolution in pixels per inch, if stored."""
+        if RESOLUTION_INFO not in self.image_resources:
+            return None
+        return self.reader(self.image_resources[RESOLUTION_INFO][0]).u32() / 65536
+
+    def xmp(self, namespaces: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Parse the XMP metadata stored in the file, see `photoshop.xmp.parse`.
+
+        Args:
+            namespaces: Optional, the URIs of the namespaces to extract.
+
+        Returns:
+            dict: The properties keyed by name, keyed by namespace URI. Empty
+                if the file has no XMP metadata.
+
+        """
+        packet = self.resource(XMP_METADATA)
+        return xmp.parse(packet, namespaces) if packet else {}
+
+    def _read_layers_section(self):
+        reader = self.reader(self._layers_offset)
+        end = reader.length() + reader.offset
+        layers: List[Layer] = []
+        blocks: Dict[str, Tuple[int, int]] = {}
+        if end > reader.offset:
+            info_end = reader.length() + reader.offset
+            if info_end > reader.offset:
+                layers = read_layer_info(reader)
+            reader.offset = info_end
+            reader.skip(reader.u32())  # The global layer mask info.
+            blocks = read_tagged_blocks(reader, end, padding=4)
+            for key in HIGH_DEPTH_LAYER_KEYS:
+                if not layers and key in blocks:
+                    layers = read_layer_info(self.reader(blocks[key][0]))
+        self._layers = layers
+        self._blocks = blocks
+
+    @property
+    def layers(self) -> List[Layer]:
+        """list: The layers, from the top of the layers panel to the bottom."""
+        if self._layers is None:
+            self._read_layers_section()
+        return self._layers
+
+    @property
+    def global_blocks(self) -> Dict[str, Tuple[int, int]]:
+        """dict: The ``(offset, size)`` of the global tagged blocks, e.g. the linked files."""
+        if self._blocks is None:
+            self._read_layers_section()
+        return self._blocks
+
+    @property
+    def linked_files(self) -> List[LinkedFile]:
+        """list: The files placed in smart objects, embedded or linked."""
+        return read_linked_files(self.reader(), self.global_blocks)
+
+    def records(self) -> List[Dict[str, Any]]:
+        """list: The layers as `Document.snapshot` records."""
+        return [layer.to_record() for layer in self.layers]
+
+    def channel_data(self, channel: Channel) -> Tuple[int, memoryview]:
+        """Get the pixels of a layer channel without copying them.
+
+        Args:
+            channel: A channel of a layer.
+
+        Returns:
+            tuple: The compression type (0 raw, 1 RLE, 2 and 3 ZIP) and a view
+                of the compressed pixels.
+
+        """
+        compression = self.reader(channel.offset).u16()
+        start = channel.offset + 2
+        end = channel.offset + channel.size
+        return compression, memoryview(self._data)[start:end]
+
+    def composite(self, channels: Optional[int] = None) -> Any:
+        """Decode the merged image stored in the file, without Photoshop.
+
+        The image is only stored if the file was saved with maximized
+        compatibility, which is the default. Requires NumPy.
+
+        Args:
+            channels: Optional, the number of leading channels to decode,
+                e.g. 3 to skip the alpha channels of an RGB document.
+
+        Returns:
+            numpy.ndarray: The ``(height, width, channels)`` pixels, as
+                ``uint8``, ``uint16`` (0 to 65535) or ``float32`` values.
+                Bitmap documents are decoded as 0 or 255 ``uint8`` values.
+
+        """
+        header = self.header
+        return image.read_image_data(
+            self._data,
+            self.image_data_offset,
+            header.width,
+            header.height,
+            header.channels,
+            header.depth,
+            header.version,
+            channels,
+        )
+
+    def close(self):
+        """Unmap and close the file."""
+        if self._data is not None:
+            try:
+                self._data.close()
+            except BufferError:
+                # Views returned by `channel_data` are still alive.
+                pass
+            self._data = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __repr__(self):
+        header = self.header
+        return f"PSDFile({self.path!r}, {header.width}x{header.height}, {header.color_mode_name}, {header.depth} bits)"
@@ -0,0 +1,216 @@
+"""Decode the pixels stored in PSD and PSB files with NumPy.
+
+PackBits (RLE) compressed rows are decoded for many rows at once: every step
+reads the next packet header of all the rows still being decoded, then the
+packets are expanded with a single gather. The compressed data is read in
+place from the memory mapped file, and the rows are decoded in blocks so the
+memory used stays bounded for very large documents.
+
+NumPy is an optional dependency, imported on first use:
+
+```
+
+pip install numpy
+
+```
+
+"""
+
+# Import built-in modules
+from typing import Any
+from typing import Optional
+import zlib
+
+# Import local modules
+from photoshop.psd.errors import PSDError
+
+
+# The compression types of the image data.
+RAW = 0
+RLE = 1
+ZIP = 2
+ZIP_PREDICTION = 3
+
+# The number of decoded bytes per block of rows. The intermediate index
+# arrays take 8 bytes per decoded byte.
+BLOCK_BYTES = 1 << 22
+
+
+def numpy():
+    """module: NumPy, imported on first use."""
+    try:
+        # Import third-party modules
+        import numpy
+    except ImportError:
+        raise ImportError("NumPy is required to decode pixels, install it with `pip install numpy`.")
+    return numpy
+
+
+def row_size(width: int, depth: int) -> int:
+    """int: The number of bytes of a row of one channel."""
+    return (width * depth + 7) // 8
+
+
+def decode_packbits(data: Any, starts: Any, ends: Any, size: int) -> Any:
+    """Decode PackBits compressed rows.
+
+    Args:
+        data: The ``uint8`` array holding the compressed rows.
+        starts: The offset of each row in ``data``.
+        ends: The offset of the end of each row in ``data``.
+        size: The number of bytes of each decoded row.
+
+    Returns:
+        numpy.ndarray: The ``(rows, size)`` decoded bytes.
+
+    Raises:
+        PSDError: If a row does not decode to ``size`` bytes, or a packet
+            reads past the end of its row.
+
+    """
+    np = numpy()
+    rows = len(starts)
+    position = np.asarray(starts, dtype=np.int64).copy()
+    ends = np.asarray(ends, dtype=np.int64)
+    if rows and ends.max(initial=0) > len(data):
+        raise PSDError("The compressed rows overflow the image data.")
+    active = np.flatnonzero(position < ends)
+    packets = []
+    while active.size:
+        offsets = position[active]
+        header = data[offsets].astype(np.int8).astype(np.int64)
+        literal = header >= 0
+        # A header of -128 is a no-op.
+        count = np.where(literal, header + 1, np.where(header > -128, 1 - header, 0))
+        packets.append((active, offsets + 1, count, literal))
+        offsets = offsets + 1 + np.where(literal, count, np.minimum(count, 1))
+        position[active] = offsets
+        active = active[offsets < ends[active]]
+    if not packets:
+        if rows and size:
+            raise PSDError("The compressed rows are empty.")
+        return np.zeros((rows, size), dtype=np.uint8)
+    row, source, count, literal = (np.concatenate(values) for values in zip(*packets))
+    order = np.argsort(row, kind="stable")
+    row, source, count, literal = row[order], source[order], count[order], literal[order]
+    if (np.bincount(row, weights=count, minlength=rows) != size).any():
+        raise PSDError(f"The compressed rows do not decode to {size} bytes.")
+    if (source + count * literal > ends[row]).any():
+        raise PSDError("A literal packet overflows its row.")
+    if (~literal & (count > 0) & (source >= ends[row])).any():
+        raise PSDError("A repeat packet has no byte to repeat.")
+    # Each output byte reads the packet source, plus its position in the
+    # packet for literals.
+    first = np.cumsum(count) - count
+    ramp = np.arange(rows * size, dtype=np.int64) - np.repeat(first, count)
+    indices = np.repeat(source, count) + ramp * np.repeat(literal, count)
+    return data[indices].reshape(rows, size)
+
+
+def unpredict(rows: Any, width: int, depth: int) -> Any:
+    """Undo the delta encoding of ZIP with prediction compressed rows.
+
+    Args:
+        rows: The ``(rows, bytes)`` decompressed rows, modified in place.
+        width: The number of pixels of each row.
+        depth: The number of bits per channel.
+
+    Returns:
+        numpy.ndarray: The ``(rows, bytes)`` big-endian samples.
+
+    """
+    np = numpy()
+    if depth == 8:
+        return np.cumsum(rows, axis=1, dtype=np.uint8)
+    if depth == 16:
+        samples = rows.view(">u2")
+        return np.cumsum(samples, axis=1, dtype=np.uint16).astype(">u2").view(np.uint8)
+    if depth == 32:
+        # The bytes of each float are split in 4 planes before the deltas.
+        planes = np.cumsum(rows, axis=1, dtype=np.uint8).reshape(len(rows), 4, width)
+        return np.ascontiguousarray(planes.transpose(0, 2, 1)).reshape(len(rows), 4 * width)
+    raise PSDError(f"Unsupported bit depth {depth} for ZIP with prediction.")
+
+
+def _to_pixels(planar: Any, width: int, depth: int) -> Any:
+    np = numpy()
+    channels, height = planar.shape[:2]
+    if depth == 1:
+        # Bitmap pixels are 1 for black.
+        bits = np.unpackbits(planar, axis=2)[..., :width]
+        planar = ((1 - bits) * 255).astype(np.uint8)
+    else:
+        dtype = {8: np.dtype("u1"), 16: np.dtype(">u2"), 32: np.dtype(">f4")}[depth]
+        planar = planar.view(dtype).reshape(channels, height, width)
+        planar = planar.astype(dtype.newbyteorder("="))
+    return np.ascontiguousarray(planar.transpose(1, 2, 0))
+
+
+def read_image_data(
+    buffer: Any,
+    offset: int,
+    width: int,
+    height: int,
+    channels: int,
+    depth: int,
+    version: int = 1,
+    count: Optional[int] = None,
+) -> Any:
+    """Decode the composite image data section.
+
+    Args:
+        buffer: The file content, e.g. a memory map.
+        offset: The offset of the section.
+        width: The width of the image in pixels.
+        height: The height of the image in pixels.
+        channels: The number of channels stored.
+        depth: The number of bits per channel: 1, 8, 16 or 32.
+        version: 2 for PSB files, whose RLE row sizes use 4 bytes.
+        count: Optional, only decodes this many leading channels.
+
+    Returns:
+        numpy.ndarray: The ``(height, width, channels)`` pixels, in native
+            byte order.
+
+    Raises:
+        PSDError: If the data is invalid or its compression not supported.
+
+    """
+    np = numpy()
+    if depth not in (1, 8, 16, 32):
+        raise PSDError(f"Unsupported bit depth {depth}.")
+    count = channels if count is None else min(count, channels)
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    if offset + 2 > len(data):
+        raise PSDError("The file has no image data.")
+    compression = int(data[offset]) << 8 | int(data[offset + 1])
+    size = row_size(width, depth)
+    rows = count * height
+    start = offset + 2
+    planar = np.empty((rows, size), dtype=np.uint8)
+    if compression == RAW:
+        stop = start + rows * size
+        if stop > len(data):
+            raise PSDError("The image data is truncated.")
+        planar[:] = data[start:stop].reshape(rows, size)
+    elif compression == RLE:
+        if start + channels * height * (4 if version == 2 else 2) > len(data):
+            raise PSDError("The image data is truncated.")
+        table = np.frombuffer(buffer, dtype=">u4" if version == 2 else ">u2", count=channels * height, offset=start)
+        sizes = table.astype(np.int64)
+        ends = start + table.nbytes + np.cumsum(sizes)
+        starts = ends - sizes
+        block = max(1, BLOCK_BYTES // max(size, 1))
+        for first in range(0, rows, block):
+            last = min(first + block, rows)
+            planar[first:last] = decode_packbits(data, starts[first:last], ends[first:last], size)
+    elif compression in (ZIP, ZIP_PREDICTION):
+        decompressed = zlib.decompressobj().decompress(data[start:], rows * size)
+        if len(decompressed) < rows * size:
+            raise PSDError("The image data is truncated.")
+        planar[:] = np.frombuffer(decompressed, dtype=np.uint8).reshape(rows, size)
+        if compression == ZIP_PREDICTION:
+            planar = unpredict(planar, width, depth)
+    else:
+        raise PSDError(f"Unsupported compression {compression}.")
+    return _to_pixels(planar.reshape(count, height, size), width, depth)
@@ -0,0 +1,422 @@
+"""Parse the layer records of PSD files.
+
+Layers are stored from the bottom of the layers panel to the top, with groups
+delimited by a hidden divider record below their children. Each record holds
+the bounds, blending and channel lengths of a layer, followed by tagged
+blocks holding everything else, e.g. the unicode name, the ID or the text.
+Only the offsets of the tagged blocks are indexed, and only the few blocks
+needed for the layer properties are decoded.
+
+"""
+
+# Import built-in modules
+from dataclasses import dataclass
+from dataclasses import field
+import math
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+
+# Import local modules
+from photoshop.psd import engine_data
+from photoshop.psd._binary import Reader
+from photoshop.psd.descriptor import read_versioned_descriptor
+from photoshop.psd.engine_data import TextRun
+from photoshop.psd.errors import PSDError
+
+
+# The Action Manager string ID of each blend mode key.
+BLEND_MODES = {
+    "pass": "passThrough",
+    "norm": "normal",
+    "diss": "dissolve",
+    "dark": "darken",
+    "mul ": "multiply",
+    "idiv": "colorBurn",
+    "lbrn": "linearBurn",
+    "dkCl": "darkerColor",
+    "lite": "lighten",
+    "scrn": "screen",
+    "div ": "colorDodge",
+    "lddg": "linearDodge",
+    "lgCl": "lighterColor",
+    "over": "overlay",
+    "sLit": "softLight",
+    "hLit": "hardLight",
+    "vLit": "vividLight",
+    "lLit": "linearLight",
+    "pLit": "pinLight",
+    "hMix": "hardMix",
+    "diff": "difference",
+    "smud": "exclusion",
+    "fsub": "subtract",
+    "fdiv": "divide",
+    "hue ": "hue",
+    "sat ": "saturation",
+    "colr": "color",
+    "lum ": "luminosity",
+}
+
+# The values of the Action Manager ``layerKind`` property.
+PIXEL_KIND = 1
+ADJUSTMENT_KIND = 2
+TEXT_KIND = 3
+VECTOR_KIND = 4
+SMART_OBJECT_KIND = 5
+GROUP_KIND = 7
+GRADIENT_FILL_KIND = 9
+PATTERN_FILL_KIND = 10
+SOLID_COLOR_KIND = 11
+BACKGROUND_KIND = 12
+
+# The tagged blocks of adjustment layers.
+ADJUSTMENT_KEYS = (
+    "blnc",
+    "blwh",
+    "brit",
+    "CgEd",
+    "clrL",
+    "curv",
+    "expA",
+    "grdm",
+    "hue ",
+    "hue2",
+    "levl",
+    "mixr",
+    "nvrt",
+    "phfl",
+    "post",
+    "selc",
+    "thrs",
+    "vibA",
+)
+
+# The tagged blocks of fill layers.
+FILL_KINDS = {"SoCo": SOLID_COLOR_KIND, "GdFl": GRADIENT_FILL_KIND, "PtFl": PATTERN_FILL_KIND}
+
+# The tagged blocks of smart objects.
+SMART_OBJECT_KEYS = ("SoLd", "SoLE", "PlLd")
+
+# The tagged blocks whose length is stored on 8 bytes in PSB files.
+LARGE_KEYS = frozenset(
+    ("LMsk", "Lr16", "Lr32", "Layr", "Mt16", "Mt32", "Mtrn", "Alph", "FMsk", "lnk2", "FEid", "FXid", "PxSD")
+)
+
+# The signatures of tagged blocks.
+BLOCK_SIGNATURES = ("8BIM", "8B64")
+
+# The section types of the ``lsct`` blocks.
+OPEN_FOLDER = 1
+CLOSED_FOLDER = 2
+SECTION_DIVIDER = 3
+
+# The ID of the channel holding the transparency of a layer.
+TRANSPARENCY_CHANNEL = -1
+
+
+class Channel(NamedTuple):
+    """The location of the pixels of a layer channel.
+
+    Attributes:
+        id: 0, 1, 2... for the color channels, -1 for the transparency, -2
+            and -3 for the masks.
+        offset: The position of the compression type, followed by the pixels.
+        size: The size in bytes, compression type included.
+
+    """
+
+    id: int
+    offset: int
+    size: int
+
+
+@dataclass
+class Layer:
+    """A layer read from a PSD file.
+
+    The properties mirror the records of `Document.snapshot`, see
+    `to_record`.
+
+    Attributes:
+        id: The layer ID.
+        name: The name of the layer.
+        index: The Action Manager index of the layer.
+        parent: The ID of the group containing the layer, or ``None``.
+        kind: The Action Manager ``layerKind`` of the layer.
+        bounds: The ``(left, top, right, bottom)`` bounds in pixels. The
+            bounds of groups are the union of their children.
+        visible: True if the layer is visible.
+        opacity: The opacity, from 0 to 100.
+        blend_mode: The Action Manager string ID of the blend mode.
+        clipped: True if the layer is clipped to the layer below.
+        section: The ``lsct`` section type, 1 or 2 for groups.
+        text: The contents of text layers.
+        text_runs: The runs of characters of text layers sharing a style,
+            with their font, size and color.
+        artboard: The ``(left, top, right, bottom)`` rectangle of artboards.
+        smart_object: The unique ID of the placed content of smart objects.
+        channels: The location of the pixels of each channel.
+        blocks: The ``(offset, size)`` of the data of each tagged block.
+
+    """
+
+    id: Optional[int]
+    name: str
+    index: int = 0
+    parent: Optional[int] = None
+    kind: int = PIXEL_KIND
+    bounds: Tuple[int, int, int, int] = (0, 0, 0, 0)
+    visible: bool = True
+    opacity: int = 100
+    blend_mode: str = "normal"
+    clipped: bool = False
+    section: int = 0
+    text: Optional[str] = None
+    text_runs: List[TextRun] = field(default_factory=list)
+    artboard: Optional[Tuple[float, float, float, float]] = None
+    smart_object: Optional[str] = None
+    channels: List[Channel] = field(default_factory=list)
+    blocks: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+
+    @property
+    def group(self) -> bool:
+        """bool: True for groups."""
+        return self.section in (OPEN_FOLDER, CLOSED_FOLDER)
+
+    @property
+    def fonts(self) -> List[str]:
+        """list: The PostScript names of the fonts used by text layers, in order of first use."""
+        names: List[str] = []
+        for run in self.text_runs:
+            if run.font and run.font != engine_data.INVISIBLE_FONT and run.font not in names:
+                names.append(run.font)
+        return names
+
+    def to_record(self) -> Dict[str, Any]:
+        """dict: The layer as a `Document.snapshot` record."""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "index": self.index,
+            "parent": self.parent,
+            "group": self.group,
+            "layerKind": self.kind,
+            "bounds": list(self.bounds),
+            "visible": self.visible,
+            "opacity": self.opacity,
+            "blendMode": self.blend_mode,
+            "text": self.text,
+            "artboard": self.artboard is not None,
+        }
+
+
+def read_tagged_blocks(reader: Reader, end: int, padding: int = 1) -> Dict[str, Tuple[int, int]]:
+    """Index the tagged blocks up to an offset.
+
+    Args:
+        reader: A reader at the first block.
+        end: The offset where the blocks end.
+        padding: The alignment of the blocks.
+
+    Returns:
+        dict: The ``(offset, size)`` of the data of each block, by key.
+
+    """
+    blocks = {}
+    while reader.offset + 12 <= end:
+        signature = reader.key()
+        if signature not in BLOCK_SIGNATURES:
+            break
+        key = reader.key()
+        size = reader.length(key in LARGE_KEYS)
+        blocks[key] = (reader.offset, size)
+        reader.skip(size + -size % padding)
+    reader.offset = end
+    return blocks
+
+
+def _block_reader(reader: Reader, blocks: Dict[str, Tuple[int, int]], key: str) -> Reader:
+    return Reader(reader.data, blocks[key][0], reader.version)
+
+
+def _read_text(reader: Reader) -> Tuple[Optional[str], List[TextRun]]:
+    reader.skip(2)  # The version.
+    _, xy, _, yy, _, _ = reader.unpack("dddddd")
+    reader.skip(2)  # The text version.
+    descriptor = read_versioned_descriptor(reader)
+    runs = []
+    if isinstance(descriptor.get("EngineData"), bytes):
+        try:
+            runs = engine_data.text_runs(engine_data.parse(descriptor["EngineData"]), math.hypot(xy, yy))
+        except PSDError:
+            # The text itself is still readable.
+            pass
+    return descriptor.get("Txt "), runs
+
+
+def _read_artboard(reader: Reader) -> Optional[Tuple[float, float, float, float]]:
+    rect = read_versioned_descriptor(reader).get("artboardRect") or {}
+    if not rect:
+        return None
+    return (rect.get("Left", 0.0), rect.get("Top ", 0.0), rect.get("Rght", 0.0), rect.get("Btom", 0.0))
+
+
+def _read_smart_object(reader: Reader) -> Optional[str]:
+    # The ``soLD`` type and its version precede the descriptor.
+    reader.skip(8)
+    return read_versioned_descriptor(reader).get("Idnt")
+
+
+def _decode_blocks(layer: Layer, reader: Reader):
+    blocks = layer.blocks
+    if "luni" in blocks:
+        layer.name = _block_reader(reader, blocks, "luni").unicode_string()
+    if "lyid" in blocks:
+        layer.id = _block_reader(reader, blocks, "lyid").u32()
+    for key in ("lsct", "lsdk"):
+        if key in blocks:
+            section = _block_reader(reader, blocks, key)
+            layer.section = section.u32()
+            if blocks[key][1] >= 12:
+                section.skip(4)
+                layer.blend_mode = BLEND_MODES.get(section.key(), layer.blend_mode)
+            break
+    for key in ("artb", "artd", "abdd"):
+        if key in blocks:
+            layer.artboard = _read_artboard(_block_reader(reader, blocks, key))
+            break
+    if "TySh" in blocks:
+        layer.text, layer.text_runs = _read_text(_block_reader(reader, blocks, "TySh"))
+    for key in ("SoLd", "SoLE"):
+        if key in blocks:
+            layer.smart_object = _read_smart_object(_block_reader(reader, blocks, key))
+            break
+
+
+def _layer_kind(layer: Layer) -> int:
+    blocks = layer.blocks
+    if layer.group:
+        return GROUP_KIND
+    if "TySh" in blocks:
+        return TEXT_KIND
+    if any(key in blocks for key in SMART_OBJECT_KEYS):
+        return SMART_OBJECT_KIND
+    if any(key in blocks for key in ADJUSTMENT_KEYS):
+        return ADJUSTMENT_KIND
+    for key, kind in FILL_KINDS.items():
+        if key in blocks:
+            return VECTOR_KIND if "vmsk" in blocks or "vsms" in blocks else kind
+    if "vscg" in blocks:
+        return VECTOR_KIND
+    return PIXEL_KIND
+
+
+def read_layer_record(reader: Reader) -> Layer:
+    """Read a layer record, decoding the blocks of the layer properties.
+
+    The channel offsets are left to 0, they are only known once every record
+    is read, see `read_layer_info`.
+
+    """
+    top, left, bottom, right = reader.unpack("iiii")
+    channels = []
+    for _ in range(reader.u16()):
+        channel_id = reader.i16()
+        channels.append(Channel(channel_id, 0, reader.length()))
+    if reader.key() not in BLOCK_SIGNATURES:
+        raise PSDError(f"Invalid blend mode signature at offset {reader.offset - 4}.")
+    blend_key = reader.key()
+    opacity, clipping, flags, _ = reader.unpack("BBBB")
+    end = reader.u32()
+    end += reader.offset
+    reader.skip(reader.u32())  # The layer mask.
+    reader.skip(reader.u32())  # The blending ranges.
+    name = reader.pascal_string(4)
+    layer = Layer(
+        id=None,
+        name=name,
+        bounds=(left, top, right, bottom),
+        visible=not flags & 0x02,
+        opacity=int(opacity / 2.55 + 0.5),
+        blend_mode=BLEND_MODES.get(blend_key, blend_key),
+        clipped=clipping == 1,
+        channels=channels,
+        blocks=read_tagged_blocks(reader, end),
+    )
+    _decode_blocks(layer, reader)
+    layer.kind = _layer_kind(layer)
+    return layer
+
+
+def read_layer_info(reader: Reader) -> List[Layer]:
+    """Read the layer info structure.
+
+    Args:
+        reader: A reader at the layer count, after the length of the layer
+            info.
+
+    Returns:
+        list: The layers from the top of the layers panel to the bottom, see
+            `arrange`.
+
+    """
+    records = [read_layer_record(reader) for _ in range(abs(reader.i16()))]
+    for record in records:
+        channels = []
+        for channel in record.channels:
+            channels.append(Channel(channel.id, reader.offset, channel.size))
+            reader.skip(channel.size)
+        record.channels = channels
+    return arrange(records)
+
+
+def _is_background(layer: Layer) -> bool:
+    # Only the background layer has no transparency channel.
+    if layer.kind != PIXEL_KIND or layer.section:
+        return False
+    return all(channel.id != TRANSPARENCY_CHANNEL for channel in layer.channels)
+
+
+def arrange(records: List[Layer]) -> List[Layer]:
+    """Order the layer records like the layers panel.
+
+    Sets the Action Manager index and the parent of each layer, the bounds
+    of the groups, and drops the group dividers.
+
+    Args:
+        records: The layer records, from the bottom to the top as stored.
+
+    Returns:
+        list: The layers from the top to the bottom.
+
+    """
+    background = bool(records) and _is_background(records[0])
+    if background:
+        records[0].kind = BACKGROUND_KIND
+    layers = []
+    groups: List[Layer] = []
+    for position in range(len(records) - 1, -1, -1):
+        layer = records[position]
+        layer.index = position if background else position + 1
+        if layer.section == SECTION_DIVIDER:
+            if groups:
+                groups.pop()
+            continue
+        layer.parent = groups[-1].id if groups else None
+        layers.append(layer)
+        if layer.group:
+            layer.bounds = (0, 0, 0, 0)
+            groups.append(layer)
+        elif layer.bounds[2] > layer.bounds[0] and layer.bounds[3] > layer.bounds[1]:
+            for group in groups:
+                group.bounds = _union(group.bounds, layer.bounds)
+    return layers
+
+
+def _union(a: Tuple[int, int, int, int], b: Tuple[int, int, int, int]) -> Tuple[int, int, int, int]:
+    if a[2] <= a[0] or a[3] <= a[1]:
+        return b
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
@@ -0,0 +1,123 @@
+"""Read the files linked by smart objects.
+
+The content placed in smart objects is stored in global tagged blocks, one
+entry per unique content: embedded files in ``lnk2``, ``lnkD`` and
+``lnk3``, and the references to files on disk in ``lnkE``. Layers point to
+an entry by its unique ID, see `Layer.smart_object`.
+
+"""
+
+# Import built-in modules
+import os
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+# Import local modules
+from photoshop.psd._binary import Reader
+from photoshop.psd.descriptor import read_versioned_descriptor
+
+
+# The global tagged blocks holding linked files.
+LINKED_FILE_KEYS = ("lnk2", "lnkD", "lnk3", "lnkE")
+
+# The kind of each linked file entry.
+EMBEDDED = "liFD"
+EXTERNAL = "liFE"
+ALIAS = "liFA"
+
+
+class LinkedFile(NamedTuple):
+    """A file placed in smart objects.
+
+    Attributes:
+        id: The unique ID of the placed content.
+        name: The original file name.
+        kind: `EMBEDDED` for files stored in the document, `EXTERNAL` for
+            files on disk and `ALIAS` for macOS aliases.
+        file_type: The 4 characters type of the file, e.g. ``png ``.
+        paths: The paths of external files as stored: the full path, the
+            original path and the path relative to the document.
+
+    """
+
+    id: str
+    name: str
+    kind: str
+    file_type: str
+    paths: Tuple[str, ...] = ()
+
+    @property
+    def external(self) -> bool:
+        """bool: True if the content is not stored in the document."""
+        return self.kind != EMBEDDED
+
+    def locate(self, document_path: str) -> Optional[str]:
+        """Find the linked file on disk.
+
+        `ALIAS` entries store no paths, they are never found.
+
+        Args:
+            document_path: The path of the document placing the file,
+                relative paths are resolved from its directory.
+
+        Returns:
+            str: The path of the file, or ``None`` if it cannot be found.
+
+        """
+        directory = os.path.dirname(os.path.abspath(document_path))
+        for path in self.paths:
+            if path.startswith("file://"):
+                path = url2pathname(urlparse(path).path)
+            path = os.path.join(directory, path)
+            if os.path.isfile(path):
+                return path
+        return None
+
+
+def _read_linked_file(reader: Reader) -> LinkedFile:
+    kind = reader.key()
+    reader.skip(4)  # The version.
+    unique_id = reader.pascal_string(1)
+    name = reader.unicode_string()
+    file_type = reader.key()
+    reader.skip(4)  # The creator.
+    reader.skip(8)  # The size of the data.
+    if reader.u8():
+        read_versioned_descriptor(reader)  # The open parameters.
+    paths: Tuple[str, ...] = ()
+    if kind == EXTERNAL:
+        descriptor = read_versioned_descriptor(reader)
+        values = (descriptor.get(key) for key in ("fullPath", "originalPath", "relPath"))
+        paths = tuple(value for value in values if isinstance(value, str) and value)
+    return LinkedFile(unique_id, name, kind, file_type, paths)
+
+
+def read_linked_files(reader: Reader, blocks: Dict[str, Tuple[int, int]]) -> List[LinkedFile]:
+    """Read the linked file entries of the global tagged blocks.
+
+    Args:
+        reader: A reader of the file.
+        blocks: The ``(offset, size)`` of the global tagged blocks.
+
+    Returns:
+        list: The entries, embedded files first.
+
+    """
+    linked_files = []
+    for key in LINKED_FILE_KEYS:
+        if key not in blocks:
+            continue
+        offset, size = blocks[key]
+        end = offset + size
+        entries = Reader(reader.data, offset, reader.version)
+        while entries.offset + 8 <= end:
+            length = entries.unpack("Q")[0]
+            start = entries.offset
+            linked_files.append(_read_linked_file(entries))
+            entries.offset = start + length + -length % 4
+    return linked_files
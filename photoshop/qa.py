@@ -0,0 +1,302 @@
+"""Compare exported images to catch render regressions.
+
+Run an export before and after a template or Photoshop update, then compare
+the two directories. The pixels are compared in blocks of rows with NumPy, so
+even very large images are never converted as a whole.
+
+```python
+
+from photoshop import qa
+
+comparisons = qa.compare_dirs("d:/out/before", "d:/out/after", tolerance=2, report="d:/out/report.json")
+for comparison in comparisons:
+    if not comparison.passed:
+        print(comparison.b, comparison.max_delta, comparison.bbox)
+
+```
+
+When both directories hold an export manifest, the outputs are paired by
+source layer ID, otherwise by relative file path. NumPy (``.npy``) files are
+memory mapped; other formats are decoded in memory with Pillow. Both are
+optional dependencies, installed with the ``qa`` extra:
+
+```
+
+pip install photoshop-python-api[qa]
+
+```
+
+"""
+
+# Import built-in modules
+from concurrent.futures import ProcessPoolExecutor
+import json
+import os
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+# Import local modules
+from photoshop import arrays
+from photoshop import manifest
+from photoshop.api.errors import PhotoshopPythonAPIError
+
+
+REPORT_VERSION = 1
+
+# The extensions of the files compared in directories without manifests.
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".tif", ".tiff", ".bmp", ".gif", ".tga", ".npy")
+
+# The number of rows compared at once.
+BLOCK_ROWS = 1024
+
+# Directories with fewer pairs than this are compared in the calling process.
+PARALLEL_THRESHOLD = 8
+
+
+class Comparison(NamedTuple):
+    """The difference between two images.
+
+    Attributes:
+        a: The path of the reference image.
+        b: The path of the compared image.
+        passed: True if no pixel differs by more than the tolerance.
+        max_delta: The largest difference of any channel of any pixel.
+        mean_delta: The mean difference over every channel of every pixel.
+        changed_pixels: The number of pixels differing by more than the
+            tolerance.
+        bbox: The ``(left, top, right, bottom)`` bounds of the changed
+            pixels, or ``None``.
+        error: Why the images could not be compared, e.g. a missing file or
+            a different size.
+
+    """
+
+    a: Optional[str]
+    b: Optional[str]
+    passed: bool
+    max_delta: float = 0.0
+    mean_delta: float = 0.0
+    changed_pixels: int = 0
+    bbox: Optional[arrays.Box] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        """dict: The comparison as JSON compatible values."""
+        values = self._asdict()
+        values["bbox"] = list(self.bbox) if self.bbox else None
+        return values
+
+
+def pillow():
+    """module: The ``Image`` module of Pillow, imported on first use."""
+    try:
+        # Import third-party modules
+        from PIL import Image
+    except ImportError:
+        raise ImportError("Pillow is required to read images, install it with `pip install photoshop-python-api[qa]`.")
+    return Image
+
+
+def load_image(path: str) -> Any:
+    """Load an image as an array.
+
+    Args:
+        path: A ``.npy`` file, memory mapped, or any image file Pillow can
+            decode, read in memory.
+
+    Returns:
+        numpy.ndarray: The ``(height, width, channels)`` pixels.
+
+    Raises:
+        ImportError: If Pillow is required but not installed.
+
+    """
+    np = arrays.numpy()
+    if path.lower().endswith(".npy"):
+        pixels = np.load(path, mmap_mode="r")
+    else:
+        with pillow().open(path) as image:
+            if image.mode in ("P", "PA"):
+                image = image.convert("RGBA")
+            pixels = np.asarray(image)
+    if pixels.ndim == 2:
+        pixels = pixels[..., np.newaxis]
+    return pixels
+
+
+def diff(a: Any, b: Any, tolerance: float = 0) -> Tuple[Dict[str, Any], Any]:
+    """Compare two arrays of pixels.
+
+    Args:
+        a: The reference ``(height, width, channels)`` pixels.
+        b: The compared pixels, of the same shape.
+        tolerance: The largest difference of a channel value that is not a
+            change, in the units of the pixels, e.g. 0 to 255 for 8 bits.
+
+    Returns:
+        tuple: The statistics (``max_delta``, ``mean_delta``,
+            ``changed_pixels`` and ``bbox``) and the ``(height, width)``
+            boolean mask of the changed pixels.
+
+    Raises:
+        PhotoshopPythonAPIError: If the shapes differ.
+
+    """
+    np = arrays.numpy()
+    if a.shape != b.shape:
+        raise PhotoshopPythonAPIError(f"The images have different shapes, {a.shape} and {b.shape}.")
+    height = a.shape[0]
+    mask = np.zeros(a.shape[:2], dtype=bool)
+    max_delta = 0.0
+    total = 0.0
+    for top in range(0, height, BLOCK_ROWS):
+        bottom = top + BLOCK_ROWS
+        delta = np.abs(a[top:bottom].astype(np.float64) - b[top:bottom].astype(np.float64))
+        if delta.size:
+            max_delta = max(max_delta, float(delta.max()))
+            total += float(delta.sum())
+            mask[top:bottom] = delta.max(axis=-1) > tolerance
+    rows = np.flatnonzero(mask.any(axis=1))
+    columns = np.flatnonzero(mask.any(axis=0))
+    bbox = None
+    if rows.size:
+        bbox = (int(columns[0]), int(rows[0]), int(columns[-1]) + 1, int(rows[-1]) + 1)
+    stats = {
+        "max_delta": max_delta,
+        "mean_delta": total / a.size if a.size else 0.0,
+        "changed_pixels": int(mask.sum()),
+        "bbox": bbox,
+    }
+    return stats, mask
+
+
+def compare(a: str, b: str, tolerance: float = 0) -> Comparison:
+    """Compare two image files.
+
+    Args:
+        a: The path of the reference image.
+        b: The path of the compared image.
+        tolerance: The largest difference of a channel value that is not a
+            change.
+
+    Returns:
+        Comparison: The difference, with an ``error`` if the files are
+            missing or have different sizes.
+
+    """
+    try:
+        stats, _ = diff(load_image(a), load_image(b), tolerance)
+    except (OSError, ValueError, PhotoshopPythonAPIError) as error:
+        return Comparison(a, b, False, error=str(error))
+    return Comparison(a, b, not stats["changed_pixels"], **stats)
+
+
+def _compare_pair(pair: Tuple[Optional[str], Optional[str], float]) -> Comparison:
+    a, b, tolerance = pair
+    if a is None or b is None:
+        return Comparison(a, b, False, error="The image has no counterpart.")
+    return compare(a, b, tolerance)
+
+
+def _image_files(root: str) -> Dict[str, str]:
+    files = {}
+    for directory, _, names in os.walk(root):
+        for name in names:
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                path = os.path.join(directory, name)
+                files[os.path.relpath(path, root).replace("\\", "/")] = path
+    return files
+
+
+def _manifest_files(out_dir: str) -> Dict[Any, str]:
+    return {entry["id"]: entry["path"] for entry in manifest.load(out_dir)["layers"] if entry.get("path")}
+
+
+def pair_files(a_dir: str, b_dir: str) -> List[Tuple[Optional[str], Optional[str]]]:
+    """Pair the images of two export directories.
+
+    Args:
+        a_dir: The directory of the reference images.
+        b_dir: The directory of the compared images.
+
+    Returns:
+        list: ``(a, b)`` path pairs, with ``None`` for images missing from
+            one of the directories. The images are paired by layer ID when
+            both directories hold a manifest, otherwise by relative path.
+
+    """
+    if os.path.isfile(manifest.manifest_path(a_dir)) and os.path.isfile(manifest.manifest_path(b_dir)):
+        a_files, b_files = _manifest_files(a_dir), _manifest_files(b_dir)
+    else:
+        a_files, b_files = _image_files(a_dir), _image_files(b_dir)
+    keys = list(a_files) + [key for key in b_files if key not in a_files]
+    return [(a_files.get(key), b_files.get(key)) for key in keys]
+
+
+def compare_dirs(
+    a_dir: str,
+    b_dir: str,
+    tolerance: float = 0,
+    report: Optional[str] = None,
+    workers: Optional[int] = None,
+) -> List[Comparison]:
+    """Compare every image of two export directories.
+
+    Large sets are compared by a process pool, one image pair per task.
+
+    Args:
+        a_dir: The directory of the reference images.
+        b_dir: The directory of the compared images.
+        tolerance: The largest difference of a channel value that is not a
+            change.
+        report: Optional, the path of a JSON report to write.
+        workers: Optional, the number of processes. ``1`` compares in the
+            calling process. Defaults to the number of processors.
+
+    Returns:
+        list: One comparison per image pair, see `pair_files`.
+
+    """
+    pairs = [(a, b, tolerance) for a, b in pair_files(a_dir, b_dir)]
+    if workers == 1 or len(pairs) < PARALLEL_THRESHOLD:
+        comparisons = [_compare_pair(pair) for pair in pairs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            comparisons = list(executor.map(_compare_pair, pairs))
+    if report:
+        write_report(report, comparisons, a=os.path.abspath(a_dir), b=os.path.abspath(b_dir), tolerance=tolerance)
+    return comparisons
+
+
+def write_report(path: str, comparisons: Sequence[Comparison], **settings) -> str:
+    """Write the comparisons of a run to a JSON report.
+
+    Args:
+        path: The path of the report.
+        comparisons: The comparisons to report.
+        **settings: Values stored alongside the comparisons, e.g. the
+            ``tolerance``.
+
+    Returns:
+        str: The absolute path of the report.
+
+    """
+    path = os.path.abspath(path)
+    failed = [comparison for comparison in comparisons if not comparison.passed]
+    content = {
+        "version": REPORT_VERSION,
+        **settings,
+        "passed": not failed,
+        "failed": len(failed),
+        "comparisons": [comparison.to_dict() for comparison in comparisons],
+    }
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file_obj:
+        json.dump(content, file_obj, indent=2, sort_keys=True)
+    os.replace(temp_path, path)
+    return path
@@ -0,0 +1,314 @@
+"""Run batches of export jobs that survive Photoshop hangs and crashes.
+
+Every completed output is appended to a journal file. When a batch is run
+again, for example after Photoshop crashed, the journaled outputs are skipped
+and only the remaining work is done.
+
+```python
+
+from photoshop.scheduler import Job
+from photoshop.scheduler import Scheduler
+
+jobs = [
+    Job("cover", "d:/psd/cover.psd", outputs=[("d:/out/cover.jpg", "jpg")], priority=10),
+    Job("back", "d:/psd/back.psd", outputs=[("d:/out/back.png", "png")], timeout=120),
+]
+for result in Scheduler("d:/out/journal.jsonl").run(jobs):
+    print(result.job_id, result.status)
+
+```
+
+"""
+
+# Import built-in modules
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from dataclasses import field
+import heapq
+import json
+from logging import getLogger
+import os
+import threading
+import time
+from typing import Any
+from typing import AsyncIterator
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Set
+from typing import Tuple
+
+# Import local modules
+from photoshop.streaming import iterate_in_thread
+
+
+# The journal step recorded once every output of a job is saved.
+DONE = "done"
+
+logger = getLogger("photoshop")
+
+
+@dataclass
+class Job:
+    """A document to open, process and save to one or more outputs.
+
+    Attributes:
+        id: The unique ID of the job, used as key in the journal.
+        input: The path of the document to open.
+        outputs: The ``(path, options)`` pairs to save. The options are a
+            save options object, a callable returning one, a save options
+            spec, or a file format such as ``png`` understood by the backend.
+            Specs and formats are picklable and cost no COM calls until the
+            output is saved.
+        operations: Callables receiving the opened document, applied in
+            order before saving.
+        priority: Jobs with a higher priority run first.
+        timeout: Optional, the maximum number of seconds for one attempt.
+        retries: Optional, overrides the retries of the scheduler.
+
+    """
+
+    id: str
+    input: str
+    outputs: Sequence[Tuple[str, Any]]
+    operations: Sequence[Callable[[Any], Any]] = ()
+    priority: int = 0
+    timeout: Optional[float] = None
+    retries: Optional[int] = None
+
+
+@dataclass
+class JobResult:
+    """The outcome of a job: ``done``, ``skipped`` or ``failed``."""
+
+    job_id: str
+    status: str
+    attempts: int = 0
+    outputs: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+class Journal:
+    """Append-only log of the completed steps of each job."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def completed(self) -> Dict[str, Set[str]]:
+        """dict: The completed steps keyed by job ID."""
+        steps: Dict[str, Set[str]] = {}
+        if not os.path.isfile(self.path):
+            return steps
+        with open(self.path, encoding="utf-8") as file_obj:
+            for line in file_obj:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # The last line is truncated if the process died while writing it.
+                    continue
+                if record.get("status") == "ok":
+                    steps.setdefault(record["job"], set()).add(record["step"])
+        return steps
+
+    def record(self, job_id: str, step: str, status: str = "ok", error: Optional[str] = None):
+        """Append a step to the journal and flush it to disk."""
+        record = {"job": job_id, "step": step, "status": status, "time": time.time()}
+        if error:
+            record["error"] = error
+        with self._lock, open(self.path, "a", encoding="utf-8") as file_obj:
+            file_obj.write(json.dumps(record) + "\n")
+            file_obj.flush()
+            os.fsync(file_obj.fileno())
+
+
+class PhotoshopBackend:
+    """Runs the jobs through `Application.open` and `Document.saveAs`.
+
+    Each worker thread gets its own COM apartment and its own connection to
+    Photoshop. After a failure the connections are dropped, so the next
+    attempt reconnects to, or relaunches, Photoshop.
+
+    """
+
+    def __init__(self, ps_version: Optional[str] = None):
+        self._ps_version = ps_version
+        self._apps: Dict[int, Any] = {}
+
+    @property
+    def app(self):
+        """Application: The connection to Photoshop of the current thread."""
+        thread_id = threading.get_ident()
+        if thread_id not in self._apps:
+            # Import third-party modules
+            import comtypes
+
+            # Import local modules
+            from photoshop.api import Application
+
+            comtypes.CoInitialize()
+            self._apps[thread_id] = Application(version=self._ps_version)
+        return self._apps[thread_id]
+
+    def open(self, path: str):
+        return self.app.open(path)
+
+    def save(self, document, path: str, options: Any):
+        # Import local modules
+        from photoshop.api import _export
+        from photoshop.api._core import Photoshop
+        from photoshop.api.save_options import SaveOptionsSpec
+
+        if isinstance(options, (str, SaveOptionsSpec)):
+            _export.save_copy(document, path, options)
+            return
+        if callable(options) and not isinstance(options, Photoshop):
+            options = options()
+        document.saveAs(path, options, True)
+
+    def close(self, document):
+        document.close()
+
+    def reset(self):
+        self._apps.clear()
+
+
+class Scheduler:
+    """Runs jobs by priority, with retries, timeouts and a resumable journal.
+
+    Args:
+        journal: The path of the journal file.
+        backend: The object opening, saving and closing documents.
+            Defaults to a `PhotoshopBackend`.
+        retries: The number of retries of a failed job.
+        backoff: The delay in seconds before the first retry, doubled for
+            each following retry.
+        max_backoff: The maximum delay between two retries.
+        sleep: The function used to wait between retries.
+
+    """
+
+    def __init__(
+        self,
+        journal: str,
+        backend: Any = None,
+        retries: int = 3,
+        backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        sleep: Callable[[float], Any] = time.sleep,
+    ):
+        self.journal = Journal(journal)
+        self.backend = backend or PhotoshopBackend()
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._sleep = sleep
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def run(self, jobs: Iterable[Job]) -> List[JobResult]:
+        """Run the jobs and return their results once all are finished."""
+        return list(self.iter_run(jobs))
+
+    def iter_run(self, jobs: Iterable[Job]) -> Iterator[JobResult]:
+        """Run the jobs, yielding the result of each job as soon as it finishes."""
+        queue = [(-job.priority, order, job) for order, job in enumerate(jobs)]
+        heapq.heapify(queue)
+        completed = self.journal.completed()
+        try:
+            while queue:
+                _, _, job = heapq.heappop(queue)
+                yield self._run_job(job, completed.get(job.id, set()))
+        finally:
+            if self._executor:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    def aiter_run(self, jobs: Iterable[Job]) -> AsyncIterator[JobResult]:
+        """Async iterator version of `iter_run`, running the jobs in a dedicated thread."""
+        return iterate_in_thread(lambda: self.iter_run(jobs))
+
+    def delay(self, attempt: int) -> float:
+        """float: The number of seconds to wait before the given retry."""
+        return min(self.backoff * 2 ** (attempt - 1), self.max_backoff)
+
+    def _run_job(self, job: Job, steps: Set[str]) -> JobResult:
+        if DONE in steps:
+            return JobResult(job.id, "skipped")
+        retries = self.retries if job.retries is None else job.retries
+        result = JobResult(job.id, "done")
+        while True:
+            result.attempts += 1
+            # Each attempt saves into its own list. A timed out attempt keeps
+            # running in its abandoned thread, the lock and the event stop it
+            # from journaling outputs once it was given up.
+            saved: List[str] = []
+            cancelled = threading.Event()
+            lock = threading.Lock()
+            try:
+                self._call(self._attempt, job, set(steps), saved, cancelled, lock, timeout=job.timeout)
+            except Exception as err:  # pylint: disable=broad-except
+                with lock:
+                    cancelled.set()
+                    self._merge(steps, result, saved)
+                result.error = f"{type(err).__name__}: {err}"
+                self.journal.record(job.id, f"attempt:{result.attempts}", "failed", result.error)
+                self.backend.reset()
+                if result.attempts > retries:
+                    result.status = "failed"
+                    return result
+                self._sleep(self.delay(result.attempts))
+                continue
+            self._merge(steps, result, saved)
+            self.journal.record(job.id, DONE)
+            result.error = None
+            return result
+
+    @staticmethod
+    def _merge(steps: Set[str], result: JobResult, saved: List[str]):
+        for path in saved:
+            steps.add(f"output:{path}")
+            result.outputs.append(path)
+
+    def _attempt(self, job: Job, steps: Set[str], saved: List[str], cancelled: threading.Event, lock: threading.Lock):
+        pending = [(path, options) for path, options in job.outputs if f"output:{path}" not in steps]
+        if not pending:
+            return
+        document = self.backend.open(job.input)
+        try:
+            for operation in job.operations:
+                operation(document)
+            for path, options in pending:
+                if cancelled.is_set():
+                    return
+                self.backend.save(document, path, options)
+                with lock:
+                    if cancelled.is_set():
+                        return
+                    self.journal.record(job.id, f"output:{path}")
+                    saved.append(path)
+        finally:
+            try:
+                self.backend.close(document)
+            except Exception as err:  # pylint: disable=broad-except
+                # Keep the error of the attempt, if any.
+                logger.warning("Failed to close %s: %s", job.input, err)
+
+    def _call(self, func: Callable, *args, timeout: Optional[float] = None):
+        if timeout is None:
+            return func(*args)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="photoshop-job")
+        future = self._executor.submit(func, *args)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            # The hung call cannot be interrupted, give up its thread and
+            # continue on a fresh one.
+            self._executor.shutdown(wait=False)
+            self._executor = None
+            raise TimeoutError(f"Job did not finish within {timeout} seconds.")
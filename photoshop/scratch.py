@@ -0,0 +1,149 @@
+"""Scratch files for exports that are read back into memory.
+
+Photoshop can only save to files, so in-memory exports save to a scratch file
+and read it back. The scratch directory is on a tmpfs (``/dev/shm``) when the
+system has one, otherwise in the temporary directory, and can be forced with
+the ``PS_SCRATCH_DIR`` environment variable. Scratch files are recycled
+between exports instead of being created and deleted every time, and are
+truncated once read so a tmpfs does not keep their content in memory.
+
+"""
+
+# Import built-in modules
+import atexit
+from contextlib import contextmanager
+import mmap
+import os
+import shutil
+import tempfile
+import threading
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+
+# Import local modules
+from photoshop.api.errors import PhotoshopPythonAPIError
+
+
+# The environment variable overriding the scratch directory.
+SCRATCH_DIR_ENV = "PS_SCRATCH_DIR"
+
+# The tmpfs mount used when available.
+SHARED_MEMORY_DIR = "/dev/shm"
+
+# The default size of the chunks yielded by `iter_file`.
+CHUNK_SIZE = 1 << 20
+
+
+def scratch_root() -> str:
+    """str: The directory holding the scratch files of this process."""
+    root = os.environ.get(SCRATCH_DIR_ENV)
+    if not root:
+        shm_usable = os.path.isdir(SHARED_MEMORY_DIR) and os.access(SHARED_MEMORY_DIR, os.W_OK)
+        root = SHARED_MEMORY_DIR if shm_usable else tempfile.gettempdir()
+    return os.path.join(os.path.abspath(root), f"photoshop-python-api-{os.getpid()}")
+
+
+class ScratchFiles:
+    """Recycled scratch files, one free list per file extension.
+
+    Args:
+        root: Optional, the directory of the scratch files. Defaults to
+            `scratch_root`.
+
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self._root = root
+        self._free: Dict[str, List[str]] = {}
+        self._count = 0
+        self._lock = threading.Lock()
+
+    @property
+    def root(self) -> str:
+        """str: The directory of the scratch files, created on first use."""
+        if self._root is None:
+            self._root = scratch_root()
+        os.makedirs(self._root, exist_ok=True)
+        return self._root
+
+    @contextmanager
+    def path(self, extension: str) -> Iterator[str]:
+        """Borrow a scratch file path for the duration of a ``with`` block.
+
+        The file is truncated when it is given back, so a failed save never
+        returns the content of a previous export.
+
+        Args:
+            extension: The extension of the file, e.g. ``png``.
+
+        Yields:
+            str: The absolute path of the scratch file.
+
+        """
+        with self._lock:
+            free = self._free.setdefault(extension, [])
+            if free:
+                path = free.pop()
+            else:
+                self._count += 1
+                path = os.path.join(self.root, f"scratch_{self._count}.{extension}")
+        try:
+            yield path
+        finally:
+            if os.path.isfile(path):
+                os.truncate(path, 0)
+            with self._lock:
+                free.append(path)
+
+    def clear(self):
+        """Delete every scratch file."""
+        with self._lock:
+            self._free.clear()
+            if self._root is not None:
+                shutil.rmtree(self._root, ignore_errors=True)
+
+
+def remove_quietly(path: str):
+    """Remove a file, ignoring errors such as a file still mapped on Windows.
+
+    Leftovers are deleted with the scratch directory when the process exits.
+
+    """
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def read_file(path: str) -> bytes:
+    """Read a whole file with a single copy out of a memory map.
+
+    Raises:
+        PhotoshopPythonAPIError: If the file is missing or empty, i.e.
+            nothing was saved to it.
+
+    """
+    if not os.path.isfile(path) or not os.path.getsize(path):
+        raise PhotoshopPythonAPIError(f"Nothing was saved to {path}.")
+    with open(path, "rb") as file_obj, mmap.mmap(file_obj.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        return mapped[:]
+
+
+def iter_file(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Read a file in chunks, so large files never sit in memory at once.
+
+    Raises:
+        PhotoshopPythonAPIError: If the file is missing or empty.
+
+    """
+    if not os.path.isfile(path) or not os.path.getsize(path):
+        raise PhotoshopPythonAPIError(f"Nothing was saved to {path}.")
+    with open(path, "rb") as file_obj:
+        yield from iter(lambda: file_obj.read(chunk_size), b"")
+
+
+# The scratch files shared by this package.
+scratch_files = ScratchFiles()
+atexit.register(scratch_files.clear)
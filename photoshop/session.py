@@ -35,26 +35,37 @@ from photoshop.api import ActionList
 from photoshop.api import ActionReference
 from photoshop.api import Application
 from photoshop.api import BMPSaveOptions
+from photoshop.api import BMPSaveSpec
 from photoshop.api import BatchOptions
 from photoshop.api import CMYKColor
 from photoshop.api import EPSSaveOptions
+from photoshop.api import EPSSaveSpec
 from photoshop.api import EventID
 from photoshop.api import ExportOptionsSaveForWeb
 from photoshop.api import GIFSaveOptions
+from photoshop.api import GIFSaveSpec
 from photoshop.api import GrayColor
 from photoshop.api import HSBColor
 from photoshop.api import JPEGSaveOptions
+from photoshop.api import JPEGSaveSpec
 from photoshop.api import LabColor
 from photoshop.api import PDFSaveOptions
+from photoshop.api import PDFSaveSpec
 from photoshop.api import PNGSaveOptions
+from photoshop.api import PNGSaveSpec
 from photoshop.api import PhotoshopSaveOptions
+from photoshop.api import PhotoshopSaveSpec
 from photoshop.api import RGBColor
+from photoshop.api import SaveForWebSpec
 from photoshop.api import SolidColor
 from photoshop.api import TargaSaveOptions
+from photoshop.api import TargaSaveSpec
 from photoshop.api import TextItem
 from photoshop.api import TiffSaveOptions
+from photoshop.api import TiffSaveSpec
 from photoshop.api import enumerations
 from photoshop.api import errors
+from photoshop.api import save_options_pool
 
 
 # pylint: disable=too-many-arguments
@@ -142,6 +153,19 @@ class Session:
         self.BMPSaveOptions = BMPSaveOptions
         self.TiffSaveOptions = TiffSaveOptions
         self.TargaSaveOptions = TargaSaveOptions
+        self.save_options_pool = save_options_pool
+
+        # The save options specs.
+        self.BMPSaveSpec = BMPSaveSpec
+        self.EPSSaveSpec = EPSSaveSpec
+        self.GIFSaveSpec = GIFSaveSpec
+        self.JPEGSaveSpec = JPEGSaveSpec
+        self.PDFSaveSpec = PDFSaveSpec
+        self.PNGSaveSpec = PNGSaveSpec
+        self.PhotoshopSaveSpec = PhotoshopSaveSpec
+        self.SaveForWebSpec = SaveForWebSpec
+        self.TargaSaveSpec = TargaSaveSpec
+        self.TiffSaveSpec = TiffSaveSpec
 
         # The colors.
         self.LabColor = LabColor
@@ -0,0 +1,131 @@
+"""Stream the results of long batches as they complete.
+
+The batch entry points of this package are generators yielding one record per
+finished output, so downstream work can start right away and a large batch
+never holds all of its results in memory. `iterate_in_thread` turns any of
+those generators into an async iterator for asyncio based services.
+
+"""
+
+# Import built-in modules
+import asyncio
+import os
+import queue
+import threading
+import time
+from typing import AsyncIterator
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import NamedTuple
+from typing import Optional
+from typing import TypeVar
+
+
+T = TypeVar("T")
+
+# Marks the end of the items produced by a thread.
+_END = object()
+
+# The number of seconds a producer thread waits for room in a full buffer
+# before checking again whether the consumer stopped.
+POLL_INTERVAL = 0.1
+
+
+class ExportResult(NamedTuple):
+    """A finished output of a batch.
+
+    Attributes:
+        path: The absolute path of the output file.
+        size: The size of the output file in bytes.
+        duration: The number of seconds spent producing the output.
+        layer_id: The ID of the source layer or artboard, if any.
+
+    """
+
+    path: str
+    size: int
+    duration: float
+    layer_id: Optional[int] = None
+
+
+def export_results(entries: Iterable[dict], started: float) -> Iterator[ExportResult]:
+    """Convert the manifest entries of one batch into export results.
+
+    The time spent since ``started`` is shared evenly between the outputs.
+
+    Args:
+        entries: The manifest entries returned by an exporter.
+        started: The `time.perf_counter` value taken before the export.
+
+    Yields:
+        ExportResult: One result per exported file.
+
+    """
+    entries = [entry for entry in entries if entry.get("path")]
+    duration = (time.perf_counter() - started) / max(len(entries), 1)
+    for entry in entries:
+        yield ExportResult(entry["path"], os.path.getsize(entry["path"]), duration, entry.get("id"))
+
+
+async def iterate_in_thread(factory: Callable[[], Iterable[T]], maxsize: int = 16) -> AsyncIterator[T]:
+    """Iterate a blocking generator from asyncio without blocking the event loop.
+
+    The generator is created and consumed by a dedicated thread, so it may
+    open its own connection to Photoshop. At most ``maxsize`` items wait in
+    memory for the consumer before the thread pauses.
+
+    Args:
+        factory: Called in the thread to create the generator.
+        maxsize: The number of items buffered between the two threads.
+
+    Yields:
+        The items of the generator, as soon as they are produced.
+
+    """
+    loop = asyncio.get_running_loop()
+    buffer: "queue.Queue" = queue.Queue(maxsize)
+    ready = asyncio.Event()
+    stopped = threading.Event()
+
+    def _put(item, error=None) -> bool:
+        # Never blocks for good: gives up once the consumer stopped or its
+        # event loop is closed.
+        while not stopped.is_set() and not loop.is_closed():
+            try:
+                buffer.put((item, error), timeout=POLL_INTERVAL)
+            except queue.Full:
+                continue
+            try:
+                loop.call_soon_threadsafe(ready.set)
+            except RuntimeError:
+                return False  # The event loop is closed.
+            return True
+        return False
+
+    def _produce():
+        try:
+            for item in factory():
+                if not _put(item):
+                    return
+        except BaseException as err:  # pylint: disable=broad-except
+            _put(_END, err)
+        else:
+            _put(_END)
+
+    threading.Thread(target=_produce, name="photoshop-stream", daemon=True).start()
+    try:
+        while True:
+            ready.clear()
+            try:
+                item, error = buffer.get_nowait()
+            except queue.Empty:
+                await ready.wait()
+                continue
+            if item is _END:
+                if error:
+                    raise error
+                return
+            yield item
+    finally:
+        stopped.set()
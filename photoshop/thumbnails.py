@@ -0,0 +1,191 @@
+"""Generate thumbnails of many documents.
+
+Each document is handled by a single script: it is opened once, converted
+to 8 bits RGB or grayscale, resized from this full resolution state to each
+thumbnail size, saved, and rolled back before the next size, so the small
+thumbnails are not resampled twice. The document is then closed. Documents
+that are already open are rolled back to their previous history state
+instead of being closed.
+
+```python
+
+from photoshop import thumbnails
+
+for thumbnail in thumbnails.generate(psd_paths, sizes=[64, 256, 1024], format="jpg"):
+    print(thumbnail.path, thumbnail.width, thumbnail.height)
+
+```
+
+`generate_file` handles a single document and only takes picklable
+arguments, so it can be mapped over a process pool where each worker talks to
+Photoshop on its own connection.
+
+"""
+
+# Import built-in modules
+import os
+from typing import Any
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+
+# Import local modules
+from photoshop.scheduler import PhotoshopBackend
+
+
+# The longest edge, in pixels, of the thumbnails generated by default.
+DEFAULT_SIZES = (64, 256, 1024)
+
+THUMBNAILS = """
+var file = new File(params.input);
+var doc = null;
+var opened = false;
+for (var i = 0; i < app.documents.length; i++) {
+    try {
+        if (app.documents[i].fullName.fsName == file.fsName) {
+            doc = app.documents[i];
+        }
+    } catch (e) {
+        // Documents that were never saved have no fullName.
+    }
+}
+if (doc === null) {
+    doc = app.open(file);
+    opened = true;
+}
+app.activeDocument = doc;
+var state = doc.activeHistoryState;
+var width = __psPx(doc.width);
+var height = __psPx(doc.height);
+var thumbnails = [];
+try {
+    // PNG, JPEG and GIF files only hold 8 bits RGB or grayscale pixels.
+    if (doc.mode == DocumentMode.BITMAP) {
+        doc.changeMode(ChangeMode.GRAYSCALE);
+    } else if (doc.mode != DocumentMode.RGB && doc.mode != DocumentMode.GRAYSCALE) {
+        doc.changeMode(ChangeMode.RGB);
+    }
+    if (doc.bitsPerChannel != BitsPerChannelType.EIGHT) {
+        doc.bitsPerChannel = BitsPerChannelType.EIGHT;
+    }
+    var original = doc.activeHistoryState;
+    for (var i = 0; i < params.sizes.length; i++) {
+        var size = params.sizes[i];
+        doc.activeHistoryState = original;
+        var scale = Math.min(size / Math.max(width, height), 1);
+        var w = Math.max(1, Math.round(width * scale));
+        var h = Math.max(1, Math.round(height * scale));
+        if (w != __psPx(doc.width) || h != __psPx(doc.height)) {
+            doc.resizeImage(w, h, doc.resolution, ResampleMethod.BICUBICSHARPER);
+        }
+        var path = params.outDir + "/" + params.stem + "_" + size + "." + params.extension;
+        __psSave(doc, path);
+        thumbnails.push({"size": size, "path": path, "width": w, "height": h});
+    }
+} finally {
+    if (opened) {
+        doc.close(SaveOptions.DONOTSAVECHANGES);
+    } else {
+        doc.activeHistoryState = state;
+    }
+}
+return thumbnails;
+"""
+
+
+class Thumbnail(NamedTuple):
+    """A generated thumbnail.
+
+    Attributes:
+        source: The path of the source document.
+        size: The requested length of the longest edge.
+        path: The path of the thumbnail file.
+        width: The width of the thumbnail in pixels.
+        height: The height of the thumbnail in pixels.
+
+    """
+
+    source: str
+    size: int
+    path: str
+    width: int
+    height: int
+
+
+def _generate(app: Any, path: str, sizes: Sequence[int], format: Any, out_dir: Optional[str]) -> List[Thumbnail]:
+    # Import local modules
+    from photoshop.api import _jsx
+
+    extension, definitions = _jsx.save_options(format)
+    path = os.path.abspath(path)
+    out_dir = os.path.abspath(out_dir or os.path.dirname(path))
+    os.makedirs(out_dir, exist_ok=True)
+    thumbnails = _jsx.run(
+        app,
+        THUMBNAILS,
+        definitions,
+        input=_jsx.js_path(path),
+        sizes=sorted(set(sizes), reverse=True),
+        outDir=_jsx.js_path(out_dir),
+        stem=os.path.splitext(os.path.basename(path))[0],
+        extension=extension,
+    )
+    return [
+        Thumbnail(path, item["size"], os.path.normpath(item["path"]), item["width"], item["height"])
+        for item in thumbnails
+    ]
+
+
+def generate_file(
+    path: str,
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    format: Any = "jpg",
+    out_dir: Optional[str] = None,
+    ps_version: Optional[str] = None,
+) -> List[Thumbnail]:
+    """Generate the thumbnails of one document with a single script.
+
+    Args:
+        path: The path of the document.
+        sizes: The lengths of the longest edge of the thumbnails, in pixels.
+            Documents are never upscaled.
+        format: A file format such as ``jpg``, or a save options spec.
+        out_dir: Optional, the directory of the thumbnails. Defaults to the
+            directory of the document.
+        ps_version: Optional, the version of Photoshop to connect to.
+
+    Returns:
+        list: The thumbnails, from the largest to the smallest. They are
+            named ``<name>_<size>.<extension>``.
+
+    """
+    return _generate(PhotoshopBackend(ps_version).app, path, sizes, format, out_dir)
+
+
+def generate(
+    paths: Iterable[str],
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    format: Any = "jpg",
+    out_dir: Optional[str] = None,
+    ps_version: Optional[str] = None,
+) -> Iterator[Thumbnail]:
+    """Generate the thumbnails of many documents, one script per document.
+
+    Args:
+        paths: The paths of the documents.
+        sizes: The lengths of the longest edge of the thumbnails, in pixels.
+        format: A file format such as ``jpg``, or a save options spec.
+        out_dir: Optional, the directory of the thumbnails. Defaults to the
+            directory of each document.
+        ps_version: Optional, the version of Photoshop to connect to.
+
+    Yields:
+        Thumbnail: Each thumbnail, as soon as its document is done.
+
+    """
+    app = PhotoshopBackend(ps_version).app
+    for path in paths:
+        yield from _generate(app, path, sizes, format, out_dir)
@@ -0,0 +1,133 @@
+"""Extract properties from XMP metadata.
+
+XMP packets are parsed with a streaming XML parser. Each top level property
+is converted as soon as it is parsed, and discarded unless it belongs to a
+requested namespace, so large properties such as the history of a document
+never accumulate in memory:
+
+```python
+
+from photoshop import xmp
+
+STUDIO = "http://ns.example.com/studio/1.0/"
+properties = xmp.parse(doc.xmpMetadata.rawData, namespaces=[STUDIO])
+print(properties[STUDIO].get("jobId"))
+
+```
+
+The same packet is available offline, see `photoshop.psd.PSDFile.xmp`.
+
+"""
+
+# Import built-in modules
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+from xml.etree import ElementTree
+
+
+RDF = "http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+XML = "http://www.w3.org/XML/1998/namespace"
+
+# The RDF containers holding the items of array properties.
+CONTAINERS = ("Bag", "Seq", "Alt")
+
+# The size of the chunks fed to the parser.
+CHUNK_SIZE = 1 << 16
+
+
+def _split(tag: str) -> Tuple[str, str]:
+    """Split a ``{namespace}name`` tag."""
+    if tag.startswith("{"):
+        namespace, name = tag[1:].split("}", 1)
+        return namespace, name
+    return "", tag
+
+
+def _fields(element) -> Dict[str, Any]:
+    """The attributes of an element holding the fields of a structure."""
+    fields = {}
+    for key, value in element.attrib.items():
+        namespace, name = _split(key)
+        if namespace not in (RDF, XML):
+            fields[name] = value
+    return fields
+
+
+def _value(element) -> Any:
+    """Convert the content of a property element."""
+    children = list(element)
+    for child in children:
+        namespace, name = _split(child.tag)
+        if namespace == RDF and name in CONTAINERS:
+            return [_value(item) for item in child]
+    fields = _fields(element)
+    for child in children:
+        namespace, name = _split(child.tag)
+        if namespace == RDF and name == "Description":
+            fields.update(_value(child))
+        else:
+            fields[name] = _value(child)
+    if fields or element.get(f"{{{RDF}}}parseType") == "Resource":
+        return fields
+    resource = element.get(f"{{{RDF}}}resource")
+    if resource is not None:
+        return resource
+    return (element.text or "").strip()
+
+
+def parse(packet: Union[str, bytes], namespaces: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """Parse the top level properties of an XMP packet.
+
+    Each property is converted once its element is parsed, then discarded,
+    so only one property is held in memory at a time.
+
+    Args:
+        packet: The XMP packet, e.g. `Document.xmpMetadata.rawData`.
+        namespaces: Optional, the URIs of the namespaces to extract.
+            Defaults to every namespace.
+
+    Returns:
+        dict: The properties keyed by name, keyed by namespace URI. Simple
+            values are strings, arrays (``rdf:Bag``, ``rdf:Seq`` and
+            ``rdf:Alt``) lists, and structures dicts keyed by field name.
+
+    Raises:
+        xml.etree.ElementTree.ParseError: If the packet is not valid XML.
+
+    """
+    wanted = None if namespaces is None else set(namespaces)
+    if isinstance(packet, str):
+        packet = packet.encode("utf-8")
+    # The packet trailer may be followed by padding.
+    packet = packet[: packet.rfind(b">") + 1]
+    parser = ElementTree.XMLPullParser(events=("start", "end"))
+    properties: Dict[str, Dict[str, Any]] = {}
+    path: List[str] = []
+    for start in range(0, len(packet), CHUNK_SIZE):
+        stop = start + CHUNK_SIZE
+        parser.feed(packet[start:stop])
+        for event, element in parser.read_events():
+            if event == "start":
+                if path[-2:] == [f"{{{RDF}}}RDF", f"{{{RDF}}}Description"]:
+                    path.append("property")
+                else:
+                    path.append(element.tag)
+                if element.tag == f"{{{RDF}}}Description" and path[-2:-1] == [f"{{{RDF}}}RDF"]:
+                    # Simple properties can be attributes of the description.
+                    for key, value in element.attrib.items():
+                        namespace, name = _split(key)
+                        if namespace not in (RDF, XML) and (wanted is None or namespace in wanted):
+                            properties.setdefault(namespace, {})[name] = value
+                continue
+            if path.pop() == "property":
+                namespace, name = _split(element.tag)
+                if wanted is None or namespace in wanted:
+                    properties.setdefault(namespace, {})[name] = _value(element)
+                element.clear()
+    parser.close()
+    return properties
@@ -0,0 +1,132 @@
+"""Test the apartment thread and its thread-safe proxies."""
+
+# Import built-in modules
+from concurrent.futures import ThreadPoolExecutor
+import os
+import pathlib
+import threading
+import time
+
+# Import third-party modules
+import pytest
+
+# Import local modules
+from photoshop.apartment import Apartment
+from photoshop.apartment import ThreadSafeProxy
+
+
+class Bound:
+    """Fails when used outside of the thread that created it, like COM objects."""
+
+    def __init__(self, name):
+        self._owner = threading.get_ident()
+        self._name = name
+        self._visible = True
+
+    def _check(self):
+        if threading.get_ident() != self._owner:
+            raise OSError("The application called an interface that was marshalled for a different thread.")
+
+    @property
+    def name(self):
+        self._check()
+        return self._name
+
+    @property
+    def visible(self):
+        self._check()
+        return self._visible
+
+    @visible.setter
+    def visible(self, value):
+        self._check()
+        self._visible = value
+
+
+class Document(Bound):
+    def __init__(self, name):
+        super().__init__(name)
+        self.active = 0
+        self.overlaps = 0
+        self.layers = [Bound(f"Layer {index}") for index in range(16)]
+
+    @property
+    def fullName(self):
+        self._check()
+        return pathlib.Path("/tmp", f"{self._name}.psd")
+
+    def to_numpy(self):
+        # Import third-party modules
+        import numpy
+
+        self._check()
+        return numpy.zeros((2, 2, 3), dtype=numpy.uint8)
+
+    def render(self, layer):
+        self._check()
+        self.active += 1
+        self.overlaps = max(self.overlaps, self.active)
+        time.sleep(0.001)
+        self.active -= 1
+        return f"{self._name}/{layer.name}"
+
+
+@pytest.fixture()
+def apartment():
+    with Apartment(start=None, stop=None, bound_types=(Bound,)) as owner:
+        yield owner
+
+
+def test_proxies_marshal_calls_from_a_thread_pool(apartment):
+    document = apartment.create(Document, "cover")
+
+    def _process(layer):
+        layer.visible = False
+        return document.render(layer)
+
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(_process, document.layers))
+
+    assert results == [f"cover/Layer {index}" for index in range(16)]
+    assert isinstance(document.layers[0], ThreadSafeProxy)
+    assert not any(layer.visible for layer in document.layers)
+    assert document.overlaps == 1
+    assert len(document.layers) == 16
+
+
+def test_calls_from_the_apartment_run_immediately(apartment):
+    assert apartment.call(lambda: apartment.call(lambda: 42)) == 42
+
+
+def test_start_errors_and_closed_apartments():
+    def _start():
+        raise OSError("CoInitialize failed.")
+
+    apartment = Apartment(start=_start, stop=None)
+    with pytest.raises(OSError):
+        apartment.call(len, [])
+    apartment.close()
+
+    with pytest.raises(RuntimeError):
+        apartment.call(len, [])
+
+
+def test_plain_values_are_not_proxied(apartment):
+    np = pytest.importorskip("numpy")
+    document = apartment.create(Document, "cover")
+
+    full_name = document.fullName
+    pixels = document.to_numpy()
+
+    assert isinstance(full_name, pathlib.Path)
+    assert os.fspath(full_name) == str(pathlib.Path("/tmp", "cover.psd"))
+    assert full_name == pathlib.Path("/tmp", "cover.psd")
+    assert isinstance(pixels, np.ndarray) and pixels.shape == (2, 2, 3)
+    assert isinstance(document.to_numpy, ThreadSafeProxy)
+
+
+def test_com_objects_are_proxied(apartment):
+    dispatch = type("Dispatch", (), {"__module__": "comtypes.client.dynamic"})()
+
+    assert apartment.is_bound(dispatch)
+    assert not apartment.is_bound(pathlib.Path("a.psd"))
@@ -0,0 +1,142 @@
+"""Test the pixel layouts used by the NumPy transfers."""
+
+# Import built-in modules
+import struct
+import zlib
+
+# Import third-party modules
+import pytest
+
+# Import local modules
+from photoshop import arrays
+from photoshop.api.errors import PhotoshopPythonAPIError
+
+
+np = pytest.importorskip("numpy")
+
+
+@pytest.fixture()
+def raw_file(tmpdir):
+    def _write(pixels):
+        path = str(tmpdir.join("pixels.raw"))
+        pixels.tofile(path)
+        return path
+
+    return _write
+
+
+@pytest.mark.parametrize("bit_depth, dtype", [(8, ">u1"), (16, ">u2"), (32, ">f4")])
+def test_open_raw_maps_interleaved_pixels(raw_file, bit_depth, dtype):
+    expected = np.arange(4 * 5 * 3).astype(dtype).reshape(4, 5, 3)
+
+    pixels = arrays.open_raw(raw_file(expected), width=5, height=4, channels=3, bit_depth=bit_depth)
+
+    assert isinstance(pixels, np.memmap)
+    assert pixels.shape == (4, 5, 3)
+    np.testing.assert_array_equal(pixels, expected)
+
+
+def test_open_raw_rejects_mismatched_sizes(raw_file):
+    path = raw_file(np.zeros((4, 5, 3), dtype=np.uint8))
+    with pytest.raises(PhotoshopPythonAPIError):
+        arrays.open_raw(path, width=5, height=4, channels=4, bit_depth=8)
+    with pytest.raises(PhotoshopPythonAPIError):
+        arrays.raw_dtype(12)
+
+
+def test_select_channels_keeps_views_when_possible(raw_file):
+    pixels = arrays.open_raw(raw_file(np.zeros((2, 2, 4), dtype=np.uint8)), 2, 2, 4, 8)
+
+    assert np.shares_memory(arrays.select_channels(pixels, 3), pixels)
+    assert np.shares_memory(arrays.select_channels(pixels, [1, 2, 3]), pixels)
+    assert arrays.select_channels(pixels, [2, 0]).shape == (2, 2, 2)
+    assert arrays.select_channels(pixels, None) is pixels
+
+
+def test_read_raw_and_clear_transparent_keep_straight_color(raw_file):
+    # A red pixel at 1% alpha, a transparent pixel with leftover color and an opaque one.
+    straight = [[[32768, 0, 0, 328], [32768, 32768, 32768, 0], [1280, 2560, 3840, 32768]]]
+    pixels = arrays.read_raw(raw_file(np.array(straight, dtype=">u2")), width=3, height=1, channels=4, bit_depth=16)
+
+    assert pixels.dtype == np.dtype("=u2")
+    arrays.clear_transparent(pixels)
+    np.testing.assert_array_equal(pixels[0, 0], [32768, 0, 0, 328])
+    np.testing.assert_array_equal(pixels[0, 1], [0, 0, 0, 0])
+    np.testing.assert_array_equal(pixels[0, 2], [1280, 2560, 3840, 32768])
+
+
+def _decode_png(data):
+    """Decode the unfiltered PNG files written by `arrays.to_png`."""
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    width, height, bit_depth, color_type = struct.unpack(">IIBB", data[16:26])
+    idat_size = struct.unpack(">I", data[33:37])[0]
+    assert data[37:41] == b"IDAT"
+    scanlines = np.frombuffer(zlib.decompress(data[41 : 41 + idat_size]), dtype=np.uint8).reshape(height, -1)
+    assert not scanlines[:, 0].any()
+    dtype = ">u2" if bit_depth == 16 else "u1"
+    return color_type, scanlines[:, 1:].copy().view(dtype).reshape(height, width, -1)
+
+
+@pytest.mark.parametrize(
+    "pixels, color_type",
+    [
+        (np.arange(12, dtype=np.uint8).reshape(3, 4), 0),
+        (np.arange(24, dtype=np.uint8).reshape(3, 4, 2), 4),
+        (np.arange(36, dtype=np.uint16).reshape(3, 4, 3) * 1000, 2),
+        (np.arange(48, dtype=np.uint8).reshape(3, 4, 4), 6),
+    ],
+)
+def test_to_png_round_trips(pixels, color_type):
+    decoded_type, decoded = _decode_png(arrays.to_png(pixels))
+
+    assert decoded_type == color_type
+    np.testing.assert_array_equal(decoded, pixels.reshape(3, 4, -1))
+
+
+def test_to_png_converts_masks_and_rejects_bad_shapes():
+    _, decoded = _decode_png(arrays.to_png(np.eye(2, dtype=bool)))
+    np.testing.assert_array_equal(decoded[..., 0], [[255, 0], [0, 255]])
+    with pytest.raises(PhotoshopPythonAPIError):
+        arrays.to_png(np.zeros((2, 2, 5), dtype=np.uint8))
+
+
+def test_histogram_stats_are_vectorized():
+    histograms = np.zeros((2, 3, 256), dtype=np.int64)
+    histograms[0, :, 0] = 50
+    histograms[0, :, 255] = 50
+    histograms[1, :, 100] = 100
+
+    stats = arrays.histogram_stats(histograms, percentiles=(25, 75))
+
+    assert stats["count"].shape == (2, 3)
+    np.testing.assert_allclose(stats["mean"], [[127.5] * 3, [100] * 3])
+    np.testing.assert_allclose(stats["std"], [[127.5] * 3, [0] * 3])
+    np.testing.assert_array_equal(stats["percentiles"][0, 0], [0, 255])
+    np.testing.assert_array_equal(stats["percentiles"][1, 0], [100, 100])
+    np.testing.assert_allclose(stats["clipped_low"][0], 0.5)
+    np.testing.assert_allclose(stats["clipped_high"][1], 0)
+
+
+def test_tile_grid_cores_cover_the_image_once():
+    grid = arrays.tile_grid(10, 7, 4, overlap=1)
+
+    assert len(grid) == 6
+    assert grid[0] == ((0, 0, 5, 5), (0, 0, 4, 4))
+    assert grid[4] == ((3, 3, 9, 7), (4, 4, 8, 7))
+    covered = np.zeros((7, 10), dtype=int)
+    for _, (left, top, right, bottom) in grid:
+        covered[top:bottom, left:right] += 1
+    assert (covered == 1).all()
+
+
+def test_tile_writer_stitches_tile_cores(tmpdir):
+    image = np.arange(7 * 10 * 3, dtype=">u2").reshape(7, 10, 3)
+    path = str(tmpdir.join("stitched.raw"))
+
+    with arrays.TileWriter(path, 10, 7, 3, 16) as writer:
+        for bounds, core in arrays.tile_grid(10, 7, 4, overlap=2):
+            rows, columns = slice(bounds[1], bounds[3]), slice(bounds[0], bounds[2])
+            tile = arrays.Tile(image[rows, columns], bounds, core)
+            writer.write(tile, tile.pixels + 1)
+
+    np.testing.assert_array_equal(arrays.read_raw(path, 10, 7, 3, 16), image + 1)
@@ -0,0 +1,127 @@
+"""Test the asyncio session against a stand-in backend."""
+
+# Import built-in modules
+import asyncio
+import threading
+import time
+
+# Import third-party modules
+import pytest
+
+# Import local modules
+from photoshop.async_session import AsyncSession
+
+
+class FakeBackend:
+    """Records the calls of the session and the thread running them."""
+
+    def __init__(self, fail_start=False):
+        self.calls = []
+        self.threads = set()
+        self.fail_start = fail_start
+        self.release = threading.Event()
+        self.released = False
+        self.finished = None
+
+    def _record(self, *call):
+        self.threads.add(threading.get_ident())
+        self.calls.append(call)
+
+    def start(self):
+        if self.fail_start:
+            raise OSError("Photoshop is not installed.")
+        self._record("start")
+
+    def stop(self):
+        self._record("stop")
+
+    def open(self, path):
+        self._record("open", path)
+        if path == "slow.psd":
+            self.released = self.release.wait(5)
+            self.finished = time.perf_counter()
+        return {"path": path}
+
+    def save_as(self, document, path, options, as_copy):
+        self._record("save", document["path"], path)
+
+    def eval_javascript(self, javascript):
+        self._record("eval", javascript)
+        return "ok"
+
+    def snapshot(self, document, histograms):
+        self._record("snapshot", document["path"])
+        return [{"id": 1}]
+
+
+def test_requests_run_in_order_in_one_thread():
+    backend = FakeBackend()
+
+    async def _main():
+        async with AsyncSession(backend=backend) as session:
+            document = await session.open("a.psd")
+            results = await asyncio.gather(
+                session.snapshot(document),
+                session.saveAs(document, "a.jpg", "jpg"),
+                session.eval_javascript("app.name"),
+            )
+        return results
+
+    assert asyncio.run(_main()) == [[{"id": 1}], None, "ok"]
+    assert [call[0] for call in backend.calls] == ["start", "open", "snapshot", "save", "eval", "stop"]
+    assert len(backend.threads) == 1
+    assert threading.get_ident() not in backend.threads
+
+
+def test_event_loop_runs_while_photoshop_works():
+    backend = FakeBackend()
+    ticks = []
+
+    async def _tick():
+        for _ in range(3):
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.01)
+        backend.release.set()
+
+    async def _main():
+        async with AsyncSession(backend=backend) as session:
+            await asyncio.gather(session.open("slow.psd"), _tick())
+
+    asyncio.run(_main())
+    assert len(ticks) == 3
+    # The ticks released the backend, so they ran before open returned.
+    assert backend.released
+    assert max(ticks) < backend.finished
+
+
+def test_cancelled_requests_never_run():
+    backend = FakeBackend()
+
+    async def _main():
+        async with AsyncSession(backend=backend) as session:
+            slow = session.submit(backend.open, "slow.psd")
+            queued = session.submit(backend.open, "b.psd")
+            queued.cancel()
+            # The cancellation reaches the session on the next iteration of the loop.
+            await asyncio.sleep(0)
+            backend.release.set()
+            await slow
+        return session
+
+    session = asyncio.run(_main())
+    assert ("open", "b.psd") not in backend.calls
+
+    async def _closed():
+        await session.open("c.psd")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(_closed())
+
+
+def test_connection_errors_are_raised_by_requests():
+    async def _main():
+        async with AsyncSession(backend=FakeBackend(fail_start=True)):
+            pass
+
+    with pytest.raises(OSError):
+        asyncio.run(_main())
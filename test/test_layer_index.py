@@ -0,0 +1,78 @@
+"""Test the persistent layer index."""
+
+# Import built-in modules
+import os
+import shutil
+
+# Import third-party modules
+import pytest
+
+# Import local modules
+from photoshop.layer_index import LayerIndex
+
+
+@pytest.fixture()
+def index(tmp_path):
+    with LayerIndex(str(tmp_path.joinpath("layers.sqlite"))) as layer_index:
+        yield layer_index
+
+
+@pytest.fixture()
+def text_psd(tmp_path, psd_file):
+    path = str(tmp_path.joinpath("textitem.psd"))
+    shutil.copy(psd_file("textitem"), path)
+    return path
+
+
+def test_layers_are_indexed_offline_once(index, text_psd):
+    assert index.get(text_psd) is None
+
+    records = index.layers(text_psd)
+
+    assert [record["name"] for record in records] == ["TEXTITEM", "Background"]
+    assert index.get(text_psd) == records
+    assert records[0]["bounds"] == [5, 44, 93, 57]
+    assert index.find(text="%ITEM") == [(os.path.normcase(text_psd), records[0])]
+
+
+def test_changed_files_are_indexed_again(index, text_psd):
+    index.store(text_psd, [{"id": 1, "name": "Old", "bounds": [0, 0, 1, 1]}])
+    assert index.get(text_psd)[0]["name"] == "Old"
+
+    stat = os.stat(text_psd)
+    os.utime(text_psd, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+
+    assert index.get(text_psd) is None
+    assert index.layers(text_psd)[0]["name"] == "TEXTITEM"
+    assert len(index.find(name="%")) == 2
+
+
+def test_find_by_font(index, text_psd):
+    index.layers(text_psd)
+
+    ((path, record),) = index.find(font="Arial%")
+
+    assert record["name"] == "TEXTITEM"
+    assert record["textRuns"] == [{"text": "TEXTITEM", "font": "ArialMT", "size": 18.0, "color": "#ff00ff"}]
+    assert index.find(font="Helvetica%") == []
+
+
+class FakeDocument:
+    """Stands in for an open document."""
+
+    def __init__(self, path, saved):
+        self.fullName = path
+        self.name = os.path.basename(path)
+        self.saved = saved
+
+    def snapshot(self):
+        return [{"id": 1, "name": "Edited", "index": 0}]
+
+
+def test_unsaved_documents_are_not_indexed(index, text_psd):
+    with pytest.raises(ValueError):
+        index.store_snapshot(FakeDocument(text_psd, saved=False))
+
+    assert index.get(text_psd) is None
+    assert [record["name"] for record in index.store_snapshot(FakeDocument(text_psd, saved=True))] == ["Edited"]
+    assert index.get(text_psd) is not None
@@ -0,0 +1,32 @@
+"""Test the export manifests."""
+
+# Import built-in modules
+import os
+
+# Import local modules
+from photoshop import manifest
+
+
+def test_dump_and_load_keep_absolute_paths(tmp_path):
+    output = tmp_path.joinpath("layer_0_Title.png")
+    output.write_bytes(b"")
+    entries = [{"id": 2, "name": "Title", "path": str(output), "bounds": [0, 0, 10, 10]}]
+    path = manifest.dump(str(tmp_path), entries, format="png", trim=True)
+
+    assert os.path.basename(path) == manifest.MANIFEST_NAME
+    loaded = manifest.load(str(tmp_path))
+    assert loaded["format"] == "png"
+    assert loaded["layers"][0]["path"] == os.path.normpath(str(output))
+
+
+def test_load_missing_manifest(tmp_path):
+    assert manifest.load(str(tmp_path))["layers"] == []
+
+
+def test_fingerprint_tracks_content_and_settings():
+    record = {"id": 2, "name": "Title", "bounds": [0, 0, 10, 10], "visible": True, "opacity": 100, "text": "Hi"}
+    digest = manifest.fingerprint([record], format="png")
+
+    assert digest == manifest.fingerprint([dict(record, index=7)], format="png")
+    assert digest != manifest.fingerprint([dict(record, text="Hello")], format="png")
+    assert digest != manifest.fingerprint([record], format="jpg")
@@ -0,0 +1,56 @@
+"""Test the pre-flight scan of PSD directories."""
+
+# Import built-in modules
+import json
+import shutil
+
+# Import local modules
+from photoshop import preflight
+
+
+def _tree(tmp_path, psd_file):
+    tmp_path.joinpath("jobs", "b").mkdir(parents=True)
+    shutil.copy(psd_file("textitem"), str(tmp_path.joinpath("jobs", "b", "text.psd")))
+    tmp_path.joinpath("jobs", "a.psd").write_bytes(b"not a psd")
+    tmp_path.joinpath("jobs", "notes.txt").write_text("")
+    return str(tmp_path.joinpath("jobs"))
+
+
+def test_scan_reports_each_file(tmp_path, psd_file):
+    root = _tree(tmp_path, psd_file)
+    report = tmp_path.joinpath("preflight.jsonl")
+
+    results = preflight.scan(root, report=str(report), workers=1, fonts=["ArialMT"])
+
+    broken, text = results
+    assert broken.path.endswith("a.psd") and not broken.ok and broken.error
+    assert (text.color_mode, text.depth, text.width, text.height, text.layers) == ("rgb", 8, 100, 100, 2)
+    assert text.fonts == ("ArialMT",)
+    assert text.ok
+    lines = [json.loads(line) for line in report.read_text().splitlines()]
+    assert [line["ok"] for line in lines] == [False, True]
+
+
+def test_check_flags_problems(psd_file):
+    result = preflight.check(psd_file("textitem"), color_modes=["cmyk"], max_pixels=100, fonts=[])
+
+    assert len(result.problems) == 3
+    assert "ArialMT" in result.problems[2]
+
+
+def test_iter_scan_queues_a_bounded_window(tmp_path, monkeypatch):
+    listed = []
+
+    def _iter_files(root):
+        for index in range(100):
+            listed.append(index)
+            yield str(tmp_path.joinpath(f"{index}.psd"))
+
+    monkeypatch.setattr(preflight, "iter_files", _iter_files)
+    results = preflight.iter_scan(str(tmp_path), workers=2)
+
+    first = next(results)
+    assert len(listed) <= 2 * preflight.CHUNK_SIZE + 1
+    rest = list(results)
+    assert [result.path for result in [first] + rest] == [str(tmp_path.joinpath(f"{i}.psd")) for i in range(100)]
+    assert all(result.error for result in rest)
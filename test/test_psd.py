@@ -0,0 +1,134 @@
+"""Test the offline PSD reader."""
+
+# Import built-in modules
+import struct
+
+# Import third-party modules
+import pytest
+
+# Import local modules
+from photoshop.psd import PSDError
+from photoshop.psd import PSDFile
+from photoshop.psd import TextRun
+from photoshop.psd import engine_data
+
+
+def _block(key, data):
+    return b"8BIM" + key + struct.pack(">I", len(data)) + data
+
+
+def _record(name, layer_id, bounds=(0, 0, 0, 0), section=None, flags=0):
+    left, top, right, bottom = bounds
+    blocks = _block(b"luni", struct.pack(">I", len(name)) + name.encode("utf-16-be"))
+    blocks += _block(b"lyid", struct.pack(">I", layer_id))
+    if section is not None:
+        blocks += _block(b"lsct", struct.pack(">I", section))
+    extra = struct.pack(">II", 0, 0) + b"\x03abc" + blocks
+    header = struct.pack(">iiiiH", top, left, bottom, right, 0) + b"8BIMnorm"
+    return header + struct.pack(">BBBBI", 255, 0, flags, 0, len(extra)) + extra
+
+
+@pytest.fixture()
+def grouped_psd(tmp_path):
+    # Stored from the bottom: the group divider, the children, the group.
+    records = [
+        _record("</Layer group>", 4, section=3),
+        _record("Shadow", 3, (10, 20, 30, 40), flags=0x02),
+        _record("Logo", 2, (5, 5, 15, 15)),
+        _record("Group", 1, section=1),
+        _record("Title", 5, (0, 0, 50, 10)),
+    ]
+    layer_info = struct.pack(">h", len(records)) + b"".join(records)
+    layers = struct.pack(">I", len(layer_info)) + layer_info + struct.pack(">I", 0)
+    resolution = struct.pack(">IHHIHH", 300 << 16, 1, 1, 300 << 16, 1, 1)
+    resources = b"8BIM" + struct.pack(">H", 1005) + b"\x00\x00" + struct.pack(">I", len(resolution)) + resolution
+    data = b"8BPS" + struct.pack(">H6xHIIHH", 1, 3, 60, 80, 8, 3)
+    data += struct.pack(">I", 0) + struct.pack(">I", len(resources)) + resources
+    data += struct.pack(">I", len(layers)) + layers + struct.pack(">H", 0)
+    path = tmp_path.joinpath("grouped.psd")
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_read_fixture_layers(psd_file):
+    with PSDFile(psd_file("textitem")) as psd:
+        assert (psd.header.width, psd.header.height, psd.header.depth) == (100, 100, 8)
+        assert psd.header.color_mode_name == "rgb"
+        records = psd.records()
+
+    assert [(record["name"], record["layerKind"]) for record in records] == [("TEXTITEM", 3), ("Background", 12)]
+    assert records[0]["text"] == "TEXTITEM"
+    assert records[1]["index"] == 0
+
+
+def test_groups_are_nested_like_the_layers_panel(grouped_psd):
+    with PSDFile(grouped_psd) as psd:
+        layers = psd.layers
+        assert psd.resolution == 300
+
+    assert [layer.name for layer in layers] == ["Title", "Group", "Logo", "Shadow"]
+    assert [layer.parent for layer in layers] == [None, None, 1, 1]
+    assert [layer.index for layer in layers] == [5, 4, 3, 2]
+    assert layers[1].group and layers[1].kind == 7
+    assert layers[1].bounds == (5, 5, 30, 40)
+    assert not layers[3].visible
+
+
+def test_invalid_file(tmp_path):
+    path = tmp_path.joinpath("image.psd")
+    path.write_bytes(b"\x89PNG\r\n\x1a\n")
+
+    with pytest.raises(PSDError):
+        PSDFile(str(path))
+
+
+def _linked_file(unique_id, name, path):
+    text = path.encode("utf-16-be")
+    descriptor = struct.pack(">III", 16, 0, 0) + b"null" + struct.pack(">I", 1)
+    descriptor += struct.pack(">I", 8) + b"fullPath" + b"TEXT" + struct.pack(">I", len(path)) + text
+    data = b"liFE" + struct.pack(">I", 7) + bytes([len(unique_id)]) + unique_id.encode("latin-1")
+    data += struct.pack(">I", len(name)) + name.encode("utf-16-be") + b"png " + b"\x00" * 4
+    data += struct.pack(">QB", 0, 0) + descriptor
+    return struct.pack(">Q", len(data)) + data + b"\x00" * (-len(data) % 4)
+
+
+def test_linked_files(tmp_path):
+    tmp_path.joinpath("logo.png").write_bytes(b"")
+    tmp_path.joinpath("my art").mkdir()
+    tmp_path.joinpath("my art", "icon.png").write_bytes(b"")
+    uri = tmp_path.joinpath("my art", "icon.png").as_uri()
+    entries = _linked_file("a1", "logo.png", "logo.png") + _linked_file("b2", "photo.png", "missing/photo.png")
+    entries += _linked_file("c3", "icon.png", uri)
+    layers = struct.pack(">II", 0, 0) + _block(b"lnkE", entries)
+    data = b"8BPS" + struct.pack(">H6xHIIHH", 1, 3, 1, 1, 8, 3)
+    data += struct.pack(">II", 0, 0) + struct.pack(">I", len(layers)) + layers + struct.pack(">H", 0)
+    path = tmp_path.joinpath("linked.psd")
+    path.write_bytes(data)
+
+    with PSDFile(str(path)) as psd:
+        linked_files = psd.linked_files
+
+    assert [(linked.id, linked.name, linked.external) for linked in linked_files] == [
+        ("a1", "logo.png", True),
+        ("b2", "photo.png", True),
+        ("c3", "icon.png", True),
+    ]
+    assert linked_files[0].locate(str(path)) == str(tmp_path.joinpath("logo.png"))
+    assert linked_files[1].locate(str(path)) is None
+    assert linked_files[2].locate(str(path)) == str(tmp_path.joinpath("my art", "icon.png"))
+
+
+def test_text_runs(psd_file):
+    with PSDFile(psd_file("textitem")) as psd:
+        layer = psd.layers[0]
+
+    assert layer.text_runs == [TextRun("TEXTITEM", "ArialMT", 18.0, (255, 0, 255))]
+    assert layer.fonts == ["ArialMT"]
+
+
+def test_parse_engine_data():
+    data = b"<<\n\t/Editor << /Text (\xfe\xff\x00a\x00\\)) >>\n\t/Values [ 1 .5 -2.0 true /Name ]\n>>"
+
+    assert engine_data.parse(data) == {"Editor": {"Text": "a)"}, "Values": [1, 0.5, -2.0, True, "Name"]}
+    with pytest.raises(PSDError):
+        engine_data.parse(b"<< /Values [ 1 >>")
@@ -0,0 +1,91 @@
+"""Test the decoding of PSD image data."""
+
+# Import third-party modules
+import pytest
+
+# Import local modules
+from photoshop.psd import PSDFile
+from photoshop.psd import image
+
+
+np = pytest.importorskip("numpy")
+
+
+def _packbits(row):
+    """Encode a row with runs and literals, a reference PackBits encoder."""
+    encoded, literal, i = bytearray(), bytearray(), 0
+    while i < len(row):
+        run = 1
+        while i + run < len(row) and run < 128 and row[i + run] == row[i]:
+            run += 1
+        if run > 2:
+            if literal:
+                encoded += bytes([len(literal) - 1]) + literal
+                literal = bytearray()
+            encoded += bytes([257 - run, row[i]])
+            i += run
+        else:
+            literal.append(row[i])
+            i += 1
+            if len(literal) == 128:
+                encoded += bytes([127]) + literal
+                literal = bytearray()
+    if literal:
+        encoded += bytes([len(literal) - 1]) + literal
+    return bytes(encoded)
+
+
+def test_decode_packbits_matches_reference_rows():
+    generator = np.random.default_rng(0)
+    rows = generator.integers(0, 3, size=(12, 300)).astype(np.uint8)
+    rows[3] = 7
+    encoded = [_packbits(row.tobytes()) for row in rows]
+    # A no-op header must be skipped.
+    encoded[5] = b"\x80" + encoded[5]
+    sizes = np.array([len(row) for row in encoded])
+    data = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+    decoded = image.decode_packbits(data, np.cumsum(sizes) - sizes, np.cumsum(sizes), 300)
+
+    np.testing.assert_array_equal(decoded, rows)
+
+
+def test_decode_packbits_rejects_short_rows():
+    data = np.frombuffer(b"\xfe\x01", dtype=np.uint8)
+
+    with pytest.raises(image.PSDError):
+        image.decode_packbits(data, [0], [2], 4)
+
+
+def test_decode_packbits_rejects_repeat_packets_reading_the_next_row():
+    # The first row ends right after a repeat header.
+    data = np.frombuffer(b"\xfd\xfd\x06", dtype=np.uint8)
+
+    with pytest.raises(image.PSDError):
+        image.decode_packbits(data, [0, 1], [1, 3], 4)
+
+
+def test_read_image_data_rejects_truncated_rle_tables():
+    # RLE compression, then a byte count table cut after one row.
+    data = b"\x00\x01\x00\x02"
+
+    with pytest.raises(image.PSDError):
+        image.read_image_data(data, 0, 4, 2, 3, 8)
+
+
+def test_unpredict_16_bit_rows():
+    samples = np.array([[1000, 65535, 3, 40000]], dtype=np.uint16)
+    deltas = np.diff(samples.astype(np.int64), prepend=0).astype(np.uint16).astype(">u2")
+
+    rows = image.unpredict(deltas.view(np.uint8).copy(), 4, 16)
+
+    np.testing.assert_array_equal(rows.view(">u2"), samples)
+
+
+def test_composite_of_fixture(psd_file):
+    with PSDFile(psd_file("textitem")) as psd:
+        pixels = psd.composite()
+
+    assert pixels.shape == (100, 100, 3)
+    assert (pixels[0, 0] == 255).all()
+    assert (pixels[44:57, 5:93] != 255).any()
@@ -0,0 +1,71 @@
+"""Test the comparison of exported images."""
+
+# Import built-in modules
+import json
+import os
+import sys
+
+# Import third-party modules
+import pytest
+
+# Import local modules
+from photoshop import manifest
+from photoshop import qa
+
+
+np = pytest.importorskip("numpy")
+
+
+def test_diff_reports_changes_above_tolerance():
+    a = np.zeros((4, 6, 3), dtype=np.uint8)
+    b = a.copy()
+    b[1, 2] = (0, 1, 0)
+    b[2, 4] = (0, 0, 9)
+
+    stats, mask = qa.diff(a, b, tolerance=1)
+
+    assert stats["max_delta"] == 9
+    assert stats["mean_delta"] == pytest.approx(10 / a.size)
+    assert stats["changed_pixels"] == 1
+    assert stats["bbox"] == (4, 2, 5, 3)
+    assert mask.sum() == 1 and mask[2, 4]
+
+
+def test_compare_dirs_pairs_manifest_entries(tmpdir):
+    a_dir, b_dir = str(tmpdir.mkdir("a")), str(tmpdir.mkdir("b"))
+    pixels = np.full((3, 3, 4), 128, dtype=np.uint8)
+    np.save(os.path.join(a_dir, "title.npy"), pixels)
+    np.save(os.path.join(a_dir, "logo.npy"), pixels)
+    np.save(os.path.join(b_dir, "Title.npy"), pixels)
+    manifest.dump(
+        a_dir, [{"id": 1, "path": os.path.join(a_dir, "title.npy")}, {"id": 2, "path": os.path.join(a_dir, "logo.npy")}]
+    )
+    manifest.dump(b_dir, [{"id": 1, "path": os.path.join(b_dir, "Title.npy")}])
+    report = str(tmpdir.join("report.json"))
+
+    comparisons = qa.compare_dirs(a_dir, b_dir, report=report, workers=1)
+
+    assert [comparison.passed for comparison in comparisons] == [True, False]
+    assert comparisons[1].b is None
+    with open(report) as file_obj:
+        content = json.load(file_obj)
+    assert content["failed"] == 1
+    assert content["comparisons"][0]["b"] == os.path.join(b_dir, "Title.npy")
+
+
+def test_compare_reports_size_mismatch(tmpdir):
+    a, b = str(tmpdir.join("a.npy")), str(tmpdir.join("b.npy"))
+    np.save(a, np.zeros((2, 2, 3), dtype=np.uint8))
+    np.save(b, np.zeros((2, 3, 3), dtype=np.uint8))
+
+    comparison = qa.compare(a, b)
+
+    assert not comparison.passed
+    assert "different shapes" in comparison.error
+
+
+def test_load_image_requires_pillow(tmpdir, monkeypatch):
+    monkeypatch.setitem(sys.modules, "PIL", None)
+
+    with pytest.raises(ImportError, match=r"photoshop-python-api\[qa\]"):
+        qa.load_image(str(tmpdir.join("a.png")))
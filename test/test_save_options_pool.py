@@ -0,0 +1,69 @@
+"""Test the pool of save options."""
+
+# Import built-in modules
+import gc
+import threading
+
+# Import third-party modules
+import pytest
+
+# Import local modules
+from photoshop.api.errors import PhotoshopPythonAPIError
+from photoshop.api.save_options.pool import SaveOptionsPool
+
+
+class FakeOptions:
+    """Counts the objects created and the properties set."""
+
+    created = 0
+
+    def __init__(self, quality=5):
+        FakeOptions.created += 1
+        self.quality = quality
+        self.matte = None
+
+
+@pytest.fixture()
+def pool():
+    FakeOptions.created = 0
+    return SaveOptionsPool()
+
+
+def test_same_parameters_share_one_object(pool):
+    first = pool.get(FakeOptions, quality=8, matte=2)
+    second = pool.get(FakeOptions, matte=2, quality=8)
+
+    assert first is second
+    assert FakeOptions.created == 1
+    assert first.quality == 8
+    assert first.matte == 2
+
+
+def test_different_parameters_get_different_objects(pool):
+    assert pool.get(FakeOptions, quality=8) is not pool.get(FakeOptions, quality=10)
+    assert len(pool) == 2
+
+
+def test_pooled_options_are_read_only(pool):
+    options = pool.get(FakeOptions, quality=8)
+    with pytest.raises(PhotoshopPythonAPIError):
+        options.quality = 2
+    assert options.quality == 8
+    assert options.replace(quality=2).quality == 2
+
+
+def test_unknown_properties_are_rejected(pool):
+    with pytest.raises(TypeError):
+        pool.get(FakeOptions, qualty=8)
+
+
+def test_threads_get_their_own_objects_released_on_exit(pool):
+    pool.get(FakeOptions, quality=8)
+    thread = threading.Thread(target=pool.get, args=(FakeOptions,), kwargs={"quality": 8})
+    thread.start()
+    thread.join()
+    assert FakeOptions.created == 2
+
+    del thread
+    gc.collect()
+    assert len(pool) == 1
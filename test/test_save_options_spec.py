@@ -0,0 +1,54 @@
+"""Test the save options specs."""
+
+# Import built-in modules
+import pickle
+
+# Import third-party modules
+import pytest
+
+# Import local modules
+from photoshop.api import _jsx
+from photoshop.api.enumerations import MatteType
+from photoshop.api.enumerations import SaveDocumentType
+from photoshop.api.errors import PhotoshopPythonAPIError
+from photoshop.api.save_options import JPEGSaveSpec
+from photoshop.api.save_options import SaveForWebSpec
+from photoshop.api.save_options import TiffSaveSpec
+
+
+def test_specs_are_hashable_and_picklable():
+    spec = JPEGSaveSpec(quality=8, matte=MatteType.WhiteMatte)
+
+    assert spec == JPEGSaveSpec(quality=8, matte=MatteType.WhiteMatte.value)
+    assert len({spec, JPEGSaveSpec(quality=8, matte=MatteType.WhiteMatte)}) == 1
+    assert pickle.loads(pickle.dumps(spec)) == spec
+
+
+@pytest.mark.parametrize(
+    "params",
+    [{"quality": 13}, {"quality": "high"}, {"matte": 42}, {"embedColorProfile": 1}],
+)
+def test_invalid_values_are_rejected(params):
+    with pytest.raises(PhotoshopPythonAPIError):
+        JPEGSaveSpec(**params)
+
+
+def test_to_jsx_sets_only_the_given_fields():
+    body = TiffSaveSpec(jpegQuality=7, layers=True).to_jsx()
+
+    assert body == "var o = new TiffSaveOptions(); o.jpegQuality = 7; o.layers = true; return o;"
+    assert "o.matte = MatteType.NONE;" in JPEGSaveSpec().to_jsx()
+
+
+def test_save_options_resolves_formats_and_specs():
+    extension, definitions = _jsx.save_options("JPEG")
+    assert extension == "jpg"
+    assert "o.quality = 10;" in definitions
+
+    extension, definitions = _jsx.save_options(SaveForWebSpec(format=SaveDocumentType.JPEGSave, quality=60))
+    assert extension == "jpg"
+    assert "ExportType.SAVEFORWEB" in definitions
+    assert "o.format = SaveDocumentType.JPEG;" in definitions
+
+    with pytest.raises(PhotoshopPythonAPIError):
+        _jsx.save_options("xcf")
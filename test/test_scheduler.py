@@ -0,0 +1,130 @@
+"""Test the export job scheduler against a stand-in backend."""
+
+# Import built-in modules
+import threading
+import time
+
+# Import third-party modules
+import pytest
+
+# Import local modules
+from photoshop.scheduler import Job
+from photoshop.scheduler import Scheduler
+
+
+class FakeBackend:
+    """Records the calls of the scheduler and fails on demand."""
+
+    def __init__(self, fail_saves=0, crash_on=None, hang_on=None):
+        self.calls = []
+        self.fail_saves = fail_saves
+        self.crash_on = crash_on
+        self.hang_on = hang_on
+        self.resets = 0
+        self.release = threading.Event()
+
+    def open(self, path):
+        self.calls.append(("open", path))
+        if path == self.hang_on:
+            self.release.wait(5)
+        return {"path": path}
+
+    def save(self, document, path, options):
+        if path == self.crash_on:
+            raise KeyboardInterrupt
+        if self.fail_saves:
+            self.fail_saves -= 1
+            raise OSError("The RPC server is unavailable.")
+        self.calls.append(("save", path))
+
+    def close(self, document):
+        self.calls.append(("close", document["path"]))
+
+    def reset(self):
+        self.resets += 1
+
+
+@pytest.fixture()
+def journal(tmp_path):
+    return str(tmp_path.joinpath("journal.jsonl"))
+
+
+def test_jobs_run_by_priority(journal):
+    backend = FakeBackend()
+    jobs = [Job("low", "a.psd", [("a.png", "png")]), Job("high", "b.psd", [("b.png", "png")], priority=5)]
+    results = Scheduler(journal, backend).run(jobs)
+
+    assert [result.job_id for result in results] == ["high", "low"]
+    assert [call for call in backend.calls if call[0] == "save"] == [("save", "b.png"), ("save", "a.png")]
+
+
+def test_failed_jobs_are_retried_with_backoff(journal):
+    backend = FakeBackend(fail_saves=2)
+    delays = []
+    scheduler = Scheduler(journal, backend, retries=3, backoff=0.5, sleep=delays.append)
+    (result,) = scheduler.run([Job("job", "a.psd", [("a.png", "png")])])
+
+    assert result.status == "done"
+    assert result.attempts == 3
+    assert delays == [0.5, 1.0]
+    assert backend.resets == 2
+
+
+def test_job_fails_when_retries_are_exhausted(journal):
+    backend = FakeBackend(fail_saves=10)
+    (result,) = Scheduler(journal, backend, retries=1, sleep=lambda _: None).run([Job("job", "a.psd", [("a", "png")])])
+
+    assert result.status == "failed"
+    assert result.attempts == 2
+    assert "RPC server" in result.error
+
+
+def test_resume_skips_journaled_work(journal):
+    jobs = [
+        Job("first", "a.psd", [("a.png", "png")]),
+        Job("second", "b.psd", [("b1.png", "png"), ("b2.png", "png")]),
+    ]
+    with pytest.raises(KeyboardInterrupt):
+        Scheduler(journal, FakeBackend(crash_on="b2.png")).run(jobs)
+
+    backend = FakeBackend()
+    results = Scheduler(journal, backend).run(jobs)
+
+    assert [result.status for result in results] == ["skipped", "done"]
+    assert [call for call in backend.calls if call[0] == "save"] == [("save", "b2.png")]
+
+
+def test_hung_job_times_out(journal):
+    backend = FakeBackend(hang_on="a.psd")
+    scheduler = Scheduler(journal, backend, retries=0)
+    try:
+        (result,) = scheduler.run([Job("job", "a.psd", [("a.png", "png")], timeout=0.1)])
+    finally:
+        backend.release.set()
+
+    assert result.status == "failed"
+    assert "TimeoutError" in result.error
+
+
+def test_timed_out_attempt_does_not_journal_outputs(journal):
+    backend = FakeBackend(hang_on="a.psd")
+    scheduler = Scheduler(journal, backend, retries=0)
+    (result,) = scheduler.run([Job("job", "a.psd", [("a.png", "png")], timeout=0.1)])
+    backend.release.set()
+    time.sleep(0.2)
+
+    assert result.outputs == []
+    assert not any('"output:a.png"' in line for line in open(journal, encoding="utf-8"))
+    assert ("save", "a.png") not in backend.calls
+
+
+def test_close_errors_do_not_hide_the_attempt_error(journal):
+    backend = FakeBackend(fail_saves=1)
+
+    def _close(document):
+        raise OSError("Close failed.")
+
+    backend.close = _close
+    (result,) = Scheduler(journal, backend, retries=0).run([Job("job", "a.psd", [("a.png", "png")])])
+
+    assert "RPC server" in result.error
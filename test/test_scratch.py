@@ -0,0 +1,36 @@
+"""Test the scratch files used by in-memory exports."""
+
+# Import built-in modules
+import os
+
+# Import third-party modules
+import pytest
+
+# Import local modules
+from photoshop import scratch
+from photoshop.api.errors import PhotoshopPythonAPIError
+
+
+def test_scratch_dir_can_be_overridden(tmpdir, monkeypatch):
+    monkeypatch.setenv(scratch.SCRATCH_DIR_ENV, str(tmpdir))
+    assert scratch.scratch_root().startswith(str(tmpdir))
+
+
+def test_scratch_files_are_recycled_and_truncated(tmpdir):
+    files = scratch.ScratchFiles(str(tmpdir))
+    with files.path("png") as path:
+        with open(path, "wb") as file_obj:
+            file_obj.write(b"\x89PNG" * 10)
+        assert scratch.read_file(path) == b"\x89PNG" * 10
+        assert b"".join(scratch.iter_file(path, chunk_size=3)) == b"\x89PNG" * 10
+    assert os.path.getsize(path) == 0
+
+    with files.path("png") as recycled:
+        assert recycled == path
+        with pytest.raises(PhotoshopPythonAPIError):
+            scratch.read_file(recycled)
+        with files.path("png") as other:
+            assert other != path
+
+    files.clear()
+    assert not os.path.exists(str(tmpdir))
@@ -0,0 +1,70 @@
+"""Test streaming batch results."""
+
+# Import built-in modules
+import asyncio
+import threading
+
+# Import third-party modules
+import pytest
+
+# Import local modules
+from photoshop.streaming import export_results
+from photoshop.streaming import iterate_in_thread
+
+
+def test_export_results_skip_empty_layers(tmp_path):
+    output = tmp_path.joinpath("layer_0_Title.png")
+    output.write_bytes(b"1234")
+    entries = [{"id": 3, "path": str(output)}, {"id": 4, "path": None}]
+
+    (result,) = export_results(entries, started=0.0)
+    assert result.path == str(output)
+    assert result.size == 4
+    assert result.layer_id == 3
+
+
+def test_iterate_in_thread_runs_generator_in_another_thread():
+    threads = []
+
+    def _generate():
+        for index in range(5):
+            threads.append(threading.get_ident())
+            yield index
+
+    async def _collect():
+        return [item async for item in iterate_in_thread(_generate, maxsize=2)]
+
+    assert asyncio.run(_collect()) == [0, 1, 2, 3, 4]
+    assert threading.get_ident() not in threads
+
+
+def test_iterate_in_thread_raises_errors():
+    def _generate():
+        yield 1
+        raise ValueError("boom")
+
+    async def _collect():
+        return [item async for item in iterate_in_thread(_generate)]
+
+    with pytest.raises(ValueError):
+        asyncio.run(_collect())
+
+
+def test_iterate_in_thread_stops_the_producer_when_the_consumer_stops():
+    finished = threading.Event()
+
+    def _generate():
+        try:
+            for index in range(100):
+                yield index
+        finally:
+            finished.set()
+
+    async def _first():
+        items = iterate_in_thread(_generate, maxsize=1)
+        async for item in items:
+            await items.aclose()
+            return item
+
+    assert asyncio.run(_first()) == 0
+    assert finished.wait(5)
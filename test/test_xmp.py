@@ -0,0 +1,42 @@
+"""Test the XMP parser."""
+
+# Import local modules
+from photoshop import xmp
+from photoshop.psd import PSDFile
+
+
+STUDIO = "http://ns.example.com/studio/1.0/"
+
+PACKET = """<?xpacket begin="﻿" id="W5M0MpCehiHzreSzNTczkc9d"?>
+<x:xmpmeta xmlns:x="adobe:ns:meta/">
+ <rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#">
+  <rdf:Description rdf:about="" xmlns:studio="{0}" xmlns:dc="http://purl.org/dc/elements/1.1/" studio:jobId="J-42">
+   <studio:tags><rdf:Bag><rdf:li>cover</rdf:li><rdf:li>print</rdf:li></rdf:Bag></studio:tags>
+   <studio:client rdf:parseType="Resource"><studio:name>ACME</studio:name></studio:client>
+   <dc:title><rdf:Alt><rdf:li xml:lang="x-default">Cover</rdf:li></rdf:Alt></dc:title>
+  </rdf:Description>
+ </rdf:RDF>
+</x:xmpmeta>
+<?xpacket end="w"?>
+""".format(
+    STUDIO
+)
+
+
+def test_parse_custom_namespace():
+    properties = xmp.parse(PACKET + " " * 100, namespaces=[STUDIO])
+
+    assert properties == {STUDIO: {"jobId": "J-42", "tags": ["cover", "print"], "client": {"name": "ACME"}}}
+
+
+def test_parse_every_namespace():
+    assert xmp.parse(PACKET)["http://purl.org/dc/elements/1.1/"] == {"title": ["Cover"]}
+
+
+def test_parse_offline_metadata(psd_file):
+    with PSDFile(psd_file("textitem")) as psd:
+        properties = psd.xmp(["http://ns.adobe.com/photoshop/1.0/"])
+
+    assert properties["http://ns.adobe.com/photoshop/1.0/"]["TextLayers"] == [
+        {"LayerName": "TEXTITEM", "LayerText": "TEXTITEM"}
+    ]